@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Asyncio generation mode for generate_landing_pages.py.
+Keeps several Grok requests in flight and tunes how many AIMD-style:
+the window grows by one request per round-trip and halves on HTTP 429,
+while the x-ratelimit-* headers pause new requests before the quota runs out.
+"""
+
+import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset values such as "1s", "250ms", "6m0s" or "12.5" into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", value)
+    if not parts:
+        return None
+    scale = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+def read_rate_limit_headers(headers: Mapping[str, str]) -> Tuple[Optional[int], Optional[float]]:
+    """Return (remaining requests, seconds until reset) from OpenAI-style rate-limit headers."""
+    lowered = {k.lower(): v for k, v in headers.items()}
+
+    def remaining_for(kind: str) -> Optional[int]:
+        try:
+            return int(float(lowered[f"x-ratelimit-remaining-{kind}"]))
+        except (KeyError, ValueError):
+            return None
+
+    remaining = remaining_for("requests")
+    reset = parse_reset_duration(lowered.get("x-ratelimit-reset-requests"))
+
+    # An exhausted token budget blocks new requests just like an exhausted request budget.
+    if remaining_for("tokens") == 0:
+        remaining = 0
+        token_reset = parse_reset_duration(lowered.get("x-ratelimit-reset-tokens"))
+        if token_reset is not None:
+            reset = token_reset if reset is None else max(reset, token_reset)
+
+    return remaining, reset
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease limit on in-flight requests."""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        default_backoff: float = 5.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.increase = increase
+        self.decrease = decrease
+        self.default_backoff = default_backoff
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.paused_until = 0.0
+        self.decreases = 0
+        # Requests started before the last decrease must not halve the window again.
+        self._epoch = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self) -> int:
+        """Wait for a free slot and return the epoch the request was started in."""
+        cond = self._condition()
+        async with cond:
+            while True:
+                delay = self.paused_until - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    return self._epoch
+                await cond.wait()
+
+    async def release(
+        self,
+        epoch: int,
+        rate_limited: bool = False,
+        retry_after: Optional[float] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Return a slot and adjust the window from the outcome of the request."""
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            if rate_limited:
+                if epoch == self._epoch:
+                    self.limit = max(float(self.minimum), self.limit * self.decrease)
+                    self._epoch += 1
+                    self.decreases += 1
+                self.paused_until = max(self.paused_until, now + (retry_after if retry_after is not None else self.default_backoff))
+            else:
+                self.limit = min(float(self.maximum), self.limit + self.increase / self.limit)
+
+            remaining, reset = read_rate_limit_headers(headers or {})
+            if remaining is not None and remaining <= self.in_flight:
+                self.limit = max(float(self.minimum), min(self.limit, float(max(remaining, 1))))
+                if remaining <= 0:
+                    self.paused_until = max(self.paused_until, now + (reset if reset is not None else self.default_backoff))
+
+            cond.notify_all()
+
+
+async def _generate(
+    jobs: List[Any],
+    fetch: Callable[[Any], Any],
+    on_result: Callable[[Any, Any], None],
+    on_error: Callable[[Any, Exception], None],
+    limiter: AdaptiveConcurrency,
+    rate_limit_error: Type[Exception],
+    max_attempts: int,
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait((job, 1))
+
+    stats = {"succeeded": 0, "failed": 0, "rate_limited": 0}
+    executor = ThreadPoolExecutor(max_workers=limiter.maximum)
+    # One thread runs every callback: they render, write and fsync, which must not stall
+    # the loop, and keeping them in order on one thread means they need no locking.
+    writer = ThreadPoolExecutor(max_workers=1)
+
+    async def report_error(job: Any, exc: Exception) -> None:
+        stats["failed"] += 1
+        await loop.run_in_executor(writer, on_error, job, exc)
+
+    async def worker() -> None:
+        while True:
+            job, attempt = await queue.get()
+            try:
+                epoch = await limiter.acquire()
+                try:
+                    result = await loop.run_in_executor(executor, fetch, job)
+                except rate_limit_error as exc:
+                    stats["rate_limited"] += 1
+                    await limiter.release(
+                        epoch,
+                        rate_limited=True,
+                        retry_after=getattr(exc, "retry_after", None),
+                        headers=getattr(exc, "headers", None),
+                    )
+                    if attempt < max_attempts:
+                        queue.put_nowait((job, attempt + 1))
+                    else:
+                        await report_error(job, exc)
+                    continue
+                except Exception as exc:
+                    await limiter.release(epoch)
+                    await report_error(job, exc)
+                    continue
+
+                await limiter.release(epoch, headers=getattr(result, "headers", None))
+                try:
+                    await loop.run_in_executor(writer, on_result, job, result)
+                    stats["succeeded"] += 1
+                except Exception as exc:
+                    await report_error(job, exc)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(limiter.maximum)]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+        # Let a callback that is mid-write finish rather than leave a half-recorded page.
+        writer.shutdown(wait=True, cancel_futures=True)
+
+    return stats
+
+
+def run_async_generation(
+    jobs: List[Any],
+    fetch: Callable[[Any], Any],
+    on_result: Callable[[Any, Any], None],
+    on_error: Callable[[Any, Exception], None],
+    rate_limit_error: Type[Exception],
+    concurrency: int = 4,
+    max_concurrency: int = 32,
+    max_attempts: int = 5,
+) -> Dict[str, Any]:
+    """
+    Run fetch(job) for every job with an adaptive number of requests in flight.
+
+    fetch is a blocking call returning a result with a .headers mapping and runs
+    in a thread pool; on_result and on_error run one at a time on a separate writer
+    thread as soon as each response arrives, so pages are rendered and written while
+    other requests are pending and the event loop never blocks on disk I/O.
+    Jobs that hit rate_limit_error are re-queued up to max_attempts times.
+    """
+    limiter = AdaptiveConcurrency(initial=concurrency, maximum=max_concurrency)
+    started = time.monotonic()
+    stats = asyncio.run(
+        _generate(jobs, fetch, on_result, on_error, limiter, rate_limit_error, max_attempts)
+    )
+    stats.update(
+        {
+            "elapsed": time.monotonic() - started,
+            "final_concurrency": int(limiter.limit),
+            "peak_in_flight": limiter.peak_in_flight,
+            "window_decreases": limiter.decreases,
+        }
+    )
+    return stats
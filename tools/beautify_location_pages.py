@@ -383,6 +383,15 @@ ENHANCED_CSS = '''
     </style>
 '''
 
+def beautify_html(html):
+    """Insert the enhanced CSS before the stats CSS unless the page already has it"""
+    if 'Beautiful ZIP & Cities section' in html:
+        return html
+    return html.replace(
+        '        .stars-display {',
+        f'{ENHANCED_CSS}\n        .stars-display {{'
+    )
+
 def beautify_location(slug):
     """Add beautiful aesthetic CSS to location page"""
     
@@ -401,10 +410,7 @@ def beautify_location(slug):
         return
     
     # Insert enhanced CSS after the existing stats CSS
-    html = html.replace(
-        '        .stars-display {',
-        f'{ENHANCED_CSS}\n        .stars-display {{'
-    )
+    html = beautify_html(html)
     
     print(f"✅ Beautified {slug}")
     
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for landing page rendering.
+Compares the old HTML_TEMPLATE.format() + __FORM_SCRIPT__ replace path with the
+precompiled fragment renderer on synthetic keyword groups, and checks that both
+produce identical HTML.
+"""
+
+import argparse
+import html
+import json
+import time
+from typing import Callable, Dict, List, Tuple
+
+from generate_landing_pages import (
+    FORM_SCRIPT_HEAD,
+    FORM_SCRIPT_TAIL,
+    HTML_TEMPLATE,
+    SERVICE_AREAS,
+    bullet_list_html,
+    faq_html,
+    faq_json_ld,
+    feature_cards_html,
+    render_page_html,
+    service_areas_html,
+    slugify,
+)
+
+
+def legacy_render_page_html(slug: str, group: Dict, content: Dict) -> str:
+    """The renderer as it was before the template was precompiled."""
+    hero = content.get("hero") or {}
+    quote_form = content.get("quote_form") or {}
+    closing_cta = content.get("closing_cta") or {}
+    faq_items = content.get("faq") or []
+
+    html_output = HTML_TEMPLATE.format(
+        meta_description=html.escape(content.get("meta_description", "")),
+        page_title=html.escape(content.get("page_title", "")),
+        slug=slug,
+        hero_heading=html.escape(hero.get("heading", group.get("name", ""))),
+        hero_subheading=html.escape(hero.get("subheading", group.get("description", ""))),
+        hero_bullets=bullet_list_html(hero.get("bullets", [])[:3]),
+        cta_button_label=html.escape(closing_cta.get("button_label", "Get Free Quote")),
+        quote_heading=html.escape(quote_form.get("heading", "Free Quote")),
+        form_subject=html.escape(quote_form.get("form_subject", f"{group.get('name', 'Service')} Quote Request")),
+        details_label=html.escape(quote_form.get("details_label", "What are we removing?")),
+        details_placeholder=html.escape(quote_form.get("details_placeholder", "Item details, access notes, photos")),
+        submit_label=html.escape(quote_form.get("submit_label", "Get My Quote")),
+        form_note=html.escape(quote_form.get("note", "Prefer text? Send photos to (410) 300-6743.")),
+        what_we_take=feature_cards_html((content.get("what_we_take") or [])[:3]),
+        how_it_works=feature_cards_html((content.get("how_it_works") or [])[:3]),
+        pricing=feature_cards_html((content.get("pricing") or [])[:2]),
+        pricing_cta=html.escape(closing_cta.get("button_label", "Check My Price")),
+        service_areas=service_areas_html(),
+        faq_heading=html.escape(f"{group.get('name', 'Service')} FAQ"),
+        faq=faq_html(faq_items[:4]),
+        faq_cta=html.escape(closing_cta.get("button_label", "Book My Pickup")),
+        json_service_name=json.dumps(hero.get("heading", group.get("name", ""))),
+        json_service_type=json.dumps(content.get("service_type", group.get("name", ""))),
+        json_area_served=json.dumps([name for name, _ in SERVICE_AREAS]),
+        json_faq=json.dumps(faq_json_ld(faq_items)),
+    )
+    form_script = FORM_SCRIPT_HEAD + html.escape(group.get("name", "Landing Page")) + FORM_SCRIPT_TAIL
+    return html_output.replace("__FORM_SCRIPT__", form_script)
+
+
+def synthetic_pages(count: int) -> List[Tuple[str, Dict, Dict]]:
+    pages = []
+    for i in range(count):
+        name = f"Synthetic Service {i} | City {i % 23}"
+        group = {"name": name, "description": f"Junk removal variant {i} for Howard County & nearby"}
+        content = {
+            "page_title": f"Service {i} | City | Grime To Dime",
+            "meta_description": f"Fast, friendly junk removal variant {i} with upfront pricing and same-day pickup across Howard County.",
+            "hero": {"heading": f"Heading {i}", "subheading": "Same-day pickup <guaranteed>", "bullets": ["Fast", "Local", "Insured"]},
+            "quote_form": {"heading": "Free Quote", "form_subject": f"Quote {i}"},
+            "what_we_take": [{"title": f"Item {n}", "description": "We haul it & recycle it."} for n in range(3)],
+            "how_it_works": [{"title": f"Step {n}", "description": "Book, we load, done."} for n in range(3)],
+            "pricing": [{"title": "Volume based", "description": "Pay for the space you use."}] * 2,
+            "faq": [{"question": f"Question {n}?", "answer": f"Answer {n}."} for n in range(4)],
+            "closing_cta": {"button_label": "Get My Quote Now"},
+            "service_type": "Junk removal",
+        }
+        pages.append((slugify(name), group, content))
+    return pages
+
+
+def measure(renderer: Callable[[str, Dict, Dict], str], pages: List[Tuple[str, Dict, Dict]]) -> float:
+    started = time.perf_counter()
+    for slug, group, content in pages:
+        renderer(slug, group, content)
+    return len(pages) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark landing page rendering")
+    parser.add_argument("--pages", type=int, default=10000, help="Number of synthetic groups to render")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions per renderer")
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.pages)
+
+    mismatches = sum(1 for page in pages[:200] if legacy_render_page_html(*page) != render_page_html(*page))
+    if mismatches:
+        print(f"❌ {mismatches} of the first 200 pages differ between renderers")
+        return
+
+    print(f"📊 Rendering {args.pages} synthetic pages (best of {args.repeat})")
+    before = max(measure(legacy_render_page_html, pages) for _ in range(args.repeat))
+    after = max(measure(render_page_html, pages) for _ in range(args.repeat))
+    print(f"  • str.format + replace: {before:,.0f} pages/sec")
+    print(f"  • precompiled fragments: {after:,.0f} pages/sec")
+    print(f"  • speedup: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
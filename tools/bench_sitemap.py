@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming sitemap writer and iterparse reader.
+Writes N synthetic URLs through sitemap_shards.write_sitemaps() from a generator,
+reads them back with read_sitemap(), and (optionally) reads them with a plain
+ElementTree.parse() per file for comparison. Each step runs in a fresh child
+process so its peak RSS is measured on its own; flat memory means the RSS growth
+stays the same from 100k to 1M URLs while the time grows linearly.
+"""
+
+import argparse
+import gzip
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator
+
+from sitemap_shards import BASE_URL, MAX_URLS, SITEMAP_NS, read_sitemap, write_sitemaps
+
+CATEGORIES = ("core", "blog", "locations", "landing_static", "landing_generated")
+
+
+def synthetic_pages(count: int) -> Iterator[Dict]:
+    """count entries, URL-sorted within each category, generated lazily."""
+    for i in range(count):
+        category = CATEGORIES[-1] if i % 50 else CATEGORIES[(i // 50) % 4]
+        yield {
+            "url": f"{BASE_URL}{category.replace('_', '-')}/page-{i:08d}/",
+            "lastmod": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "changefreq": "monthly",
+            "priority": "0.7",
+            "category": category,
+        }
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_step(step: str, count: int, directory: Path, gzip_output: bool, max_urls: int) -> Dict:
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+    if step == "write":
+        report = write_sitemaps(synthetic_pages(count), directory, gzip_output=gzip_output, max_urls=max_urls)
+        urls = count
+        files = len(report["written"])
+    elif step == "read":
+        urls = sum(1 for _ in read_sitemap(directory / "sitemap.xml"))
+        files = 0
+    else:
+        # What the tools did before: parse every file into a full tree
+        urls = files = 0
+        index = ET.parse(directory / "sitemap.xml").getroot()
+        for loc in index.iter(f"{{{SITEMAP_NS}}}loc"):
+            shard = directory / loc.text.rsplit("/", 1)[-1]
+            tree = ET.parse(gzip.open(shard) if shard.suffix == ".gz" else shard)
+            urls += sum(1 for _ in tree.getroot().iter(f"{{{SITEMAP_NS}}}url"))
+            files += 1
+    return {"seconds": time.perf_counter() - started, "urls": urls, "files": files, "rss_growth_mb": peak_rss_mb() - baseline}
+
+
+def child(step: str, count: int, directory: Path, gzip_output: bool, max_urls: int) -> Dict:
+    command = [sys.executable, __file__, "--child", step, "--sizes", str(count), "--dir", str(directory), "--max-urls", str(max_urls)]
+    if gzip_output:
+        command.append("--gzip")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming sitemap write/read")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="URL counts to test")
+    parser.add_argument("--gzip", action="store_true", help="Write gzipped shards")
+    parser.add_argument("--max-urls", type=int, default=MAX_URLS, help="URLs per shard")
+    parser.add_argument("--tree", action="store_true", help="Also time a full ElementTree.parse() read for comparison")
+    parser.add_argument("--child", choices=("write", "read", "tree"), help=argparse.SUPPRESS)
+    parser.add_argument("--dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_step(args.child, args.sizes[0], args.dir, args.gzip, args.max_urls)))
+        return
+
+    steps = ("write", "read", "tree") if args.tree else ("write", "read")
+    print(f"📊 Sitemap streaming benchmark ({'gzip' if args.gzip else 'plain XML'}, {args.max_urls:,} URLs per shard)")
+    print(f"{'URLs':>10} {'step':>6} {'seconds':>9} {'URLs/sec':>11} {'files':>6} {'RSS growth':>11}")
+    for count in args.sizes:
+        with tempfile.TemporaryDirectory(prefix="sitemap-bench-") as tmp:
+            for step in steps:
+                result = child(step, count, Path(tmp), args.gzip, args.max_urls)
+                if result["urls"] != count:
+                    print(f"❌ {step} saw {result['urls']:,} URLs, expected {count:,}")
+                    return
+                print(
+                    f"{count:>10,} {step:>6} {result['seconds']:>9.2f} {count / result['seconds']:>11,.0f} "
+                    f"{result['files'] or '':>6} {result['rss_growth_mb']:>8.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build manifest for incremental landing page generation.
+Stores, per slug, a hash of everything that feeds the page (group entry, prompt,
+model, template version) and a hash of the HTML that was written, so unchanged
+pages are neither regenerated nor rewritten and keep their mtimes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+
+def hash_inputs(*parts) -> str:
+    """Stable SHA-256 over JSON-serialisable inputs."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_bytes_if_changed(output_file: Path, data: bytes) -> Tuple[bool, str]:
+    """Atomically write data unless the file already holds these exact bytes.
+
+    Returns (written, sha256 of data).
+    """
+    output_hash = hash_bytes(data)
+    try:
+        if output_file.stat().st_size == len(data) and hash_bytes(output_file.read_bytes()) == output_hash:
+            return False, output_hash
+    except OSError:
+        pass
+
+    # Write to a sibling temp file and rename, so readers and other workers
+    # never see a half-written page.
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, output_file)
+    return True, output_hash
+
+
+class BuildManifest:
+    """JSON file mapping slug -> {"input": hash, "output": hash, "size": bytes}."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[str, Dict] = self._load()
+        self.changed: Set[str] = set()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return json.load(f).get("pages", {})
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"⚠️  Ignoring unreadable build manifest {self.path}: {exc}")
+            return {}
+
+    def is_current(self, slug: str, input_hash: str, output_file: Path) -> bool:
+        """True when the page was last built from the same inputs and is still on disk."""
+        entry = self.entries.get(slug)
+        return bool(entry) and entry.get("input") == input_hash and output_file.exists()
+
+    def write_if_changed(self, slug: str, input_hash: str, output_file: Path, page_html: str) -> bool:
+        """Write page_html unless the file already holds these exact bytes; returns True if written."""
+        data = page_html.encode("utf-8")
+        written, output_hash = write_bytes_if_changed(output_file, data)
+        self.record(slug, input_hash, output_hash, len(data))
+        return written
+
+    def record(self, slug: str, input_hash: str, output_hash: str, size: int) -> None:
+        entry = {"input": input_hash, "output": output_hash, "size": size}
+        if self.entries.get(slug) != entry:
+            self.entries[slug] = entry
+            self.changed.add(slug)
+
+    def get(self, slug: str) -> Optional[Dict]:
+        return self.entries.get(slug)
+
+    def save(self) -> None:
+        """Merge this run's changed entries into the manifest on disk and replace it atomically.
+
+        Re-reading first keeps entries recorded meanwhile by other workers sharing the file.
+        """
+        if not self.changed:
+            return
+        merged = self._load()
+        merged.update({slug: self.entries[slug] for slug in self.changed})
+        self.entries = merged
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"version": 1, "pages": merged}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.changed.clear()
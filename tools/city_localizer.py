@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Deterministic city localizer for service × location landing pages.
+Instead of asking Grok for every city variant of a service, one base page is
+generated with a [CITY] placeholder and each city page is derived from it locally:
+the city name is substituted and a phrase bank keyed on the city's ZIP codes,
+nearby areas and landmarks fills the locally specific bullets, FAQ and meta copy.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+CITY_TOKEN = "[CITY]"
+BRAND = "Grime To Dime"
+
+
+class CityProfile(NamedTuple):
+    name: str
+    zips: Tuple[str, ...]
+    nearby: Tuple[str, ...]
+    landmarks: Tuple[str, ...]
+
+
+# Howard County service areas, keyed by the location slugs used in locations/ and
+# build_service_location_matrix.py.
+CITY_PROFILES: Dict[str, CityProfile] = {
+    "annapolis-junction-md": CityProfile("Annapolis Junction", ("20701",), ("Savage", "Jessup", "Laurel"), ("Annapolis Junction Town Center", "Route 32")),
+    "catonsville-md": CityProfile("Catonsville", ("21228",), ("Ellicott City", "Ilchester", "Elkridge"), ("Frederick Road", "UMBC")),
+    "clarksville-md": CityProfile("Clarksville", ("21029",), ("Columbia", "Highland", "Fulton"), ("River Hill", "Route 108")),
+    "columbia-md": CityProfile("Columbia", ("21044", "21045", "21046"), ("Ellicott City", "Clarksville", "Savage"), ("Lake Kittamaqundi", "Merriweather Post Pavilion")),
+    "cooksville-md": CityProfile("Cooksville", ("21723",), ("Lisbon", "West Friendship", "Glenwood"), ("Route 97", "Route 144")),
+    "daniels-md": CityProfile("Daniels", ("21043",), ("Ellicott City", "Marriottsville", "Ilchester"), ("the Patapsco River", "Patapsco Valley State Park")),
+    "dayton-md": CityProfile("Dayton", ("21036",), ("Clarksville", "Glenelg", "Highland"), ("Route 32", "Route 108")),
+    "dorsey-md": CityProfile("Dorsey", ("21075", "21076"), ("Elkridge", "Hanover", "Jessup"), ("the Dorsey MARC station", "Route 100")),
+    "elkridge-md": CityProfile("Elkridge", ("21075",), ("Ellicott City", "Hanover", "Dorsey"), ("the Thomas Viaduct", "the Route 1 corridor")),
+    "ellicott-city-md": CityProfile("Ellicott City", ("21042", "21043"), ("Columbia", "Catonsville", "Elkridge"), ("historic Main Street", "Patapsco Valley State Park")),
+    "fulton-md": CityProfile("Fulton", ("20759",), ("Scaggsville", "Clarksville", "Columbia"), ("Maple Lawn", "Route 216")),
+    "glenelg-md": CityProfile("Glenelg", ("21737",), ("Glenwood", "Dayton", "West Friendship"), ("Triadelphia Reservoir", "Route 32")),
+    "glenwood-md": CityProfile("Glenwood", ("21738",), ("Cooksville", "Glenelg", "Lisbon"), ("Western Regional Park", "Route 97")),
+    "hanover-md": CityProfile("Hanover", ("21076",), ("Elkridge", "Dorsey", "Jessup"), ("Arundel Mills", "BWI Airport")),
+    "highland-md": CityProfile("Highland", ("20777",), ("Clarksville", "Fulton", "Dayton"), ("Route 108", "Route 216")),
+    "ilchester-md": CityProfile("Ilchester", ("21043",), ("Ellicott City", "Catonsville", "Elkridge"), ("Ilchester Road", "Patapsco Valley State Park")),
+    "jessup-md": CityProfile("Jessup", ("20794",), ("Savage", "Elkridge", "Annapolis Junction"), ("the Route 1 corridor", "Route 175")),
+    "laurel-md": CityProfile("Laurel", ("20723", "20724"), ("Savage", "Scaggsville", "Fulton"), ("Laurel Park", "Route 216")),
+    "lisbon-md": CityProfile("Lisbon", ("21765",), ("Cooksville", "Glenwood", "West Friendship"), ("Route 94", "Route 144")),
+    "marriottsville-md": CityProfile("Marriottsville", ("21104",), ("West Friendship", "Ellicott City", "Daniels"), ("Waverly Woods", "Route 99")),
+    "savage-md": CityProfile("Savage", ("20763",), ("Laurel", "Jessup", "Columbia"), ("Savage Mill", "Savage Park")),
+    "scaggsville-md": CityProfile("Scaggsville", ("20723",), ("Fulton", "Laurel", "Highland"), ("Maple Lawn", "Route 216")),
+    "west-friendship-md": CityProfile("West Friendship", ("21794",), ("Marriottsville", "Cooksville", "Glenelg"), ("the Howard County Fairgrounds", "Route 32")),
+}
+
+# Each slot lists interchangeable phrasings; a page always gets the same one (chosen
+# from a hash of its slug) so reruns produce identical HTML.
+PHRASE_BANK: Dict[str, Tuple[str, ...]] = {
+    "hero_bullet": (
+        "Serving {city} ZIP {zips}",
+        "Local crews in {city} & {nearby_first}",
+        "Pickups near {landmark} and all of {city}",
+    ),
+    "faq_question": (
+        "Do you serve {city}?",
+        "Do you pick up in {city}, MD?",
+        "Which parts of {city} do you cover?",
+    ),
+    "faq_answer": (
+        "Yes. We haul from homes and businesses throughout {city} ({zips}) and nearby {nearby}, including around {landmark}.",
+        "Every day. Our trucks cover all of {city} ({zips}), from {landmark} to the neighborhoods bordering {nearby}.",
+        "All of it, plus {nearby}. Whether you're near {landmark} or anywhere else in {city} ({zips}), we can usually schedule same or next day.",
+    ),
+    "meta_suffix": (
+        " Serving {city} {zips}.",
+        " Local to {city}, MD.",
+        " Near {landmark} in {city}.",
+    ),
+}
+
+META_MIN, META_MAX = 140, 165
+TITLE_MAX = 60
+
+
+def city_profile(location: Dict) -> CityProfile:
+    """Profile for a group's "location" entry; unknown cities fall back to the name alone."""
+    profile = CITY_PROFILES.get(location.get("slug", ""))
+    if profile is not None:
+        return profile
+    return CityProfile(location.get("city", ""), (), (), ())
+
+
+def pick(slot: str, slug: str) -> str:
+    options = PHRASE_BANK[slot]
+    digest = hashlib.sha1(f"{slot}:{slug}".encode("utf-8")).digest()
+    return options[int.from_bytes(digest[:4], "big") % len(options)]
+
+
+def join_words(items: Sequence[str]) -> str:
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + " and " + items[-1]
+
+
+def phrase_values(profile: CityProfile) -> Dict[str, str]:
+    return {
+        "city": profile.name,
+        "zips": join_words(profile.zips) or "and surrounding ZIP codes",
+        "nearby": join_words(profile.nearby) or "the rest of Howard County",
+        "nearby_first": profile.nearby[0] if profile.nearby else "Howard County",
+        "landmark": profile.landmarks[0] if profile.landmarks else "downtown",
+    }
+
+
+def is_localizable(group: Dict) -> bool:
+    """Groups from build_service_location_matrix.py carry a service_type and a location."""
+    location = group.get("location")
+    return bool(group.get("service_type")) and isinstance(location, dict) and bool(location.get("city"))
+
+
+def template_group(group: Dict) -> Dict:
+    """City-neutral copy of an expanded group, identical for every city of a service."""
+    city = re.compile(re.escape(group["location"]["city"]), re.IGNORECASE)
+
+    def neutral(text: str) -> str:
+        return city.sub(CITY_TOKEN, text)
+
+    keywords: List[str] = []
+    for keyword in group.get("keywords", []):
+        keyword = neutral(keyword)
+        if keyword not in keywords:
+            keywords.append(keyword)
+
+    return {
+        "name": neutral(group.get("name", "")),
+        "description": neutral(group.get("description", "")),
+        "primary_keyword": neutral(group.get("primary_keyword", "")),
+        "keywords": keywords,
+        "service_type": group["service_type"],
+    }
+
+
+def substitute(value: Any, city: str) -> Any:
+    if isinstance(value, str):
+        return value.replace(CITY_TOKEN, city)
+    if isinstance(value, list):
+        return [substitute(item, city) for item in value]
+    if isinstance(value, dict):
+        return {key: substitute(item, city) for key, item in value.items()}
+    return value
+
+
+def fit_title(title: str, service: str, city: str) -> str:
+    if title and len(title) <= TITLE_MAX:
+        return title
+    for candidate in (f"{service} | {city} | {BRAND}", f"{service} | {city}", f"{service} {city}"):
+        if len(candidate) <= TITLE_MAX:
+            return candidate
+    return f"{service} {city}"[:TITLE_MAX].rstrip()
+
+
+def fit_meta(description: str, suffix: str) -> str:
+    """Pad a short meta description with the local suffix or trim a long one at a word boundary."""
+    text = description.strip()
+    if len(text) < META_MIN:
+        text = text.rstrip(".") + "." + suffix if text else suffix.strip()
+    if len(text) > META_MAX:
+        text = text[: META_MAX - 1].rsplit(" ", 1)[0].rstrip(",;:-") + "."
+    return text
+
+
+def localize_content(base: Dict, group: Dict, slug: str) -> Dict:
+    """Derive one city page from the [CITY]-templated base content for its service."""
+    profile = city_profile(group["location"])
+    values = phrase_values(profile)
+    content = substitute(base, profile.name)
+
+    content["page_title"] = fit_title(content.get("page_title", ""), group["service_type"], profile.name)
+    content["meta_description"] = fit_meta(
+        content.get("meta_description", ""), pick("meta_suffix", slug).format(**values)
+    )
+
+    hero = content.get("hero")
+    if isinstance(hero, dict) and isinstance(hero.get("bullets"), list):
+        hero["bullets"] = hero["bullets"][:2] + [pick("hero_bullet", slug).format(**values)]
+
+    faq = content.get("faq")
+    if isinstance(faq, list):
+        local = {
+            "question": pick("faq_question", slug).format(**values),
+            "answer": pick("faq_answer", slug).format(**values),
+        }
+        content["faq"] = faq[:3] + [local]
+
+    return content
+
+
+def apply_local_flavor(content: Dict, paragraph: Optional[str]) -> Dict:
+    """Use an LLM-written local paragraph as the hero subheading when one is available."""
+    if paragraph and isinstance(content.get("hero"), dict):
+        content["hero"]["subheading"] = paragraph.strip()
+    return content
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Section-level validator for the landing page content schema.
+The schema mirrors the JSON structure requested in CONTENT_PROMPT_TEMPLATE. It is
+compiled once into one check function per section, so a response can be validated
+quickly and only the failing sections re-requested.
+"""
+
+import abc
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+Check = Callable[[Any, str, List[str]], None]
+
+
+class Spec(abc.ABC):
+    """A schema node that can compile itself into a check and describe its shape."""
+
+    @abc.abstractmethod
+    def compile(self) -> Check:
+        """Return a check that appends the problems of a value at path to problems."""
+
+    @abc.abstractmethod
+    def skeleton(self) -> Any:
+        """Return an example value of this shape for the prompt."""
+
+    def rules(self, path: str) -> List[str]:
+        return []
+
+
+class Text(Spec):
+    def __init__(self, min_len: int = 1, max_len: Optional[int] = None):
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def compile(self) -> Check:
+        min_len, max_len = self.min_len, self.max_len
+
+        def check(value: Any, path: str, problems: List[str]) -> None:
+            if not isinstance(value, str) or not value.strip():
+                problems.append(f"{path} missing")
+                return
+            length = len(value.strip())
+            if length < min_len:
+                problems.append(f"{path} too short ({length} < {min_len} chars)")
+            elif max_len is not None and length > max_len:
+                problems.append(f"{path} too long ({length} > {max_len} chars)")
+
+        return check
+
+    def skeleton(self) -> Any:
+        return ""
+
+    def rules(self, path: str) -> List[str]:
+        if self.max_len is not None and self.min_len > 1:
+            return [f"{path}: {self.min_len}-{self.max_len} characters"]
+        if self.max_len is not None:
+            return [f"{path}: at most {self.max_len} characters"]
+        return []
+
+
+class Object(Spec):
+    def __init__(self, **fields: Spec):
+        self.fields = fields
+
+    def compile(self) -> Check:
+        checks = [(name, spec.compile()) for name, spec in self.fields.items()]
+
+        def check(value: Any, path: str, problems: List[str]) -> None:
+            if not isinstance(value, dict) or not value:
+                problems.append(f"{path} missing")
+                return
+            for name, field_check in checks:
+                field_check(value.get(name), f"{path}.{name}", problems)
+
+        return check
+
+    def skeleton(self) -> Any:
+        return {name: spec.skeleton() for name, spec in self.fields.items()}
+
+    def rules(self, path: str) -> List[str]:
+        return [rule for name, spec in self.fields.items() for rule in spec.rules(f"{path}.{name}")]
+
+
+class Items(Spec):
+    def __init__(self, item: Spec, count: int):
+        self.item = item
+        self.count = count
+
+    def compile(self) -> Check:
+        item_check, count = self.item.compile(), self.count
+
+        def check(value: Any, path: str, problems: List[str]) -> None:
+            if not isinstance(value, list) or not value:
+                problems.append(f"{path} missing")
+                return
+            if len(value) < count:
+                problems.append(f"{path} has {len(value)} of {count} items")
+            for index, item in enumerate(value[:count]):
+                item_check(item, f"{path}[{index}]", problems)
+
+        return check
+
+    def skeleton(self) -> Any:
+        return [self.item.skeleton() for _ in range(self.count)]
+
+    def rules(self, path: str) -> List[str]:
+        return self.item.rules(f"{path}[]")
+
+
+CARD = Object(title=Text(), description=Text())
+
+CONTENT_SCHEMA: Dict[str, Spec] = {
+    "page_title": Text(max_len=60),
+    "meta_description": Text(min_len=140, max_len=165),
+    "hero": Object(heading=Text(), subheading=Text(), bullets=Items(Text(), 3)),
+    "quote_form": Object(
+        heading=Text(),
+        details_label=Text(),
+        details_placeholder=Text(),
+        submit_label=Text(),
+        note=Text(),
+        form_subject=Text(),
+    ),
+    "what_we_take": Items(CARD, 3),
+    "how_it_works": Items(CARD, 3),
+    "pricing": Items(CARD, 2),
+    "faq": Items(Object(question=Text(), answer=Text()), 4),
+    "closing_cta": Object(button_label=Text(), closing_copy=Text()),
+    "service_type": Text(),
+}
+
+_COMPILED = [(section, spec.compile()) for section, spec in CONTENT_SCHEMA.items()]
+_COMPILED_BY_SECTION = dict(_COMPILED)
+
+
+def validate_content(content: Any) -> Dict[str, List[str]]:
+    """Return {section: [problems]} for every section that is missing, malformed or out of length."""
+    if not isinstance(content, dict):
+        return {section: [f"{section} missing"] for section in CONTENT_SCHEMA}
+
+    report: Dict[str, List[str]] = {}
+    for section, check in _COMPILED:
+        problems: List[str] = []
+        check(content.get(section), section, problems)
+        if problems:
+            report[section] = problems
+    return report
+
+
+def validate_section(section: str, value: Any) -> List[str]:
+    problems: List[str] = []
+    _COMPILED_BY_SECTION[section](value, section, problems)
+    return problems
+
+
+def sections_skeleton(sections: List[str]) -> str:
+    """JSON skeleton containing only the given sections, for targeted re-requests."""
+    return json.dumps({section: CONTENT_SCHEMA[section].skeleton() for section in sections}, indent=2)
+
+
+def sections_rules(sections: List[str]) -> List[str]:
+    return [rule for section in sections for rule in CONTENT_SCHEMA[section].rules(section)]
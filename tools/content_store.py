@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Content store for generated landing pages.
+Keeps the structured copy Grok returned for every page (hero, faq, pricing, ...)
+together with its keyword group in one SQLite file, so pages can be re-rendered
+after a template change without calling the LLM again.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    slug TEXT PRIMARY KEY,
+    grp TEXT NOT NULL,
+    content TEXT NOT NULL,
+    options TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+class StoredPage(NamedTuple):
+    slug: str
+    group: Dict
+    content: Dict
+    options: Dict
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class ContentStore:
+    """slug -> (group, content, generation options), safe to share between processes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def put(self, slug: str, group: Dict, content: Dict, options: Optional[Dict] = None) -> None:
+        self.put_many([(slug, group, content, options)])
+
+    def put_many(self, pages: Iterable[Tuple[str, Dict, Dict, Optional[Dict]]]) -> None:
+        """Upsert (slug, group, content, options) rows in one transaction."""
+        now = time.time()
+        with self._connect() as db:
+            db.executemany(
+                "INSERT INTO pages (slug, grp, content, options, updated) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(slug) DO UPDATE SET grp = excluded.grp, content = excluded.content, "
+                "options = excluded.options, updated = excluded.updated",
+                (
+                    (slug, _dumps(group), _dumps(content), _dumps(options or {}), now)
+                    for slug, group, content, options in pages
+                ),
+            )
+
+    def get(self, slug: str) -> Optional[StoredPage]:
+        with self._connect() as db:
+            row = db.execute("SELECT slug, grp, content, options FROM pages WHERE slug = ?", (slug,)).fetchone()
+        return self._page(row) if row else None
+
+    def pages(self) -> Iterator[StoredPage]:
+        with self._connect() as db:
+            rows = db.execute("SELECT slug, grp, content, options FROM pages ORDER BY slug").fetchall()
+        for row in rows:
+            yield self._page(row)
+
+    def __len__(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    @staticmethod
+    def _page(row) -> StoredPage:
+        slug, group, content, options = row
+        return StoredPage(slug, json.loads(group), json.loads(content), json.loads(options))
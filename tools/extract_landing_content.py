@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Recover structured copy from rendered landing pages.
+Parses each landing/<slug>/index.html back into the generator's content schema
+(hero, quote form, feature cards, FAQ, JSON-LD) and stores it in the content store,
+so the existing corpus can be re-rendered from data instead of regenerated.
+
+A page round-trips when re-rendering the extracted content reproduces every
+content slot of the original (headings, bullets, cards, form copy, FAQ JSON-LD).
+Template-level differences outside the slots (markup a later script patched into
+the page but not into HTML_TEMPLATE) are drift: such pages are stored with
+"drift": true in their options, and `generate_landing_pages.py render` refuses
+to overwrite them until the template catches up or --force is given.
+"""
+
+import argparse
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from content_store import ContentStore
+from generate_landing_pages import render_page_html
+
+# Section headings in HTML_TEMPLATE -> content key of the card grid that follows them.
+GRID_SECTIONS = {
+    "What We Take": "what_we_take",
+    "How It Works": "how_it_works",
+    "Pricing & Availability": "pricing",
+}
+
+REQUIRED_SLOTS = (
+    "page_title",
+    "meta_description",
+    "hero.heading",
+    "hero.subheading",
+    "hero.bullets",
+    "cta.0",
+    "quote.heading",
+    "quote.form_subject",
+    "quote.details_label",
+    "quote.details_placeholder",
+    "quote.submit_label",
+    "quote.note",
+    "what_we_take",
+    "how_it_works",
+    "pricing",
+    "faq.heading",
+    "faq",
+    "jsonld.0",
+)
+
+Event = Tuple
+
+
+class LandingPageParser(HTMLParser):
+    """Collects the parse events inside every content slot of a landing page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.slots: Dict[str, List[Event]] = {}
+        self._slot: Optional[str] = None
+        self._slot_tag = ""
+        self._depth = 0
+        self._section_class = ""
+        self._section_id = ""
+        self._section_title = ""
+        self._ctas = 0
+        self._scripts = 0
+
+    def _open(self, name: str, tag: str) -> None:
+        self._slot, self._slot_tag, self._depth = name, tag, 1
+        self.slots[name] = []
+
+    def handle_starttag(self, tag: str, attr_list: List[Tuple[str, Optional[str]]]) -> None:
+        attrs = {key: value or "" for key, value in attr_list}
+        if self._slot is not None:
+            self.slots[self._slot].append(("start", tag, tuple(sorted(attrs.items()))))
+            if tag == self._slot_tag:
+                self._depth += 1
+            return
+
+        classes = attrs.get("class", "").split()
+        if tag == "section":
+            self._section_class, self._section_id, self._section_title = attrs.get("class", ""), attrs.get("id", ""), ""
+        elif tag == "title":
+            self._open("page_title", tag)
+        elif tag == "meta" and attrs.get("name") == "description":
+            self.slots["meta_description"] = [("data", attrs.get("content", ""))]
+        elif tag == "h1":
+            self._open("hero.heading", tag)
+        elif tag == "p" and "sub" in classes:
+            self._open("hero.subheading", tag)
+        elif tag == "ul" and "hero-bullets" in classes:
+            self._open("hero.bullets", tag)
+        elif tag == "a" and "cta-button" in classes:
+            self._open(f"cta.{self._ctas}", tag)
+            self._ctas += 1
+        elif tag == "h2":
+            self._open("h2", tag)
+        elif tag == "input" and attrs.get("name") == "_subject":
+            self.slots["quote.form_subject"] = [("data", attrs.get("value", ""))]
+        elif tag == "label" and attrs.get("for") == "details":
+            self._open("quote.details_label", tag)
+        elif tag == "textarea" and attrs.get("id") == "details":
+            self.slots["quote.details_placeholder"] = [("data", attrs.get("placeholder", ""))]
+        elif tag == "button" and "submit-button" in classes:
+            self._open("quote.submit_label", tag)
+        elif tag == "p" and "form-note" in classes:
+            self._open("quote.note", tag)
+        elif tag == "div" and ("grid-3" in classes or "grid-2" in classes):
+            key = "faq" if self._section_id == "faq" else GRID_SECTIONS.get(self._section_title)
+            if key:
+                self._open(key, tag)
+        elif tag == "script" and attrs.get("type") == "application/ld+json":
+            self._open(f"jsonld.{self._scripts}", tag)
+            self._scripts += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._slot is None:
+            return
+        if tag == self._slot_tag:
+            self._depth -= 1
+            if self._depth == 0:
+                self._close()
+                return
+        self.slots[self._slot].append(("end", tag))
+
+    def handle_data(self, data: str) -> None:
+        if self._slot is not None:
+            self.slots[self._slot].append(("data", data))
+
+    def _close(self) -> None:
+        name, self._slot = self._slot, None
+        if name != "h2":
+            return
+        heading = slot_text(self.slots.pop("h2"))
+        if "hero" in self._section_class.split():
+            self.slots["quote.heading"] = [("data", heading)]
+        elif self._section_id == "faq":
+            self.slots["faq.heading"] = [("data", heading)]
+        else:
+            self._section_title = heading
+
+
+def slot_text(events: List[Event]) -> str:
+    return "".join(event[1] for event in events if event[0] == "data")
+
+
+def split_items(events: List[Event], item_tag: str) -> List[List[Event]]:
+    """Group a slot's events into one list per top-level item_tag element."""
+    items: List[List[Event]] = []
+    depth = 0
+    for event in events:
+        if event[0] == "start" and event[1] == item_tag:
+            if depth == 0:
+                items.append([])
+            depth += 1
+        elif event[0] == "end" and event[1] == item_tag:
+            depth -= 1
+        elif items and depth > 0:
+            items[-1].append(event)
+    return items
+
+
+def tag_text(events: List[Event], tag: str) -> str:
+    inside, parts = False, []
+    for event in events:
+        if event[0] == "start" and event[1] == tag:
+            inside = True
+        elif event[0] == "end" and event[1] == tag:
+            inside = False
+        elif inside and event[0] == "data":
+            parts.append(event[1])
+    return "".join(parts)
+
+
+def cards(events: List[Event], first: str, second: str) -> List[Dict[str, str]]:
+    result = []
+    for item in split_items(events, "div"):
+        title = tag_text(item, "h3")
+        # feature_cards_html puts an icon and one space before the title.
+        if title.startswith(" ") and any(event[0] == "start" and event[1] == "i" for event in item):
+            title = title[1:]
+        result.append({first: title, second: tag_text(item, "p")})
+    return result
+
+
+def parse_json_ld(slots: Dict[str, List[Event]]) -> Dict[str, Dict]:
+    blocks = {}
+    for name, events in slots.items():
+        if name.startswith("jsonld."):
+            try:
+                data = json.loads(slot_text(events))
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict) and data.get("@type"):
+                blocks[data["@type"]] = data
+    return blocks
+
+
+def slots_to_content(slots: Dict[str, List[Event]]) -> Tuple[Dict, Dict, List[str]]:
+    """Build (group, content, problems) from the slots of one page."""
+    problems = [f"missing {name}" for name in REQUIRED_SLOTS if name not in slots]
+    text = {name: slot_text(events) for name, events in slots.items()}
+    json_ld = parse_json_ld(slots)
+
+    faq = cards(slots.get("faq", []), "question", "answer")
+    ld_faq = [
+        {"question": entity.get("name", ""), "answer": (entity.get("acceptedAnswer") or {}).get("text", "")}
+        for entity in (json_ld.get("FAQPage") or {}).get("mainEntity", [])
+    ]
+    visible = [{key: value.strip() for key, value in item.items()} for item in faq]
+    if ld_faq[: len(visible)] != visible:
+        problems.append("FAQ JSON-LD disagrees with the visible FAQ")
+    elif len(ld_faq) > len(faq):
+        # The visible FAQ is capped at four entries; JSON-LD keeps the rest.
+        faq = faq + ld_faq[len(faq):]
+
+    service = json_ld.get("Service") or {}
+    if service.get("name") != text.get("hero.heading"):
+        problems.append("Service JSON-LD name differs from the hero heading")
+    button_label = text.get("cta.0", "")
+    if any(text.get(f"cta.{n}", button_label) != button_label for n in (1, 2)):
+        problems.append("CTA labels differ between sections")
+
+    faq_heading = text.get("faq.heading", "")
+    group = {"name": faq_heading[: -len(" FAQ")] if faq_heading.endswith(" FAQ") else faq_heading}
+    content = {
+        "page_title": text.get("page_title", ""),
+        "meta_description": text.get("meta_description", ""),
+        "hero": {
+            "heading": text.get("hero.heading", ""),
+            "subheading": text.get("hero.subheading", ""),
+            "bullets": [slot_text(item) for item in split_items(slots.get("hero.bullets", []), "li")],
+        },
+        "quote_form": {
+            "heading": text.get("quote.heading", ""),
+            "details_label": text.get("quote.details_label", ""),
+            "details_placeholder": text.get("quote.details_placeholder", ""),
+            "submit_label": text.get("quote.submit_label", ""),
+            "note": text.get("quote.note", ""),
+            "form_subject": text.get("quote.form_subject", ""),
+        },
+        "what_we_take": cards(slots.get("what_we_take", []), "title", "description"),
+        "how_it_works": cards(slots.get("how_it_works", []), "title", "description"),
+        "pricing": cards(slots.get("pricing", []), "title", "description"),
+        "faq": faq,
+        "closing_cta": {"button_label": button_label},
+        "service_type": service.get("serviceType", ""),
+    }
+    return group, content, problems
+
+
+def parse_slots(page_html: str) -> Dict[str, List[Event]]:
+    parser = LandingPageParser()
+    parser.feed(page_html)
+    parser.close()
+    return parser.slots
+
+
+def comparable(name: str, events: List[Event]):
+    """Slot value used for the round-trip check; areaServed is template data, not page copy."""
+    if name.startswith("jsonld."):
+        try:
+            data = json.loads(slot_text(events))
+        except json.JSONDecodeError:
+            return slot_text(events)
+        if isinstance(data, dict):
+            data.pop("areaServed", None)
+        return data
+    return events
+
+
+class Extraction(NamedTuple):
+    slug: str
+    group: Dict
+    content: Dict
+    problems: List[str]
+    drift: bool
+
+
+def extract_page(path: Path) -> Extraction:
+    slug = path.parent.name
+    original = path.read_text(encoding="utf-8")
+    slots = parse_slots(original)
+    group, content, problems = slots_to_content(slots)
+
+    rendered = render_page_html(slug, group, content)
+    rendered_slots = parse_slots(rendered)
+    for name, events in slots.items():
+        if comparable(name, events) != comparable(name, rendered_slots.get(name, [])):
+            problems.append(f"{name} does not round-trip")
+    return Extraction(slug, group, content, problems, rendered != original)
+
+
+def extract_chunk(paths: List[str]) -> List[Extraction]:
+    return [extract_page(Path(path)) for path in paths]
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Recover structured content from rendered landing pages")
+    parser.add_argument("--landing", type=Path, default=project_root / "landing", help="Directory of rendered landing pages")
+    parser.add_argument("--store", type=Path, default=project_root / ".cache" / "content_store.sqlite", help="Content store to fill")
+    parser.add_argument("--workers", type=int, default=None, help="Parsing processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Pages per worker task")
+    parser.add_argument("--report", type=Path, default=None, help="Write flagged pages and their problems to this JSON file")
+    parser.add_argument("--store-flagged", action="store_true", help="Also store pages that do not round-trip cleanly")
+    parser.add_argument("--dry-run", action="store_true", help="Extract and check only; do not touch the content store")
+    args = parser.parse_args()
+
+    paths = sorted(str(path) for path in args.landing.glob("*/index.html"))
+    if not paths:
+        print(f"❌ No landing pages found under {args.landing}")
+        return
+
+    started = time.monotonic()
+    chunks = [paths[i : i + args.chunk_size] for i in range(0, len(paths), args.chunk_size)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = [page for chunk in pool.map(extract_chunk, chunks) for page in chunk]
+    elapsed = time.monotonic() - started
+
+    flagged = [page for page in results if page.problems]
+    drifted = sum(1 for page in results if page.drift)
+    print(f"📄 Extracted {len(results)} pages in {elapsed:.2f}s")
+    print(f"  • {len(results) - len(flagged)} round-trip cleanly")
+    print(f"  • {len(flagged)} flagged")
+    print(f"  • {drifted} differ from a fresh render outside the content slots (template drift)")
+
+    reasons = Counter(problem for page in flagged for problem in page.problems)
+    for problem, count in reasons.most_common(10):
+        print(f"    {count:5d}  {problem}")
+
+    if args.report:
+        report = {page.slug: page.problems for page in flagged}
+        args.report.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📝 Report written to {args.report}")
+
+    if args.dry_run:
+        return
+    keep = [page for page in results if args.store_flagged or not page.problems]
+    ContentStore(args.store).put_many(
+        (page.slug, page.group, page.content, {"source": "extracted", "drift": page.drift}) for page in keep
+    )
+    print(f"✅ Stored {len(keep)} pages in {args.store}")
+    kept_drift = sum(1 for page in keep if page.drift)
+    if kept_drift:
+        print(f"⚠️  {kept_drift} stored pages are marked as drifted; `render` skips them without --force")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,23 +4,30 @@ Fix hero to be full viewport height and properly load Font Awesome brands icons
 """
 
 from pathlib import Path
+import re
 
 LOCATIONS = [
     "annapolis-junction-md", "catonsville-md", "clarksville-md", "columbia-md",
     "elkridge-md", "ellicott-city-md", "laurel-md", "savage-md"
 ]
 
-def fix_location(slug):
-    """Fix hero height and Font Awesome"""
-    
-    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
-    
-    if not file_path.exists():
-        print(f"⚠️  Skipping {slug} - file not found")
-        return
-    
-    with open(file_path, 'r') as f:
-        html = f.read()
+HERO_MOBILE_OVERRIDE = '''            /* Hero section mobile */
+            .hero {
+                min-height: 100vh !important;
+            }
+            '''
+
+BRANDS_FONT_FACE = '''        /* Make sure Font Awesome loads properly */
+        @font-face {
+            font-family: 'Font Awesome 6 Brands';
+            src: url('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/webfonts/fa-brands-400.woff2') format('woff2');
+            font-weight: 400;
+            font-display: block;
+        }
+        '''
+
+def fix_hero_and_icons_html(html):
+    """Apply the hero height and Font Awesome fixes; safe to run on an already fixed page"""
     
     # Fix 1: Make hero full viewport height
     # Replace the existing hero min-height style
@@ -31,36 +38,27 @@ def fix_location(slug):
     
     # Fix 2: Add specific mobile override for hero height
     # Find the mobile hero section and ensure it's 100vh
-    if '/* Hero section mobile */' in html:
+    if '/* Hero section mobile */' in html and HERO_MOBILE_OVERRIDE not in html:
         # Add full viewport height for mobile hero
         html = html.replace(
             '            /* Hero section mobile */',
-            '''            /* Hero section mobile */
-            .hero {
-                min-height: 100vh !important;
-            }
-            '''
+            HERO_MOBILE_OVERRIDE
         )
     
     # Fix 3: Ensure Font Awesome Brands loads properly
     # Update the noscript tag to be properly closed
-    html = html.replace(
-        '<noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" integrity="sha512-9usAa10IRO0HhonpyAIVpjrylPvoDwiPUiKdWk5t3PyolY1cOd4DSE0Ga+ri4AuTroPR5aQvXU9xC6qOPnzFeg==" crossorigin="anonymous">',
-        '<noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" integrity="sha512-9usAa10IRO0HhonpyAIVpjrylPvoDwiPUiKdWk5t3PyolY1cOd4DSE0Ga+ri4AuTroPR5aQvXU9xC6qOPnzFeg==" crossorigin="anonymous"></noscript>'
+    # (only where it is not already closed)
+    html = re.sub(
+        re.escape('<noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" integrity="sha512-9usAa10IRO0HhonpyAIVpjrylPvoDwiPUiKdWk5t3PyolY1cOd4DSE0Ga+ri4AuTroPR5aQvXU9xC6qOPnzFeg==" crossorigin="anonymous">') + '(?!</noscript>)',
+        '<noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" integrity="sha512-9usAa10IRO0HhonpyAIVpjrylPvoDwiPUiKdWk5t3PyolY1cOd4DSE0Ga+ri4AuTroPR5aQvXU9xC6qOPnzFeg==" crossorigin="anonymous"></noscript>',
+        html
     )
     
     # Fix 4: Add explicit Font Awesome CSS for brands
-    if '/* Make sure Font Awesome loads properly */' in html:
+    if '/* Make sure Font Awesome loads properly */' in html and BRANDS_FONT_FACE not in html:
         html = html.replace(
             '        /* Make sure Font Awesome loads properly */',
-            '''        /* Make sure Font Awesome loads properly */
-        @font-face {
-            font-family: 'Font Awesome 6 Brands';
-            src: url('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/webfonts/fa-brands-400.woff2') format('woff2');
-            font-weight: 400;
-            font-display: block;
-        }
-        '''
+            BRANDS_FONT_FACE
         )
         
         html = html.replace(
@@ -73,6 +71,22 @@ def fix_location(slug):
         .fas, .far {'''
         )
     
+    return html
+
+def fix_location(slug):
+    """Fix hero height and Font Awesome"""
+    
+    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
+    
+    if not file_path.exists():
+        print(f"⚠️  Skipping {slug} - file not found")
+        return
+    
+    with open(file_path, 'r') as f:
+        html = f.read()
+    
+    html = fix_hero_and_icons_html(html)
+    
     print(f"✅ Fixed {slug}")
     
     with open(file_path, 'w') as f:
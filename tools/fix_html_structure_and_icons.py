@@ -11,17 +11,8 @@ LOCATIONS = [
     "elkridge-md", "ellicott-city-md", "laurel-md", "savage-md"
 ]
 
-def fix_location(slug):
-    """Fix HTML structure and icon loading"""
-    
-    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
-    
-    if not file_path.exists():
-        print(f"⚠️  Skipping {slug} - file not found")
-        return
-    
-    with open(file_path, 'r') as f:
-        html = f.read()
+def fix_html_structure_html(html):
+    """Remove broken </style> runs and load Font Awesome eagerly with a noscript fallback"""
     
     # Fix 1: Remove duplicate/broken </style> tags
     # Find the section between first </style> and </head>
@@ -45,6 +36,22 @@ def fix_location(slug):
     <noscript><link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css"'''
         )
     
+    return html
+
+def fix_location(slug):
+    """Fix HTML structure and icon loading"""
+    
+    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
+    
+    if not file_path.exists():
+        print(f"⚠️  Skipping {slug} - file not found")
+        return
+    
+    with open(file_path, 'r') as f:
+        html = f.read()
+    
+    html = fix_html_structure_html(html)
+    
     print(f"✅ Fixed {slug}")
     
     with open(file_path, 'w') as f:
@@ -104,6 +104,12 @@ VERTICAL_CENTER_FIX = '''
     </style>
 '''
 
+def fix_vertical_centering_html(html):
+    """Insert the vertical centering fix before </head> unless already present"""
+    if 'CRITICAL FIX: Vertically center icons' in html:
+        return html
+    return html.replace('</head>', f'{VERTICAL_CENTER_FIX}\n</head>')
+
 def fix_location(slug):
     """Apply vertical centering fix"""
     
@@ -122,7 +128,7 @@ def fix_location(slug):
         return
     
     # Insert the fix right before the closing </head> tag
-    html = html.replace('</head>', f'{VERTICAL_CENTER_FIX}\n</head>')
+    html = fix_vertical_centering_html(html)
     
     print(f"✅ Fixed vertical centering for {slug}")
     
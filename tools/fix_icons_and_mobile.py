@@ -272,6 +272,15 @@ MOBILE_FIX_CSS = '''
     </style>
 '''
 
+def fix_icons_and_mobile_html(html):
+    """Insert the mobile fix CSS after the beautification CSS unless already fixed"""
+    if 'FIX: Center icons perfectly' in html:
+        return html
+    return html.replace(
+        '        .service-card:nth-child(6) { animation-delay: 0.6s; }',
+        f'        .service-card:nth-child(6) {{ animation-delay: 0.6s; }}\n{MOBILE_FIX_CSS}'
+    )
+
 def fix_location(slug):
     """Fix icon centering and add mobile styles"""
     
@@ -291,10 +300,7 @@ def fix_location(slug):
     
     # Insert mobile fix CSS after the beautification CSS
     # Look for the closing of the animation keyframes section
-    html = html.replace(
-        '        .service-card:nth-child(6) { animation-delay: 0.6s; }',
-        f'        .service-card:nth-child(6) {{ animation-delay: 0.6s; }}\n{MOBILE_FIX_CSS}'
-    )
+    html = fix_icons_and_mobile_html(html)
     
     print(f"✅ Fixed {slug}")
     
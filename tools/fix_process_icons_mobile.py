@@ -48,6 +48,22 @@ MOBILE_FIX_CSS = '''
         }
 '''
 
+def fix_process_icons_html(html):
+    """Insert the mobile process icon CSS at the first known insertion point unless already present"""
+    if 'Mobile process icons - prevent overlap' in html:
+        return html
+    if '</style>\n\n    </style>' in html:
+        # Insert before the second </style>
+        return html.replace(
+            '</style>\n\n    </style>',
+            f'{MOBILE_FIX_CSS}\n    </style>\n\n    </style>'
+        )
+    # Insert before Font Awesome section (no-op when it is missing)
+    return html.replace(
+        '        /* Make sure Font Awesome loads properly */',
+        f'{MOBILE_FIX_CSS}\n        /* Make sure Font Awesome loads properly */'
+    )
+
 def fix_location(slug):
     """Fix process icons mobile overlap"""
     
@@ -69,21 +85,11 @@ def fix_location(slug):
     # Look for the @media (max-width: 768px) section with process-icon
     
     # Find where to insert - right before the closing </style> before </head>
-    if '</style>\n\n    </style>' in html:
-        # Insert before the second </style>
-        html = html.replace(
-            '</style>\n\n    </style>',
-            f'{MOBILE_FIX_CSS}\n    </style>\n\n    </style>'
-        )
-    elif '/* Make sure Font Awesome loads properly */' in html:
-        # Insert before Font Awesome section
-        html = html.replace(
-            '        /* Make sure Font Awesome loads properly */',
-            f'{MOBILE_FIX_CSS}\n        /* Make sure Font Awesome loads properly */'
-        )
-    else:
+    fixed = fix_process_icons_html(html)
+    if fixed == html:
         print(f"⚠️  Could not find insertion point in {slug}")
         return
+    html = fixed
     
     print(f"✅ Fixed {slug}")
     
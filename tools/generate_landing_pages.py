@@ -2,13 +2,39 @@ import argparse
 import html
 import json
 import os
+import random
 import re
+import string
+import sys
 import textwrap
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from async_generation import run_async_generation
+from build_manifest import BuildManifest, hash_inputs, write_bytes_if_changed
+from city_localizer import (
+    CITY_TOKEN,
+    apply_local_flavor,
+    city_profile,
+    is_localizable,
+    localize_content,
+    template_group,
+)
+from content_schema import sections_rules, sections_skeleton, validate_content, validate_section
+from content_store import ContentStore
+from generation_journal import DONE, FAILED, PENDING, RUNNING, GenerationJournal, load_journal_states
+from hedged_requests import HedgedCaller
+from response_cache import ResponseCache
+from site_facts import default_facts_path, load_facts
 from update_sitemap import integrate_with_generator
+from work_queue import WorkQueue, default_worker_id
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # ---------------------------------------------------------------------------
 # LLM helpers
@@ -92,17 +118,161 @@ CONTENT_PROMPT_TEMPLATE = textwrap.dedent(
 )
 
 
+# Requirements and per-page JSON structure, reused by the multi-group batch prompt.
+CONTENT_REQUIREMENTS = (
+    CONTENT_PROMPT_TEMPLATE[CONTENT_PROMPT_TEMPLATE.index("Requirements:"):]
+    .format()
+    .replace("Return valid JSON with this structure:", "Each page object uses this structure:")
+)
+
+BATCH_GROUP_TEMPLATE = textwrap.dedent(
+    """
+    Page "{slug}":
+      Group name: {group_name}
+      Description: {description}
+      Primary keyword: {primary_keyword}
+      Supporting keywords (sample):
+    {keywords_bullets}
+    """
+)
+
+BATCH_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    We are launching programmatic landing pages for Grime To Dime, a junk removal company serving Howard County, Maryland.
+
+    Please write conversion-focused copy for {count} separate landing pages. Each page targets its own service theme:
+
+    {group_blocks}
+
+    Write every page independently; do not reuse sentences between pages.
+
+    Return one JSON object of the form {{"pages": {{"<page slug>": <page object>}}}} with exactly one entry per page slug listed above.
+    Each page object must follow the requirements and structure below.
+
+    {requirements}
+    """
+)
+
+SECTION_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    We already have most of the copy for a Grime To Dime landing page (junk removal, Howard County, Maryland).
+
+    Group name: {group_name}
+    Primary keyword: {primary_keyword}
+    Page heading: {heading}
+
+    Only these sections need to be rewritten; they were missing or broke the rules:
+    {problem_bullets}
+
+    Keep the same confident, friendly tone and action-focused button labels (never phone numbers).
+    {rules_bullets}
+
+    Return valid JSON containing only these keys:
+    {skeleton}
+    """
+)
+
+
+LOCALIZE_NOTE = textwrap.dedent(
+    """
+    This copy is a template shared by many city pages. Write the literal token {token} wherever the city name belongs
+    (for example "{token} Junk Removal" or "serving {token} and nearby"), and do not name any other specific city.
+    """
+)
+
+FLAVOR_PROMPT_TEMPLATE = textwrap.dedent(
+    """
+    Write a short "local flavor" paragraph for a Grime To Dime {service} landing page in {city}, Maryland.
+
+    - 2 sentences, 120-220 characters, confident and friendly.
+    - You may mention: {places}.
+    - No phone numbers, prices or guarantees.
+
+    Return valid JSON of the form {{"local_flavor": ""}}.
+    """
+)
+
+DEFAULT_API_BASE = "https://api.x.ai/v1"
+
+
 class GrokError(Exception):
     """Custom exception for Grok related errors."""
 
 
-def call_grok(messages: List[Dict[str, str]], model: str, timeout: int = 60) -> Dict:
-    api_key = os.getenv("XAI_API_KEY")
-    if not api_key:
-        raise GrokError("Environment variable XAI_API_KEY is not set.")
+class GrokRateLimitError(GrokError):
+    """Raised when Grok answers with HTTP 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, headers: Optional[Mapping[str, str]] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.headers = dict(headers or {})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RequestStats:
+    """Thread-safe counters for HTTP attempts, retries and failure kinds."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def add(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+    def summary(self) -> str:
+        with self._lock:
+            counts = dict(self.counts)
+        keys = ["attempts", "retries", "timeouts", "connection_errors", "server_errors", "rate_limited"]
+        return ", ".join(f"{counts.get(key, 0)} {key.replace('_', ' ')}" for key in keys)
+
+
+REQUEST_STATS = RequestStats()
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 32) -> requests.Session:
+    """Shared keep-alive session so every page reuses pooled TLS connections."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None, base: float = 1.0, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
 
-    url = "https://api.x.ai/v1/chat/completions"
-    payload = {
+
+class GrokResponse(NamedTuple):
+    content: Dict
+    headers: Mapping[str, str]
+    usage: Dict[str, int]
+    cached: bool = False
+    repaired: Tuple[str, ...] = ()
+
+
+def build_grok_payload(messages: List[Dict[str, str]], model: str) -> Dict:
+    return {
         "model": model,
         "temperature": 0.2,
         "stream": False,
@@ -110,27 +280,126 @@ def call_grok(messages: List[Dict[str, str]], model: str, timeout: int = 60) ->
         "response_format": {"type": "json_object"},
     }
 
-    try:
-        response = requests.post(
-            url,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}",
-            },
-            data=json.dumps(payload),
-            timeout=timeout,
-        )
-        response.raise_for_status()
-    except requests.RequestException as exc:
-        raise GrokError(f"Failed to contact Grok API: {exc}") from exc
+
+def request_grok(
+    messages: List[Dict[str, str]],
+    model: str,
+    timeout: int = 60,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    api_base: str = DEFAULT_API_BASE,
+    max_retries: int = 4,
+    retry_rate_limits: bool = True,
+    cancel: Optional[threading.Event] = None,
+) -> GrokResponse:
+    """Call Grok and return the parsed JSON content with the response headers and token usage.
+
+    With a cache, identical requests are answered from disk (with empty headers and usage);
+    refresh skips the lookup but still stores the fresh response. Timeouts, connection
+    errors, 5xx and (unless retry_rate_limits is False) 429 responses are retried up to
+    max_retries times with jittered exponential backoff that honours Retry-After.
+    Setting cancel (used by hedged requests) stops the call at its next retry checkpoint.
+    """
+    payload = build_grok_payload(messages, model)
+    if cache is not None and not refresh:
+        cached = cache.get(payload)
+        if cached is not None:
+            return GrokResponse(cached, {}, {}, cached=True)
+
+    api_key = os.getenv("XAI_API_KEY")
+    if not api_key:
+        raise GrokError("Environment variable XAI_API_KEY is not set.")
+
+    url = f"{api_base.rstrip('/')}/chat/completions"
+    body = json.dumps(payload)
+    session = get_session()
+
+    last_error: Optional[GrokError] = None
+    retry_after: Optional[float] = None
+    for attempt in range(max_retries + 1):
+        if attempt:
+            REQUEST_STATS.add("retries")
+            if cancel is not None:
+                cancel.wait(backoff_delay(attempt, retry_after))
+            else:
+                time.sleep(backoff_delay(attempt, retry_after))
+        if cancel is not None and cancel.is_set():
+            raise GrokError("Grok request cancelled")
+        REQUEST_STATS.add("attempts")
+        retry_after = None
+
+        try:
+            response = session.post(
+                url,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {api_key}",
+                },
+                data=body,
+                timeout=timeout,
+            )
+        except requests.Timeout as exc:
+            REQUEST_STATS.add("timeouts")
+            last_error = GrokError(f"Grok API timed out after {timeout}s: {exc}")
+            continue
+        except requests.ConnectionError as exc:
+            REQUEST_STATS.add("connection_errors")
+            last_error = GrokError(f"Failed to contact Grok API: {exc}")
+            continue
+        except requests.RequestException as exc:
+            raise GrokError(f"Failed to contact Grok API: {exc}") from exc
+
+        if response.status_code == 429:
+            REQUEST_STATS.add("rate_limited")
+            last_error = GrokRateLimitError(
+                "Grok API rate limit exceeded (HTTP 429)",
+                retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                headers=response.headers,
+            )
+            if not retry_rate_limits:
+                raise last_error
+            retry_after = last_error.retry_after
+            continue
+        if response.status_code >= 500:
+            REQUEST_STATS.add("server_errors")
+            last_error = GrokError(f"Grok API returned HTTP {response.status_code}: {response.text[:200]}")
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            continue
+
+        try:
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise GrokError(f"Failed to contact Grok API: {exc}") from exc
+        break
+    else:
+        if isinstance(last_error, GrokRateLimitError):
+            raise last_error
+        raise GrokError(f"Giving up after {max_retries + 1} attempts: {last_error}")
 
     try:
         data = response.json()
-        content = data["choices"][0]["message"]["content"].strip()
-        return json.loads(content)
+        content = json.loads(data["choices"][0]["message"]["content"].strip())
     except (KeyError, json.JSONDecodeError) as exc:
         raise GrokError(f"Unexpected Grok response format: {exc}\nRaw: {response.text[:500]}") from exc
 
+    if cache is not None:
+        cache.put(payload, content)
+    return GrokResponse(content, response.headers, data.get("usage") or {})
+
+
+def call_grok(
+    messages: List[Dict[str, str]],
+    model: str,
+    timeout: int = 60,
+    cache: Optional[ResponseCache] = None,
+    refresh: bool = False,
+    api_base: str = DEFAULT_API_BASE,
+    max_retries: int = 4,
+) -> Dict:
+    return request_grok(
+        messages, model=model, timeout=timeout, cache=cache, refresh=refresh, api_base=api_base, max_retries=max_retries
+    ).content
+
 
 # ---------------------------------------------------------------------------
 # Rendering helpers
@@ -140,7 +409,7 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 <html lang=\"en\">
 <head>
     <script async src=\"https://www.googletagmanager.com/gtag/js?id=G-KGQDKQFZNF\"></script>
-    <script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments);}}gtag('js',new Date());gtag('config','G-KGQDKQFZNF');gtag('config','AW-11553122519');gtag('config','AW-11553122519/JftTCI3O64QbENfR-oQr',{{'phone_conversion_css_class':'gfn','phone_conversion_number':'(410) 300-6743'}});</script>
+    <script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments);}}gtag('js',new Date());gtag('config','G-KGQDKQFZNF');gtag('config','AW-11553122519');gtag('config','AW-11553122519/JftTCI3O64QbENfR-oQr',{{'phone_conversion_css_class':'gfn','phone_conversion_number':'{phone_display}'}});</script>
     <meta charset=\"UTF-8\"><meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">
     <meta name=\"description\" content=\"{meta_description}\">
     <title>{page_title}</title>
@@ -174,18 +443,18 @@ HTML_TEMPLATE = """<!DOCTYPE html>
 
 </head>
 <body>
-    <header><div class=\"header-container\"><a href=\"/\" class=\"logo\"><img src=\"/images/optimized/Faviconmaster-optimized.webp\" alt=\"Grime To Dime logo\"><span>Grime To Dime</span></a><a href=\"tel:+14103006743\" class=\"phone-number gfn\"><i class=\"fas fa-phone\"></i> (410) 300-6743</a></div></header>
+    <header><div class=\"header-container\"><a href=\"/\" class=\"logo\"><img src=\"/images/optimized/Faviconmaster-optimized.webp\" alt=\"Grime To Dime logo\"><span>Grime To Dime</span></a><a href=\"tel:{phone_e164}\" class=\"phone-number gfn\"><i class=\"fas fa-phone\"></i> {phone_display}</a></div></header>
     <section class=\"hero\"><div class=\"hero-inner\">
         <div class=\"hero-content\">
             <h1>{hero_heading}</h1>
             <p class=\"sub\">{hero_subheading}</p>
-            <div class=\"google-rating-badge\" aria-label=\"5.0 based on 16 reviews\"><span class=\"google-icon\"><i class=\"fab fa-google\"></i></span><span class=\"rating-score\">5.0</span><span class=\"stars\">★★★★★</span><span class=\"badge-text\">16 reviews</span></div>
+            <div class=\"google-rating-badge\" aria-label=\"{rating} based on {review_count} reviews\"><span class=\"google-icon\"><i class=\"fab fa-google\"></i></span><span class=\"rating-score\">{rating}</span><span class=\"stars\">★★★★★</span><span class=\"badge-text\">{review_count} reviews</span></div>
             <ul class=\"hero-bullets\">{hero_bullets}</ul>
-            <a href=\"tel:+14103006743\" class=\"cta-button gfn\">{cta_button_label}</a>
+            <a href=\"tel:{phone_e164}\" class=\"cta-button gfn\">{cta_button_label}</a>
         </div>
         <div class=\"card quote-card\">
             <h2>{quote_heading}</h2>
-            <form id=\"quoteForm\" class=\"form\" action=\"https://formspree.io/f/meoovajl\" method=\"POST\" onsubmit=\"return handleFormSubmit(event)\">
+            <form id=\"quoteForm\" class=\"form\" action=\"https://formspree.io/f/{form_id}\" method=\"POST\" onsubmit=\"return handleFormSubmit(event)\">
                 <input type=\"hidden\" name=\"_subject\" value=\"{form_subject}\">
                 <input type=\"hidden\" name=\"_next\" value=\"https://grimetodime.com/thank-you.html\">
                 <input type=\"text\" name=\"_gotcha\" style=\"display:none\" aria-hidden=\"true\" tabindex=\"-1\">
@@ -200,39 +469,60 @@ HTML_TEMPLATE = """<!DOCTYPE html>
     </div></section>
     <section class=\"section\"><div class=\"container\"><h2>What We Take</h2><div class=\"grid-3\">{what_we_take}</div></div></section>
     <section class=\"section\" style=\"background:#fff;\"><div class=\"container\"><h2>How It Works</h2><div class=\"grid-3\">{how_it_works}</div></div></section>
-    <section class=\"section\" style=\"background:#f8f9fa;\"><div class=\"container\"><h2>Pricing & Availability</h2><div class=\"grid-2\">{pricing}</div><p style=\"text-align:center;margin-top:1rem\"><a class=\"cta-button gfn\" href=\"tel:+14103006743\">{pricing_cta}</a></p></div></section>
+    <section class=\"section\" style=\"background:#f8f9fa;\"><div class=\"container\"><h2>Pricing & Availability</h2><div class=\"grid-2\">{pricing}</div><p style=\"text-align:center;margin-top:1rem\"><a class=\"cta-button gfn\" href=\"tel:{phone_e164}\">{pricing_cta}</a></p></div></section>
     <section class=\"section\"><div class=\"container\"><h2>Service Areas</h2><p style=\"text-align:center;margin-bottom:1rem;color:#555\">Howard County and nearby — including:</p><div style=\"display:flex;flex-wrap:wrap;gap:.6rem;justify-content:center\">{service_areas}</div></div></section>
-    <section class=\"section\" id=\"faq\" style=\"background:#fff;\"><div class=\"container\"><h2>{faq_heading}</h2><div class=\"grid-2\">{faq}</div><p style=\"text-align:center;margin-top:1rem\"><a class=\"cta-button gfn\" href=\"tel:+14103006743\">{faq_cta}</a></p></div></section>
-    <footer style=\"background:#111;color:#ddd;margin-top:2rem;\"><div style=\"max-width:1200px;margin:0 auto;padding:2rem 1rem;display:flex;gap:2rem;flex-wrap:wrap;justify-content:space-between;\"><div style=\"min-width:260px;flex:1;\"><h4 style=\"color:#fff;margin-bottom:.75rem;\">Grime To Dime</h4><p style=\"color:#ccc;line-height:1.6;\">Fast, friendly junk removal across Howard County. Same-day available. Licensed & insured. Upfront pricing.</p><p style=\"margin-top:.75rem;color:#bbb;\"><a class=\"gfn\" href=\"tel:+14103006743\" style=\"color:#fff;text-decoration:none;\">(410) 300-6743</a>&nbsp;·&nbsp;<a href=\"/quote/\" style=\"color:#ff6666;\">Get a free quote</a></p></div><div style=\"display:flex;gap:2rem;flex-wrap:wrap;flex:1;justify-content:flex-end;min-width:260px;\"><div><h4 style=\"color:#fff;margin-bottom:.75rem;\">Links</h4><ul style=\"list-style:none;padding:0;margin:0;line-height:1.9;\"><li><a href=\"/\" style=\"color:#ccc;text-decoration:none;\">Home</a></li><li><a href=\"/quote/\" style=\"color:#ccc;text-decoration:none;\">Quote</a></li><li><a href=\"/privacy-policy.html\" style=\"color:#ccc;text-decoration:none;\">Privacy</a></li></ul></div></div></div><div style=\"border-top:1px solid rgba(255,255,255,.1);padding:1rem;text-align:center;color:#888;\"><p style=\"margin:0;\">&copy; 2025 Grime To Dime. All rights reserved.</p></div></footer>
-    <script type=\"application/ld+json\">{{\"@context\":\"https://schema.org\",\"@type\":\"Service\",\"name\":{json_service_name},\"serviceType\":{json_service_type},\"areaServed\":{json_area_served},\"provider\":{{\"@type\":\"LocalBusiness\",\"name\":\"Grime To Dime\",\"telephone\":\"+14103006743\",\"url\":\"https://grimetodime.com/\",\"image\":\"https://grimetodime.com/images/MASTERPARENT.png\"}}}}</script>
+    <section class=\"section\" id=\"faq\" style=\"background:#fff;\"><div class=\"container\"><h2>{faq_heading}</h2><div class=\"grid-2\">{faq}</div><p style=\"text-align:center;margin-top:1rem\"><a class=\"cta-button gfn\" href=\"tel:{phone_e164}\">{faq_cta}</a></p></div></section>
+    <footer style=\"background:#111;color:#ddd;margin-top:2rem;\"><div style=\"max-width:1200px;margin:0 auto;padding:2rem 1rem;display:flex;gap:2rem;flex-wrap:wrap;justify-content:space-between;\"><div style=\"min-width:260px;flex:1;\"><h4 style=\"color:#fff;margin-bottom:.75rem;\">Grime To Dime</h4><p style=\"color:#ccc;line-height:1.6;\">Fast, friendly junk removal across Howard County. Same-day available. Licensed & insured. Upfront pricing.</p><p style=\"margin-top:.75rem;color:#bbb;\"><a class=\"gfn\" href=\"tel:{phone_e164}\" style=\"color:#fff;text-decoration:none;\">{phone_display}</a>&nbsp;·&nbsp;<a href=\"/quote/\" style=\"color:#ff6666;\">Get a free quote</a></p></div><div style=\"display:flex;gap:2rem;flex-wrap:wrap;flex:1;justify-content:flex-end;min-width:260px;\"><div><h4 style=\"color:#fff;margin-bottom:.75rem;\">Links</h4><ul style=\"list-style:none;padding:0;margin:0;line-height:1.9;\"><li><a href=\"/\" style=\"color:#ccc;text-decoration:none;\">Home</a></li><li><a href=\"/quote/\" style=\"color:#ccc;text-decoration:none;\">Quote</a></li><li><a href=\"/privacy-policy.html\" style=\"color:#ccc;text-decoration:none;\">Privacy</a></li></ul></div></div></div><div style=\"border-top:1px solid rgba(255,255,255,.1);padding:1rem;text-align:center;color:#888;\"><p style=\"margin:0;\">&copy; 2025 Grime To Dime. All rights reserved.</p></div></footer>
+    <script type=\"application/ld+json\">{{\"@context\":\"https://schema.org\",\"@type\":\"Service\",\"name\":{json_service_name},\"serviceType\":{json_service_type},\"areaServed\":{json_area_served},\"provider\":{{\"@type\":\"LocalBusiness\",\"name\":\"Grime To Dime\",\"telephone\":\"{phone_e164}\",\"url\":\"https://grimetodime.com/\",\"image\":\"https://grimetodime.com/images/MASTERPARENT.png\"}}}}</script>
     <script type=\"application/ld+json\">{{\"@context\":\"https://schema.org\",\"@type\":\"FAQPage\",\"mainEntity\":{json_faq}}}</script>
 </body>
 </html>
 """
 
 
-FORM_SCRIPT = """
+# The quote form script is identical on every page apart from the GA event label,
+# so it is stored as the text before and after that label.
+FORM_SCRIPT_HEAD = """
     <script>
         function getQueryParam(n){var p=new URLSearchParams(window.location.search);var v=p.get(n);return v&&v.trim()?v.trim():''}
         function setCookie(n,v,a){if(!n)return;var parts=[n+'='+encodeURIComponent(v||'')];parts.push('path=/');if(a)parts.push('max-age='+a);parts.push('samesite=Lax');if(location.protocol==='https:')parts.push('secure');document.cookie=parts.join('; ')}
-        function getCookie(n){var m=document.cookie.match(new RegExp('(?:^|; )'+n.replace(/([.$?*|{{}}()\[\]\/\+^])/g,'\\$1')+'=([^;]*)'));return m?decodeURIComponent(m[1]):''}
+        function getCookie(n){var m=document.cookie.match(new RegExp('(?:^|; )'+n.replace(/([.$?*|{}()\\[\\]\\\\\\+^])/g,'\\\\$1')+'=([^;]*)'));return m?decodeURIComponent(m[1]):''}
         function storeGclidFromUrl(){var g=getQueryParam('gclid');if(!g)return;try{localStorage.setItem('gclid',g);}catch(e){} setCookie('gclid',g,60*60*24*90)}
         function getStoredGclid(){try{var ls=localStorage.getItem('gclid');if(ls)return ls;}catch(e){} return getCookie('gclid')||''}
         function ensureGclidInput(f){if(!f)return;var el=f.querySelector('input[name="gclid"]');if(!el){el=document.createElement('input');el.type='hidden';el.name='gclid';f.appendChild(el)}var v=getStoredGclid();if(v)el.value=v}
         document.addEventListener('DOMContentLoaded',function(){try{storeGclidFromUrl();}catch(e){} var f=document.getElementById('quoteForm'); if(f) try{ensureGclidInput(f);}catch(e){}});
-        function handleFormSubmit(ev){ev.preventDefault();var name=document.getElementById('name').value;var phone=document.getElementById('phone').value;var email=document.getElementById('email').value; if(!name||!phone){alert('Please provide your name and phone.');return false} var er=/^[^\s@]+@[^\s@]+\.[^\s@]+$/; if(email && !er.test(email)){alert('Please enter a valid email.');return false} var pr=/(\+?1[-. ]?)?\(?([0-9]{{3}})\)?[-. ]?([0-9]{{3}})[-. ]?([0-9]{{4}})$/; if(!pr.test(phone)){alert('Please enter a valid phone.');return false}
-            var form=document.getElementById('quoteForm'); try{ensureGclidInput(form);}catch(e){} var btn=document.querySelector('.submit-button'); var t=btn.innerHTML; btn.innerHTML='<i class="fas fa-spinner fa-spin"></i> Processing...'; btn.disabled=true; var fd=new FormData(form); fetch(form.action,{method:'POST',body:fd,headers:{'Accept':'application/json'}}).then(function(r){ if(r.ok){ if(typeof gtag!=='undefined'){ gtag('event','generate_lead'); gtag('event','form_submission',{ 'event_category':'Quote','event_label':'{form_event_label}' }); gtag('event','conversion',{ 'send_to':'AW-11553122519/0KjoCPG_6oQbENfR-oQr','value':1.0,'transaction_id':'lead_'+Date.now().toString() }); } window.location.href=form.getAttribute('_next')||'/thank-you.html'; } else { throw new Error('Network response was not ok'); }}).catch(function(e){ console.error('Error:',e); btn.innerHTML=t; btn.disabled=false; alert('There was a problem submitting your form. Please try again.');}); return false; }
+        function handleFormSubmit(ev){ev.preventDefault();var name=document.getElementById('name').value;var phone=document.getElementById('phone').value;var email=document.getElementById('email').value; if(!name||!phone){alert('Please provide your name and phone.');return false} var er=/^[^\\s@]+@[^\\s@]+\\.[^\\s@]+$/; if(email && !er.test(email)){alert('Please enter a valid email.');return false} var pr=/(\\+?1[-. ]?)?\\(?([0-9]{3})\\)?[-. ]?([0-9]{3})[-. ]?([0-9]{4})$/; if(!pr.test(phone)){alert('Please enter a valid phone.');return false}
+            var form=document.getElementById('quoteForm'); try{ensureGclidInput(form);}catch(e){} var btn=document.querySelector('.submit-button'); var t=btn.innerHTML; btn.innerHTML='<i class="fas fa-spinner fa-spin"></i> Processing...'; btn.disabled=true; var fd=new FormData(form); fetch(form.action,{method:'POST',body:fd,headers:{'Accept':'application/json'}}).then(function(r){ if(r.ok){ if(typeof gtag!=='undefined'){ gtag('event','generate_lead'); gtag('event','form_submission',{ 'event_category':'Quote','event_label':'"""
+
+FORM_SCRIPT_TAIL = """' }); gtag('event','conversion',{ 'send_to':'AW-11553122519/0KjoCPG_6oQbENfR-oQr','value':1.0,'transaction_id':'lead_'+Date.now().toString() }); } window.location.href=form.getAttribute('_next')||'/thank-you.html'; } else { throw new Error('Network response was not ok'); }}).catch(function(e){ console.error('Error:',e); btn.innerHTML=t; btn.disabled=false; alert('There was a problem submitting your form. Please try again.');}); return false; }
     </script>
-"""
+    """
 
+# Same order as the chip rows on the live pages and areaServed in their JSON-LD.
 SERVICE_AREAS = [
-    ("Ellicott City", "/locations/ellicott-city-md/"),
+    ("Annapolis Junction", "/locations/annapolis-junction-md/"),
+    ("Catonsville", "/locations/catonsville-md/"),
+    ("Clarksville", "/locations/clarksville-md/"),
     ("Columbia", "/locations/columbia-md/"),
+    ("Cooksville", "/locations/cooksville-md/"),
+    ("Daniels", "/locations/daniels-md/"),
+    ("Dayton", "/locations/dayton-md/"),
+    ("Dorsey", "/locations/dorsey-md/"),
     ("Elkridge", "/locations/elkridge-md/"),
-    ("Clarksville", "/locations/clarksville-md/"),
+    ("Ellicott City", "/locations/ellicott-city-md/"),
+    ("Fulton", "/locations/fulton-md/"),
+    ("Glenelg", "/locations/glenelg-md/"),
+    ("Glenwood", "/locations/glenwood-md/"),
+    ("Hanover", "/locations/hanover-md/"),
+    ("Highland", "/locations/highland-md/"),
+    ("Ilchester", "/locations/ilchester-md/"),
+    ("Jessup", "/locations/jessup-md/"),
     ("Laurel", "/locations/laurel-md/"),
+    ("Lisbon", "/locations/lisbon-md/"),
+    ("Marriottsville", "/locations/marriottsville-md/"),
     ("Savage", "/locations/savage-md/"),
-    ("Catonsville", "/locations/catonsville-md/"),
+    ("Scaggsville", "/locations/scaggsville-md/"),
+    ("West Friendship", "/locations/west-friendship-md/"),
 ]
 
 
@@ -328,6 +618,169 @@ def build_prompt_for_group(group: Dict) -> List[Dict[str, str]]:
     ]
 
 
+def build_batch_prompt(entries: List[Tuple[str, Dict]]) -> List[Dict[str, str]]:
+    """One request for several (slug, group) pairs, sharing the instructions and schema."""
+    blocks = []
+    for slug, group in entries:
+        keywords_bullets = "\n".join(f"  - {kw}" for kw in group.get("keywords", [])[:20])
+        blocks.append(
+            BATCH_GROUP_TEMPLATE.strip("\n").format(
+                slug=slug,
+                group_name=group.get("name", ""),
+                description=group.get("description", ""),
+                primary_keyword=group.get("primary_keyword", ""),
+                keywords_bullets=keywords_bullets or "  - (keywords unavailable)",
+            )
+        )
+
+    user_prompt = BATCH_PROMPT_TEMPLATE.format(
+        count=len(entries),
+        group_blocks="\n\n".join(blocks),
+        requirements=CONTENT_REQUIREMENTS,
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def build_base_prompt(base_group: Dict) -> List[Dict[str, str]]:
+    """Single-group prompt for a [CITY]-templated service, shared by all of its city pages."""
+    messages = build_prompt_for_group(base_group)
+    messages[1]["content"] += LOCALIZE_NOTE.format(token=CITY_TOKEN)
+    return messages
+
+
+def build_flavor_prompt(group: Dict) -> List[Dict[str, str]]:
+    profile = city_profile(group["location"])
+    user_prompt = FLAVOR_PROMPT_TEMPLATE.format(
+        service=group["service_type"],
+        city=profile.name,
+        places=", ".join(profile.landmarks + profile.nearby) or "Howard County",
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def split_batch_content(content: Dict) -> Dict[str, Dict]:
+    """Map slug -> page content from a batch response ({"pages": {...}} or {"pages": [{"slug": ...}]})."""
+    pages = content.get("pages", content)
+    if isinstance(pages, list):
+        return {page.get("slug"): page for page in pages if isinstance(page, dict) and page.get("slug")}
+    if isinstance(pages, dict):
+        return {slug: page for slug, page in pages.items() if isinstance(page, dict)}
+    return {}
+
+
+def content_problems(content: Dict) -> List[str]:
+    """Flat list of schema problems in a page response (empty when the page is valid)."""
+    return [problem for problems in validate_content(content).values() for problem in problems]
+
+
+def build_section_prompt(group: Dict, content: Dict, report: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """Small prompt that re-requests only the sections listed in a validation report."""
+    sections = list(report)
+    rules = sections_rules(sections)
+    hero = content.get("hero") if isinstance(content.get("hero"), dict) else {}
+    user_prompt = SECTION_PROMPT_TEMPLATE.format(
+        group_name=group.get("name", ""),
+        primary_keyword=group.get("primary_keyword", ""),
+        heading=hero.get("heading") or group.get("name", ""),
+        problem_bullets="\n".join(f"- {problem}" for section in sections for problem in report[section]),
+        rules_bullets="\n".join(f"- {rule}" for rule in rules) or "- Fill every field.",
+        skeleton=sections_skeleton(sections),
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def repair_response(group: Dict, response: GrokResponse, ask: Callable[..., GrokResponse], rounds: int) -> GrokResponse:
+    """Re-request only the failing sections of a page and merge the ones that came back better."""
+    content = dict(response.content) if isinstance(response.content, dict) else {}
+    usage = dict(response.usage)
+    repaired: List[str] = list(response.repaired)
+    report = validate_content(content)
+
+    for _ in range(rounds):
+        if not report:
+            break
+        try:
+            patch = ask(build_section_prompt(group, content, report))
+        except GrokError as exc:
+            print(f"  Section repair for '{group.get('name', '')}' failed: {exc}")
+            break
+        for key, value in patch.usage.items():
+            if isinstance(value, int):
+                usage[key] = usage.get(key, 0) + value
+
+        for section in list(report):
+            candidate = patch.content.get(section) if isinstance(patch.content, dict) else None
+            if candidate is not None and len(validate_section(section, candidate)) < len(report[section]):
+                content[section] = candidate
+                repaired.append(section)
+        report = validate_content(content)
+
+    return response._replace(content=content, usage=usage, repaired=tuple(repaired))
+
+
+@lru_cache(maxsize=None)
+def site_fact_fields() -> Dict[str, str]:
+    """Template fields for the facts repeated on every page, read from site_facts.json."""
+    facts = {fact.name: fact for fact in load_facts(default_facts_path(Path(__file__).resolve().parents[1]))}
+    phone = facts["phone"].fields()
+    return {
+        "phone_e164": phone["value"],
+        "phone_display": "({area}) {exchange}-{line}".format(**phone),
+        "rating": facts["rating"].value,
+        "review_count": facts["review_count"].value,
+        "form_id": facts["form_id"].value,
+    }
+
+
+@lru_cache(maxsize=None)
+def compiled_page_template() -> Tuple[Tuple[str, ...], Tuple[Tuple[int, str], ...]]:
+    """Split HTML_TEMPLATE once into literal fragments and (fragment index, field) slots.
+
+    Fields that never change between pages (service areas, areaServed JSON, the
+    site facts) and the form script around its event label are folded into the
+    neighbouring literals, so rendering a page is one join over the fragment list.
+    """
+    static_values = {
+        **{field: html.escape(value) for field, value in site_fact_fields().items()},
+        "service_areas": service_areas_html(),
+        "json_area_served": json.dumps([name for name, _ in SERVICE_AREAS]),
+    }
+
+    tokens: List[Tuple[bool, str]] = []
+    for literal, field, _, _ in string.Formatter().parse(HTML_TEMPLATE):
+        if literal:
+            before, marker, after = literal.partition("__FORM_SCRIPT__")
+            tokens.append((False, before))
+            if marker:
+                tokens.extend([(False, FORM_SCRIPT_HEAD), (True, "form_event_label"), (False, FORM_SCRIPT_TAIL), (False, after)])
+        if field is not None:
+            if field in static_values:
+                tokens.append((False, static_values[field]))
+            else:
+                tokens.append((True, field))
+
+    fragments: List[str] = []
+    slots: List[Tuple[int, str]] = []
+    for is_field, text in tokens:
+        if is_field:
+            slots.append((len(fragments), text))
+            fragments.append("")
+        elif fragments and not (slots and slots[-1][0] == len(fragments) - 1):
+            fragments[-1] += text
+        else:
+            fragments.append(text)
+    return tuple(fragments), tuple(slots)
+
+
 def render_page_html(slug: str, group: Dict, content: Dict) -> str:
     hero = content.get("hero") or {}
     quote_form = content.get("quote_form") or {}
@@ -339,74 +792,567 @@ def render_page_html(slug: str, group: Dict, content: Dict) -> str:
 
     faq_entities = faq_json_ld(faq_items)
 
-    html_output = HTML_TEMPLATE.format(
-        meta_description=html.escape(content.get("meta_description", "")),
-        page_title=html.escape(content.get("page_title", "")),
-        slug=slug,
-        hero_heading=html.escape(hero.get("heading", group.get("name", ""))),
-        hero_subheading=html.escape(hero.get("subheading", group.get("description", ""))),
-        hero_bullets=bullet_list_html(hero.get("bullets", [])[:3]),
-        cta_button_label=html.escape(closing_cta.get("button_label", "Get Free Quote")),
-        quote_heading=html.escape(quote_form.get("heading", "Free Quote")),
-        form_subject=html.escape(quote_form.get("form_subject", f"{group.get('name', 'Service')} Quote Request")),
-        details_label=html.escape(quote_form.get("details_label", "What are we removing?")),
-        details_placeholder=html.escape(quote_form.get("details_placeholder", "Item details, access notes, photos")),
-        submit_label=html.escape(quote_form.get("submit_label", "Get My Quote")),
-        form_note=html.escape(quote_form.get("note", "Prefer text? Send photos to (410) 300-6743.")),
-        what_we_take=feature_cards_html(what_we_take[:3]),
-        how_it_works=feature_cards_html(how_it_works[:3]),
-        pricing=feature_cards_html(pricing[:2]),
-        pricing_cta=html.escape(closing_cta.get("button_label", "Check My Price")),
-        service_areas=service_areas_html(),
-        faq_heading=html.escape(f"{group.get('name', 'Service')} FAQ"),
-        faq=faq_html(faq_items[:4]),
-        faq_cta=html.escape(closing_cta.get("button_label", "Book My Pickup")),
-        json_service_name=json.dumps(content.get("hero", {}).get("heading", group.get("name", ""))),
-        json_service_type=json.dumps(content.get("service_type", group.get("name", ""))),
-        json_area_served=json.dumps([name for name, _ in SERVICE_AREAS]),
-        json_faq=json.dumps(faq_entities),
-    )
-    
-    # Replace the form script placeholder
-    # Simple form script injection without complex formatting
-    simple_form_script = """
-    <script>
-        function getQueryParam(n){var p=new URLSearchParams(window.location.search);var v=p.get(n);return v&&v.trim()?v.trim():''}
-        function setCookie(n,v,a){if(!n)return;var parts=[n+'='+encodeURIComponent(v||'')];parts.push('path=/');if(a)parts.push('max-age='+a);parts.push('samesite=Lax');if(location.protocol==='https:')parts.push('secure');document.cookie=parts.join('; ')}
-        function getCookie(n){var m=document.cookie.match(new RegExp('(?:^|; )'+n.replace(/([.$?*|{}()\\[\\]\\\\\\+^])/g,'\\\\$1')+'=([^;]*)'));return m?decodeURIComponent(m[1]):''}
-        function storeGclidFromUrl(){var g=getQueryParam('gclid');if(!g)return;try{localStorage.setItem('gclid',g);}catch(e){} setCookie('gclid',g,60*60*24*90)}
-        function getStoredGclid(){try{var ls=localStorage.getItem('gclid');if(ls)return ls;}catch(e){} return getCookie('gclid')||''}
-        function ensureGclidInput(f){if(!f)return;var el=f.querySelector('input[name="gclid"]');if(!el){el=document.createElement('input');el.type='hidden';el.name='gclid';f.appendChild(el)}var v=getStoredGclid();if(v)el.value=v}
-        document.addEventListener('DOMContentLoaded',function(){try{storeGclidFromUrl();}catch(e){} var f=document.getElementById('quoteForm'); if(f) try{ensureGclidInput(f);}catch(e){}});
-        function handleFormSubmit(ev){ev.preventDefault();var name=document.getElementById('name').value;var phone=document.getElementById('phone').value;var email=document.getElementById('email').value; if(!name||!phone){alert('Please provide your name and phone.');return false} var er=/^[^\\s@]+@[^\\s@]+\\.[^\\s@]+$/; if(email && !er.test(email)){alert('Please enter a valid email.');return false} var pr=/(\\+?1[-. ]?)?\\(?([0-9]{3})\\)?[-. ]?([0-9]{3})[-. ]?([0-9]{4})$/; if(!pr.test(phone)){alert('Please enter a valid phone.');return false}
-            var form=document.getElementById('quoteForm'); try{ensureGclidInput(form);}catch(e){} var btn=document.querySelector('.submit-button'); var t=btn.innerHTML; btn.innerHTML='<i class="fas fa-spinner fa-spin"></i> Processing...'; btn.disabled=true; var fd=new FormData(form); fetch(form.action,{method:'POST',body:fd,headers:{'Accept':'application/json'}}).then(function(r){ if(r.ok){ if(typeof gtag!=='undefined'){ gtag('event','generate_lead'); gtag('event','form_submission',{ 'event_category':'Quote','event_label':'""" + html.escape(group.get("name", "Landing Page")) + """' }); gtag('event','conversion',{ 'send_to':'AW-11553122519/0KjoCPG_6oQbENfR-oQr','value':1.0,'transaction_id':'lead_'+Date.now().toString() }); } window.location.href=form.getAttribute('_next')||'/thank-you.html'; } else { throw new Error('Network response was not ok'); }}).catch(function(e){ console.error('Error:',e); btn.innerHTML=t; btn.disabled=false; alert('There was a problem submitting your form. Please try again.');}); return false; }
-    </script>
-    """
-    
-    return html_output.replace("__FORM_SCRIPT__", simple_form_script)
+    values = {
+        "meta_description": html.escape(content.get("meta_description", "")),
+        "page_title": html.escape(content.get("page_title", "")),
+        "slug": slug,
+        "hero_heading": html.escape(hero.get("heading", group.get("name", ""))),
+        "hero_subheading": html.escape(hero.get("subheading", group.get("description", ""))),
+        "hero_bullets": bullet_list_html(hero.get("bullets", [])[:3]),
+        "cta_button_label": html.escape(closing_cta.get("button_label", "Get Free Quote")),
+        "quote_heading": html.escape(quote_form.get("heading", "Free Quote")),
+        "form_subject": html.escape(quote_form.get("form_subject", f"{group.get('name', 'Service')} Quote Request")),
+        "details_label": html.escape(quote_form.get("details_label", "What are we removing?")),
+        "details_placeholder": html.escape(quote_form.get("details_placeholder", "Item details, access notes, photos")),
+        "submit_label": html.escape(quote_form.get("submit_label", "Get My Quote")),
+        "form_note": html.escape(quote_form.get("note", f"Prefer text? Send photos to {site_fact_fields()['phone_display']}.")),
+        "what_we_take": feature_cards_html(what_we_take[:3]),
+        "how_it_works": feature_cards_html(how_it_works[:3]),
+        "pricing": feature_cards_html(pricing[:2]),
+        "pricing_cta": html.escape(closing_cta.get("button_label", "Check My Price")),
+        "faq_heading": html.escape(f"{group.get('name', 'Service')} FAQ"),
+        "faq": faq_html(faq_items[:4]),
+        "faq_cta": html.escape(closing_cta.get("button_label", "Book My Pickup")),
+        "json_service_name": json.dumps(hero.get("heading", group.get("name", ""))),
+        "json_service_type": json.dumps(content.get("service_type", group.get("name", ""))),
+        "json_faq": json.dumps(faq_entities),
+        "form_event_label": html.escape(group.get("name", "Landing Page")),
+    }
+
+    fragments, slots = compiled_page_template()
+    parts = list(fragments)
+    for index, field in slots:
+        parts[index] = values[field]
+    return "".join(parts)
 
 
 def ensure_output_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+@lru_cache(maxsize=None)
+def template_version() -> str:
+    """Fingerprint of the compiled template, form script, static service areas and site facts."""
+    fragments, slots = compiled_page_template()
+    return hash_inputs(fragments, slots)[:16]
+
+
+def page_input_hash(group: Dict, messages: List[Dict[str, str]], model: str) -> str:
+    return hash_inputs(group, messages, model, template_version())
+
+
+def group_input_hash(group: Dict, model: str, localize: bool = False, local_flavor: bool = False) -> str:
+    """Manifest input hash for a group as generated with the given options."""
+    input_hash = page_input_hash(group, build_prompt_for_group(group), model)
+    if localize and is_localizable(group):
+        input_hash = hash_inputs(input_hash, build_base_prompt(template_group(group)), local_flavor)
+    return input_hash
+
+
+def latency_summary(latencies: List[float]) -> str:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return (
+        f"p50 {percentile(50):.2f}s, p95 {percentile(95):.2f}s, p99 {percentile(99):.2f}s, "
+        f"max {ordered[-1]:.2f}s over {len(ordered)} pages"
+    )
+
+
+class PageJob(NamedTuple):
+    idx: int
+    name: str
+    slug: str
+    group: Dict
+    output_file: Path
+    messages: List[Dict[str, str]]
+    input_hash: str
+
+
+def write_landing_page(job: PageJob, content: Dict, manifest: BuildManifest) -> bool:
+    """Render and write a page; returns False when the file already had identical bytes."""
+    page_html = render_page_html(job.slug, job.group, content)
+    return manifest.write_if_changed(job.slug, job.input_hash, job.output_file, page_html)
+
+
+def render_chunk(output_dir: str, pages: List[Tuple[str, Dict, Dict]]) -> List[Tuple[str, bool, str, int]]:
+    """Render and write a chunk of stored pages in a worker process; returns (slug, written, hash, size)."""
+    results = []
+    for slug, group, content in pages:
+        data = render_page_html(slug, group, content).encode("utf-8")
+        written, output_hash = write_bytes_if_changed(Path(output_dir) / slug / "index.html", data)
+        results.append((slug, written, output_hash, len(data)))
+    return results
+
+
+def make_job(idx: int, group: Dict, args: argparse.Namespace) -> PageJob:
+    group_name = group.get("name", f"Group {idx}")
+    slug = slugify(group_name)
+    messages = build_prompt_for_group(group)
+    input_hash = group_input_hash(group, args.model, args.localize, args.local_flavor)
+    return PageJob(idx, group_name, slug, group, args.output / slug / "index.html", messages, input_hash)
+
+
+class GenerationRun:
+    """
+    One generation run over a list of page jobs.
+
+    Each mode is a (fetch, on_result, on_error) triple handed to execute(): fetch
+    calls Grok and may run on a worker thread, on_result/on_error record the outcome.
+    In the asyncio mode the callbacks run one at a time on the writer thread of
+    async_generation, so the totals, journal and fallback list need no locking.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        total: int,
+        ask_grok: Callable[..., GrokResponse],
+        journal: GenerationJournal,
+        manifest: BuildManifest,
+        store: ContentStore,
+        queue: Optional[WorkQueue] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.args = args
+        self.total = total
+        self.ask_grok = ask_grok
+        self.journal = journal
+        self.manifest = manifest
+        self.store = store
+        self.queue = queue
+        self.worker_id = worker_id
+        self.latencies: List[float] = []
+        self.totals = {"done": 0, "failed": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached": 0, "rewritten": 0, "repaired": 0}
+        self.started: Dict[str, float] = {}
+        # Jobs a batch or base page could not cover; run_jobs() retries them one at a time.
+        self.fallback: List[PageJob] = []
+
+    def begin(self, job: PageJob) -> None:
+        self.started[job.slug] = time.monotonic()
+        self.journal.record(job.slug, RUNNING, group=job.name)
+
+    def finish(self, job: PageJob, response: GrokResponse) -> None:
+        # In queue mode the page is written while the row is held as done, so a lease that
+        # expires mid-write cannot let a second worker's copy be overwritten.
+        queue = self.queue
+        with queue.completing(job.slug, self.worker_id) if queue is not None else nullcontext(True) as owned:
+            if not owned:
+                self.started.pop(job.slug, None)
+                print(f"Lease on '{job.slug}' was lost to another worker; discarding this copy")
+                return
+            options = {"model": self.args.model, "localize": self.args.localize, "local_flavor": self.args.local_flavor}
+            self.store.put(job.slug, job.group, response.content, options)
+            written = write_landing_page(job, response.content, self.manifest)
+        latency = time.monotonic() - self.started.pop(job.slug, time.monotonic())
+        self.latencies.append(latency)
+        usage = response.usage
+        totals = self.totals
+        totals["done"] += 1
+        totals["rewritten"] += int(written)
+        totals["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        totals["completion_tokens"] += usage.get("completion_tokens", 0)
+        totals["cached"] += int(response.cached)
+        totals["repaired"] += len(response.repaired)
+        self.journal.record(
+            job.slug,
+            DONE,
+            group=job.name,
+            latency=round(latency, 3),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+            cached=response.cached,
+            written=written,
+            repaired=list(response.repaired) or None,
+            problems=content_problems(response.content) or None,
+            output=str(job.output_file),
+        )
+
+    def fail(self, job: PageJob, exc: Exception) -> None:
+        self.totals["failed"] += 1
+        if self.queue is not None:
+            self.queue.fail(job.slug, self.worker_id, f"{type(exc).__name__}: {exc}")
+        self.journal.record(
+            job.slug,
+            FAILED,
+            group=job.name,
+            latency=round(time.monotonic() - self.started.pop(job.slug, time.monotonic()), 3),
+            error=f"{type(exc).__name__}: {exc}",
+        )
+
+    def defer(self, job: PageJob, note: str) -> None:
+        self.fallback.append(job)
+        self.journal.record(job.slug, PENDING, group=job.name, note=note)
+
+    def execute(self, units: List, fetch: Callable, on_result: Callable, on_error: Callable, label: str) -> None:
+        if not units:
+            return
+        args = self.args
+        if args.concurrency > 1:
+            print(f"Generating {label} with up to {args.max_concurrency} concurrent requests …")
+            stats = run_async_generation(
+                units,
+                fetch,
+                on_result,
+                on_error,
+                rate_limit_error=GrokRateLimitError,
+                concurrency=args.concurrency,
+                max_concurrency=args.max_concurrency,
+            )
+            print(
+                f"Async run: {stats['succeeded']} requests succeeded, {stats['failed']} failed, "
+                f"{stats['rate_limited']} rate-limited responses, peak {stats['peak_in_flight']} in flight, "
+                f"final window {stats['final_concurrency']} in {stats['elapsed']:.1f}s"
+            )
+            return
+
+        for unit in units:
+            try:
+                response = fetch(unit)
+            except GrokError as exc:
+                on_error(unit, exc)
+                continue
+            on_result(unit, response)
+
+    # One group per request -------------------------------------------------
+
+    def fetch_page(self, job: PageJob) -> GrokResponse:
+        if self.args.concurrency <= 1:
+            print(f"[{job.idx}/{self.total}] Generating copy for '{job.name}' …")
+        self.begin(job)
+        return repair_response(job.group, self.ask_grok(job.messages), self.ask_grok, self.args.repair_rounds)
+
+    def on_page(self, job: PageJob, response: GrokResponse) -> None:
+        self.finish(job, response)
+        print(f"[{job.idx}/{self.total}] Saved {job.output_file}")
+
+    def on_page_error(self, job: PageJob, exc: Exception) -> None:
+        self.fail(job, exc)
+        print(f"[{job.idx}/{self.total}] Error from Grok for '{job.name}': {exc}")
+
+    # Several groups per request (--batch-size) -----------------------------
+
+    def fetch_batch(self, batch: List[PageJob]) -> GrokResponse:
+        if self.args.concurrency <= 1:
+            print(f"Generating copy for {len(batch)} groups in one request: {', '.join(job.slug for job in batch)} …")
+        for job in batch:
+            self.begin(job)
+        response = self.ask_grok(build_batch_prompt([(job.slug, job.group) for job in batch]))
+
+        # Repair individual sections here, in the worker thread, so on_batch only renders.
+        share = {key: value // len(batch) for key, value in response.usage.items() if isinstance(value, int)}
+        pages = {}
+        for slug, content in split_batch_content(response.content).items():
+            job = next((job for job in batch if job.slug == slug), None)
+            if job is not None:
+                page = GrokResponse(content, response.headers, share, response.cached)
+                pages[slug] = repair_response(job.group, page, self.ask_grok, self.args.repair_rounds)
+        return response._replace(content=pages)
+
+    def on_batch(self, batch: List[PageJob], response: GrokResponse) -> None:
+        for job in batch:
+            page = response.content.get(job.slug)
+            problems = content_problems(page.content) if page is not None else ["missing from batch response"]
+            if problems:
+                self.defer(job, f"batch fallback: {'; '.join(problems)}")
+                continue
+            self.on_page(job, page)
+
+    def on_batch_error(self, batch: List[PageJob], exc: Exception) -> None:
+        print(f"Batch request failed ({exc}); retrying {len(batch)} groups one at a time")
+        for job in batch:
+            self.defer(job, f"batch fallback: {type(exc).__name__}")
+
+    # One base page per service, localized per city (--localize) ------------
+
+    def fetch_service(self, unit: Tuple[Dict, List[PageJob]]) -> GrokResponse:
+        base_group, members = unit
+        if self.args.concurrency <= 1:
+            print(f"Generating base copy for '{base_group['service_type']}' ({len(members)} cities) …")
+        for job in members:
+            self.begin(job)
+        base = repair_response(base_group, self.ask_grok(build_base_prompt(base_group)), self.ask_grok, self.args.repair_rounds)
+
+        share = {key: value // len(members) for key, value in base.usage.items() if isinstance(value, int)}
+        pages = {}
+        for job in members:
+            content = localize_content(base.content, job.group, job.slug)
+            usage = dict(share)
+            if self.args.local_flavor:
+                try:
+                    flavor = self.ask_grok(build_flavor_prompt(job.group))
+                except GrokError as exc:
+                    print(f"  Local flavor for '{job.name}' failed: {exc}")
+                else:
+                    paragraph = flavor.content.get("local_flavor") if isinstance(flavor.content, dict) else None
+                    apply_local_flavor(content, paragraph)
+                    for key, value in flavor.usage.items():
+                        if isinstance(value, int):
+                            usage[key] = usage.get(key, 0) + value
+            pages[job.slug] = GrokResponse(content, base.headers, usage, base.cached, base.repaired)
+        return base._replace(content=pages)
+
+    def on_service(self, unit: Tuple[Dict, List[PageJob]], response: GrokResponse) -> None:
+        self.on_batch(unit[1], response)
+
+    def on_service_error(self, unit: Tuple[Dict, List[PageJob]], exc: Exception) -> None:
+        print(f"Base page for '{unit[0]['service_type']}' failed ({exc}); generating its {len(unit[1])} city pages one at a time")
+        for job in unit[1]:
+            self.defer(job, f"localize fallback: {type(exc).__name__}")
+
+    # Drivers ---------------------------------------------------------------
+
+    def run_jobs(self, run: List[PageJob]) -> None:
+        args = self.args
+        pending = run
+        services: Dict[str, Tuple[Dict, List[PageJob]]] = {}
+        if args.localize:
+            for job in run:
+                if is_localizable(job.group):
+                    services.setdefault(job.group["service_type"], (template_group(job.group), []))[1].append(job)
+        if services:
+            units = list(services.values())
+            localized = {job.slug for _, members in units for job in members}
+            self.execute(units, self.fetch_service, self.on_service, self.on_service_error, f"{len(localized)} city pages from {len(units)} base pages")
+            pending = [job for job in run if job.slug not in localized] + self.fallback
+            if self.fallback:
+                print(f"{len(self.fallback)} city pages failed localization; generating them individually")
+            self.fallback = []
+
+        if args.batch_size > 1:
+            batches = [pending[i : i + args.batch_size] for i in range(0, len(pending), args.batch_size)]
+            self.execute(batches, self.fetch_batch, self.on_batch, self.on_batch_error, f"{len(pending)} pages in {len(batches)} batches")
+            if self.fallback:
+                fallback, self.fallback = self.fallback, []
+                print(f"{len(fallback)} groups failed batch validation; falling back to single-group requests")
+                self.execute(fallback, self.fetch_page, self.on_page, self.on_page_error, f"{len(fallback)} fallback pages")
+        else:
+            self.execute(pending, self.fetch_page, self.on_page, self.on_page_error, f"{len(pending)} pages")
+
+    def run_queue(self) -> None:
+        """Claim groups until the queue is drained, waiting out other workers' live leases."""
+        args, queue = self.args, self.queue
+        heartbeat = queue.start_heartbeat(self.worker_id, interval=args.lease_seconds / 3)
+        try:
+            while True:
+                claimed = queue.claim(self.worker_id, args.claim_size)
+                if not claimed:
+                    if not queue.has_live_leases():
+                        break
+                    time.sleep(min(args.lease_seconds / 4, 5.0))
+                    continue
+                print(f"Claimed {len(claimed)} groups from the queue")
+                self.run_jobs([make_job(payload["idx"], payload["group"], args) for _, payload in claimed])
+        finally:
+            heartbeat.set()
+            released = queue.release(self.worker_id)
+            if released:
+                print(f"Released {released} unfinished leases back to the queue")
+            print(f"Queue: {queue.counts()}")
+
+    def summary(self) -> str:
+        totals = self.totals
+        return (
+            f"Run {self.journal.run_id}: {totals['done']} done ({totals['cached']} from cache, "
+            f"{totals['rewritten']} files rewritten, {totals['repaired']} sections repaired), {totals['failed']} failed, "
+            f"{totals['prompt_tokens']} prompt + {totals['completion_tokens']} completion tokens"
+        )
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
-def main() -> None:
-    project_root = Path(__file__).resolve().parents[1]
-    default_groups = project_root / "keyword_groups_for_landing_pages.json"
-    default_output = project_root / "landing"
-
-    parser = argparse.ArgumentParser(description="Generate landing pages from keyword groups using Grok-4-fast")
+def render_main(argv: List[str], default_output: Path, default_manifest: Path, default_store: Path) -> None:
+    """`render` subcommand: rebuild every stored page with the current template, in parallel."""
+    parser = argparse.ArgumentParser(
+        prog="generate_landing_pages.py render",
+        description="Re-render landing pages from the content store without calling Grok",
+    )
+    parser.add_argument("--store", type=Path, default=default_store, help="Content store written by previous generation runs")
+    parser.add_argument("--output", type=Path, default=default_output, help="Directory to write rendered landing pages")
+    parser.add_argument("--manifest", type=Path, default=default_manifest, help="Build manifest to update with the new output hashes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Rendering processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Pages per worker task")
+    parser.add_argument("--force", action="store_true", help="Also render pages extracted with template drift, discarding their drifted markup")
+    args = parser.parse_args(argv)
+
+    if not args.store.exists():
+        print(f"❌ No content store at {args.store}; run a generation first")
+        return
+
+    started = time.monotonic()
+    stored = list(ContentStore(args.store).pages())
+    drifted = [page.slug for page in stored if page.options.get("drift")]
+    if drifted and args.force:
+        print(f"⚠️  --force: {len(drifted)} drifted pages will lose markup that differs from the template")
+    elif drifted:
+        print(f"⚠️  Skipping {len(drifted)} pages whose live markup differs from the template outside the content slots:")
+        for slug in drifted[:10]:
+            print(f"    {slug}")
+        if len(drifted) > 10:
+            print(f"    … and {len(drifted) - 10} more")
+        print("   Update HTML_TEMPLATE and re-run extract_landing_content.py, or pass --force to overwrite them.")
+        skipped = set(drifted)
+        stored = [page for page in stored if page.slug not in skipped]
+    input_hashes = {
+        page.slug: group_input_hash(
+            page.group,
+            page.options.get("model", ""),
+            page.options.get("localize", False),
+            page.options.get("local_flavor", False),
+        )
+        for page in stored
+    }
+    chunks = [
+        [(page.slug, page.group, page.content) for page in stored[i : i + args.chunk_size]]
+        for i in range(0, len(stored), args.chunk_size)
+    ]
+    print(f"Rendering {len(stored)} stored pages with {args.workers} workers …")
+
+    manifest = BuildManifest(args.manifest)
+    rewritten = 0
+    with ProcessPoolExecutor(max_workers=max(args.workers, 1)) as pool:
+        for results in pool.map(render_chunk, [str(args.output)] * len(chunks), chunks):
+            for slug, written, output_hash, size in results:
+                manifest.record(slug, input_hashes[slug], output_hash, size)
+                rewritten += int(written)
+    manifest.save()
+
+    elapsed = time.monotonic() - started
+    print(f"✅ Rendered {len(stored)} pages in {elapsed:.2f}s ({rewritten} files rewritten, {len(stored) - rewritten} unchanged)")
+
+
+def build_parser(
+    default_groups: Path,
+    default_output: Path,
+    default_cache: Path,
+    default_journal: Path,
+    default_manifest: Path,
+    default_store: Path,
+) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate landing pages from keyword groups using Grok-4-fast",
+        epilog="Run '%(prog)s render --help' to rebuild pages from the content store without calling Grok.",
+    )
     parser.add_argument("--groups", type=Path, default=default_groups, help="Path to grouped keyword JSON")
     parser.add_argument("--output", type=Path, default=default_output, help="Directory to write generated landing pages")
     parser.add_argument("--model", type=str, default="grok-4-fast", help="Model name for Grok")
     parser.add_argument("--limit", type=int, default=None, help="Optional limit on number of groups to render")
     parser.add_argument("--skip-existing", action="store_true", help="Skip groups whose slug directory already exists")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Initial number of Grok requests in flight; values above 1 enable the asyncio mode with AIMD tuning",
+    )
+    parser.add_argument("--max-concurrency", type=int, default=32, help="Upper bound for the adaptive request window")
+    parser.add_argument("--cache-dir", type=Path, default=default_cache, help="Directory for cached Grok responses")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the response cache")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached responses but store the fresh ones")
+    parser.add_argument("--cache-max-entries", type=int, default=5000, help="LRU cap on cached responses")
+    parser.add_argument("--cache-max-mb", type=float, default=200.0, help="Size cap for the response cache in MB")
+    parser.add_argument("--cache-max-age-days", type=float, default=30.0, help="Drop cached responses older than this")
+    parser.add_argument("--journal", type=Path, default=default_journal, help="Append-only JSONL log of per-group generation state")
+    parser.add_argument("--resume", action="store_true", help="Only run groups the journal does not record as done")
+    parser.add_argument("--api-base", type=str, default=DEFAULT_API_BASE, help="Chat-completions API base URL (e.g. a local mock server)")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Pack this many groups into one Grok request; invalid pages fall back to single-group calls",
+    )
+    parser.add_argument(
+        "--repair-rounds",
+        type=int,
+        default=1,
+        help="Re-request only invalid sections this many times before accepting a page (0 disables)",
+    )
+    parser.add_argument("--timeout", type=float, default=60, help="Per-attempt HTTP timeout in seconds")
+    parser.add_argument("--max-retries", type=int, default=4, help="Retries for timeouts, connection errors, 5xx and 429")
+    parser.add_argument("--manifest", type=Path, default=default_manifest, help="Build manifest of per-page input/output hashes")
+    parser.add_argument("--store", type=Path, default=default_store, help="Content store of generated page copy (see the render subcommand)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate pages whose group entry, prompt, model or template changed since the last build",
+    )
+    parser.add_argument(
+        "--localize",
+        action="store_true",
+        help="Generate one base page per service for service x location groups and derive the city pages locally",
+    )
+    parser.add_argument(
+        "--local-flavor",
+        action="store_true",
+        help="With --localize, ask Grok for one short local paragraph per city page",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        default=None,
+        help="Fire a duplicate request once a call runs longer than this latency percentile of recent calls (e.g. 95)",
+    )
+    parser.add_argument("--hedge-budget", type=float, default=0.1, help="Cap on duplicate requests as a fraction of all calls")
+    parser.add_argument("--hedge-min-samples", type=int, default=20, help="Completed calls needed before hedging starts")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=None,
+        help="SQLite work queue shared with other generator workers; each worker claims groups under a lease",
+    )
+    parser.add_argument("--worker-id", type=str, default=None, help="Name of this worker in the queue (default host-pid)")
+    parser.add_argument("--lease-seconds", type=float, default=120.0, help="Queue lease length; renewed by a heartbeat")
+    parser.add_argument("--claim-size", type=int, default=20, help="Groups claimed from the queue at a time")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Queue attempts per group before it is marked failed")
+
+    return parser
+
 
+def select_jobs(groups: List[Dict], args: argparse.Namespace, journal: GenerationJournal, manifest: BuildManifest) -> List[PageJob]:
+    """Jobs for the groups this run has to generate, each recorded as pending in the journal."""
+    previous_states = load_journal_states(args.journal) if args.resume else {}
+    unchanged = 0
+    jobs: List[PageJob] = []
+    for idx, group in enumerate(groups, 1):
+        job = make_job(idx, group, args)
+        group_name, slug, output_file = job.name, job.slug, job.output_file
+
+        if args.skip_existing and output_file.exists():
+            print(f"[{idx}/{len(groups)}] Skipping {group_name} (exists)")
+            continue
+        if args.resume and previous_states.get(slug, {}).get("state") == DONE and output_file.exists():
+            print(f"[{idx}/{len(groups)}] Skipping {group_name} (done in run {previous_states[slug]['run_id']})")
+            continue
+        if args.incremental and manifest.is_current(slug, job.input_hash, output_file):
+            unchanged += 1
+            continue
+
+        journal.record(slug, PENDING, group=group_name)
+        jobs.append(job)
+
+    if args.incremental:
+        print(f"Incremental build: {unchanged} pages unchanged, {len(jobs)} with new inputs")
+    return jobs
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    default_groups = project_root / "keyword_groups_for_landing_pages.json"
+    default_output = project_root / "landing"
+    default_cache = project_root / ".cache" / "grok"
+    default_journal = project_root / ".cache" / "generation_journal.jsonl"
+    default_manifest = project_root / ".cache" / "landing_build_manifest.json"
+    default_store = project_root / ".cache" / "content_store.sqlite"
+
+    if sys.argv[1:2] == ["render"]:
+        render_main(sys.argv[2:], default_output, default_manifest, default_store)
+        return
+
+    parser = build_parser(default_groups, default_output, default_cache, default_journal, default_manifest, default_store)
     args = parser.parse_args()
 
     groups = load_groups(args.groups)
@@ -416,28 +1362,74 @@ def main() -> None:
     print(f"Loaded {len(groups)} keyword groups from {args.groups}")
     ensure_output_directory(args.output)
 
-    for idx, group in enumerate(groups, 1):
-        group_name = group.get("name", f"Group {idx}")
-        slug = slugify(group_name)
-        output_dir = args.output / slug
-        output_file = output_dir / "index.html"
-
-        if args.skip_existing and output_file.exists():
-            print(f"[{idx}/{len(groups)}] Skipping {group_name} (exists)")
-            continue
+    cache = None
+    if not args.no_cache:
+        cache = ResponseCache(
+            args.cache_dir,
+            max_entries=args.cache_max_entries,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            max_age_days=args.cache_max_age_days,
+        )
 
-        print(f"[{idx}/{len(groups)}] Generating copy for '{group_name}' …")
-        messages = build_prompt_for_group(group)
-        try:
-            content = call_grok(messages, model=args.model)
-        except GrokError as exc:
-            print(f"  Error from Grok: {exc}")
-            continue
+    journal = GenerationJournal(args.journal)
+    manifest = BuildManifest(args.manifest)
+    store = ContentStore(args.store)
+    jobs = select_jobs(groups, args, journal, manifest)
+
+    queue = None
+    worker_id = args.worker_id or default_worker_id()
+    if args.queue is not None:
+        queue = WorkQueue(args.queue, lease_seconds=args.lease_seconds, max_attempts=args.max_attempts)
+        added = queue.enqueue((job.slug, {"idx": job.idx, "group": job.group}) for job in jobs)
+        print(f"Queue: {args.queue} ({added} groups added, {queue.counts()}), worker {worker_id}")
+
+    print(f"Journal: {args.journal} (run {journal.run_id}, {len(jobs)} groups queued)")
+    get_session(pool_size=max(args.max_concurrency, 1))
+    ask_grok = partial(
+        request_grok,
+        model=args.model,
+        timeout=args.timeout,
+        cache=cache,
+        refresh=args.refresh,
+        api_base=args.api_base,
+        max_retries=args.max_retries,
+        # The async mode backs off on 429 through its AIMD window instead.
+        retry_rate_limits=args.concurrency <= 1,
+    )
+    hedger = None
+    if args.hedge_percentile is not None:
+        hedger = HedgedCaller(
+            ask_grok,
+            percentile=args.hedge_percentile,
+            budget=args.hedge_budget,
+            min_samples=args.hedge_min_samples,
+            max_workers=2 * max(args.max_concurrency, args.concurrency, 1),
+        )
+        ask_grok = hedger
+    run = GenerationRun(args, len(groups), ask_grok, journal, manifest, store, queue, worker_id)
 
-        ensure_output_directory(output_dir)
-        page_html = render_page_html(slug, group, content)
-        output_file.write_text(page_html, encoding="utf-8")
-        print(f"  Saved {output_file}")
+    try:
+        if queue is not None:
+            run.run_queue()
+        else:
+            run.run_jobs(jobs)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted. Finished pages are recorded in {args.journal}; rerun with --resume to continue.")
+        return
+    finally:
+        journal.close()
+        manifest.save()
+        print(run.summary())
+        print(f"HTTP: {REQUEST_STATS.summary()}")
+        if hedger is not None:
+            hedger.close()
+            print(f"Hedging: {hedger.summary()}")
+        if run.latencies:
+            print(f"Latency: {latency_summary(run.latencies)}")
+
+    if cache is not None:
+        cache.prune()
+        print(f"Response cache: {cache.summary()}")
 
     print("Generation complete.")
     
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL journal for landing page generation runs.
+Every state change of a group (pending, running, done, failed) is written as one
+line and fsynced, so an interrupted batch can be resumed without re-paying for
+pages that already finished.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def load_journal_states(path: Path) -> Dict[str, Dict]:
+    """Return the latest journal record per slug.
+
+    A torn final line (from a crash mid-write) is ignored.
+    """
+    states: Dict[str, Dict] = {}
+    if not path.exists():
+        return states
+
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            slug = record.get("slug")
+            if slug:
+                states[slug] = record
+    return states
+
+
+class GenerationJournal:
+    """Thread-safe writer that appends one durable JSON line per state change."""
+
+    def __init__(self, path: Path, run_id: Optional[str] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id or time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        self._lock = threading.Lock()
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def record(self, slug: str, state: str, **fields) -> None:
+        entry = {"ts": round(time.time(), 3), "run_id": self.run_id, "slug": slug, "state": state}
+        entry.update({key: value for key, value in fields.items() if value is not None})
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> "GenerationJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Last-commit dates for the site's pages, straight from git history.
+After a fresh clone or on a Netlify/CI build every file's mtime is the checkout
+time, so mtimes say nothing about when a page changed. This resolver runs one
+`git log --name-only` over the history (newest first) and records the first
+date each path appears with, i.e. the date of the last commit that touched it.
+The walk stops as soon as every tracked page has a date. Merges count on the
+date they landed on the current branch (--first-parent -m). A root commit is an
+import of files that existed before the history began, so it dates nothing:
+files last touched there are left out, like uncommitted ones.
+
+The map is cached in .cache/git_lastmod.json keyed by HEAD. When HEAD moves
+forward only the new commits are read; any other change of HEAD (rebase,
+checkout of an unrelated branch) triggers a full walk. Files with uncommitted
+changes are left out so callers fall back to their own date. Shallow clones are
+refused, because every file would get the date of the shallow boundary.
+
+    python tools/git_lastmod.py                   # summary
+    python tools/git_lastmod.py index.html blog   # dates for some paths
+"""
+
+import argparse
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from build_manifest import write_bytes_if_changed
+
+DEFAULT_PATHSPECS = ("*.html",)
+RECORD_SEPARATOR = b"\x1e"
+# Bumped when the cached dates would differ for the same HEAD (2: root commits date nothing)
+CACHE_VERSION = 2
+
+
+class GitUnavailable(RuntimeError):
+    pass
+
+
+def _git(repo: Path, *args: str) -> bytes:
+    try:
+        result = subprocess.run(["git", "-C", str(repo), *args], capture_output=True, check=True)
+    except FileNotFoundError:
+        raise GitUnavailable("git is not installed") from None
+    except subprocess.CalledProcessError as exc:
+        raise GitUnavailable(exc.stderr.decode("utf-8", "replace").strip() or f"git {args[0]} failed") from None
+    return result.stdout
+
+
+def _log_command(repo: Path, revisions: str, pathspecs: Sequence[str]) -> List[str]:
+    return [
+        "git", "-C", str(repo), "log", revisions,
+        "--first-parent", "-m", "--no-renames", "--name-only", "-z",
+        "--date=short", "--pretty=format:%x1e%cd %P",
+        "--", *pathspecs,
+    ]  # fmt: skip
+
+
+def _parse_records(buffer: bytes, dates: Dict[str, Optional[str]], pending: Optional[Set[str]]) -> None:
+    """Record the first (newest) date of every path in complete log records; None for a root commit."""
+    for record in buffer.split(RECORD_SEPARATOR):
+        header, _, names = record.partition(b"\n")
+        if not header:
+            continue
+        day, *parents = header.decode("ascii").split()
+        if not parents:
+            day = None
+        for name in names.split(b"\0"):
+            if name:
+                path = name.decode("utf-8", "surrogateescape")
+                if path not in dates:
+                    dates[path] = day
+                    if pending is not None:
+                        pending.discard(path)
+
+
+def walk_history(repo: Path, revisions: str = "HEAD", pathspecs: Sequence[str] = DEFAULT_PATHSPECS, wanted: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """path -> date of the newest commit in revisions touching it, in one git log pass.
+
+    With wanted, the log is cut off once every wanted path has been seen. Paths
+    whose newest commit is the root commit are left out.
+    """
+    dates: Dict[str, Optional[str]] = {}
+    pending = set(wanted) if wanted is not None else None
+    if pending is not None and not pending:
+        return {}
+    process = subprocess.Popen(_log_command(repo, revisions, pathspecs), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    buffer = b""
+    try:
+        for chunk in iter(lambda: process.stdout.read(1 << 16), b""):
+            buffer += chunk
+            # Everything before the last separator is a complete record
+            cut = buffer.rfind(RECORD_SEPARATOR)
+            if cut > 0:
+                _parse_records(buffer[:cut], dates, pending)
+                buffer = buffer[cut:]
+                if pending is not None and not pending:
+                    buffer = b""  # the rest may be a record cut mid-name
+                    break
+        _parse_records(buffer, dates, pending)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+    if process.returncode not in (0, -9) and not dates:
+        raise GitUnavailable(f"git log {revisions} failed")
+    return {path: day for path, day in dates.items() if day}
+
+
+def _is_ancestor(repo: Path, old: str, new: str) -> bool:
+    try:
+        _git(repo, "merge-base", "--is-ancestor", old, new)
+        return True
+    except GitUnavailable:
+        return False
+
+
+def default_cache_path(project_root: Path) -> Path:
+    return Path(project_root) / ".cache" / "git_lastmod.json"
+
+
+def resolve_lastmods(repo: Path, cache_path: Optional[Path] = None, pathspecs: Sequence[str] = DEFAULT_PATHSPECS) -> Dict[str, str]:
+    """Repo-relative path -> last commit date for every tracked, unmodified file matching pathspecs.
+
+    Raises GitUnavailable when repo is not a usable (non-shallow) git checkout.
+    """
+    repo = Path(repo).resolve()
+    top = Path(_git(repo, "rev-parse", "--show-toplevel").decode().strip())
+    if _git(top, "rev-parse", "--is-shallow-repository").strip() == b"true":
+        raise GitUnavailable("shallow clone; fetch full history (git fetch --unshallow) for commit dates")
+    head = _git(top, "rev-parse", "HEAD").decode().strip()
+    cache_path = cache_path or default_cache_path(top)
+
+    cached: Dict = {}
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        pass
+    if cached.get("version") != CACHE_VERSION or cached.get("pathspecs") != list(pathspecs):
+        cached = {}
+
+    if cached.get("head") == head:
+        dates = cached["dates"]
+    elif cached.get("head") and _is_ancestor(top, cached["head"], head):
+        # Only the new commits can move a date forward
+        dates = {**cached["dates"], **walk_history(top, f"{cached['head']}..{head}", pathspecs)}
+    else:
+        tracked = _git(top, "ls-files", "-z", "--", *pathspecs).decode("utf-8", "surrogateescape").split("\0")
+        dates = walk_history(top, head, pathspecs, wanted=[path for path in tracked if path])
+
+    if cached.get("head") != head:
+        payload = {"version": CACHE_VERSION, "head": head, "pathspecs": list(pathspecs), "dates": dict(sorted(dates.items()))}
+        write_bytes_if_changed(cache_path, (json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    dirty = _git(top, "diff", "--name-only", "-z", "HEAD", "--", *pathspecs).decode("utf-8", "surrogateescape").split("\0")
+    for path in dirty:
+        dates.pop(path, None)
+    if top != repo:
+        prefix = repo.relative_to(top).as_posix() + "/"
+        dates = {path[len(prefix):]: day for path, day in dates.items() if path.startswith(prefix)}
+    return dates
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Last commit date of each page from one git log pass")
+    parser.add_argument("paths", nargs="*", help="Show dates for these files or directories")
+    parser.add_argument("--root", type=Path, default=project_root, help="Repository (or subdirectory) to resolve")
+    parser.add_argument("--pathspec", action="append", default=None, help="git pathspec (repeatable, default: *.html)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and rebuild the HEAD-keyed cache")
+    args = parser.parse_args()
+
+    pathspecs = tuple(args.pathspec or DEFAULT_PATHSPECS)
+    cache_path = default_cache_path(project_root)
+    if args.no_cache:
+        cache_path.unlink(missing_ok=True)
+    started = time.perf_counter()
+    try:
+        dates = resolve_lastmods(args.root, cache_path, pathspecs)
+    except GitUnavailable as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+    elapsed = time.perf_counter() - started
+
+    if args.paths:
+        for wanted in args.paths:
+            prefix = wanted.rstrip("/")
+            for path, day in sorted(dates.items()):
+                if path == prefix or path.startswith(prefix + "/"):
+                    print(f"{day}  {path}")
+    days = sorted(set(dates.values()))
+    span = f", {days[0]} .. {days[-1]}" if days else ""
+    print(f"🕰️  {len(dates)} files dated from git history{span} in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Hedged Grok requests for landing page generation.
+Once a call has been running longer than a live latency percentile of recent calls,
+a duplicate is fired; whichever answers first wins and the other is cancelled at
+its next retry checkpoint. Duplicates are capped at a fraction of all calls so the
+extra spend per run stays bounded.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of completed call durations."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """p-th percentile of the window, or None until min_samples calls have completed."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class HedgedCaller:
+    """Wraps a blocking call that accepts a cancel=threading.Event keyword argument."""
+
+    def __init__(
+        self,
+        call: Callable,
+        percentile: float = 95.0,
+        budget: float = 0.1,
+        min_samples: int = 20,
+        min_delay: float = 0.5,
+        max_workers: int = 64,
+    ):
+        self.call = call
+        self.percentile = percentile
+        self.budget = budget
+        self.min_delay = min_delay
+        self.tracker = LatencyTracker(min_samples=min_samples)
+        self.stats: Dict[str, int] = {"calls": 0, "hedged": 0, "won": 0, "skipped_budget": 0}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="grok-hedge")
+
+    def hedge_delay(self) -> Optional[float]:
+        threshold = self.tracker.percentile(self.percentile)
+        return None if threshold is None else max(threshold, self.min_delay)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.budget * self.stats["calls"]:
+                self.stats["skipped_budget"] += 1
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def _observe(self, result, started: float) -> None:
+        # Cache hits say nothing about API latency.
+        if not getattr(result, "cached", False):
+            self.tracker.record(time.monotonic() - started)
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.stats["calls"] += 1
+        started = time.monotonic()
+        cancels: Dict[Future, threading.Event] = {}
+
+        def submit() -> Future:
+            cancel = threading.Event()
+            future = self._executor.submit(self.call, *args, cancel=cancel, **kwargs)
+            cancels[future] = cancel
+            return future
+
+        primary = submit()
+        delay = self.hedge_delay()
+        if delay is not None:
+            done, _ = wait([primary], timeout=delay)
+            if not done and self._take_budget():
+                submit()
+
+        pending = set(cancels)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    error = exc
+                    continue
+                for other in pending:
+                    cancels[other].set()
+                    other.cancel()
+                if future is not primary:
+                    with self._lock:
+                        self.stats["won"] += 1
+                self._observe(result, started)
+                return result
+        raise error
+
+    def summary(self) -> str:
+        threshold = self.hedge_delay()
+        current = f"{threshold:.2f}s" if threshold is not None else "warming up"
+        return (
+            f"{self.stats['hedged']} hedges fired for {self.stats['calls']} calls "
+            f"({self.stats['won']} won, {self.stats['skipped_budget']} skipped by budget), "
+            f"p{self.percentile:g} threshold {current}"
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
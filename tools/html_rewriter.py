@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Streaming HTML rewriter for site transforms.
+Tokenizes pages chunk by chunk and hands elements matching a CSS selector to
+handlers that can set attributes, insert HTML around or inside them, or replace
+them. Everything a handler does not touch is copied through byte for byte, and
+only the current token plus the stack of open elements is held in memory, so a
+transform costs one tokenizer pass per page and survives whitespace, attribute
+order and quoting drift that breaks exact-snippet str.replace patches.
+
+    rewriter = HTMLRewriter(out.write)
+    rewriter.on("head", lambda el: el.append(CSS))
+    rewriter.on('a.pill[href^="/locations/"]', lambda el: el.set_attribute("rel", "nofollow"))
+    rewriter.write(chunk)
+    rewriter.end()
+
+Selectors support tag, *, #id, .class, [attr], [attr=v], [attr~=v], [attr^=v],
+[attr$=v], [attr*=v], [attr|=v], descendant and child (>) combinators, and comma
+separated lists.
+"""
+
+import hashlib
+import os
+import re
+from functools import lru_cache
+from html import escape, unescape
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+VOID_ELEMENTS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+# Content of these elements is text up to the matching end tag.
+RAW_TEXT_ELEMENTS = frozenset(("script", "style", "textarea", "title"))
+
+TOKEN_RE = re.compile(
+    r"""<!--.*?-->
+      |<[!?][^>]*>
+      |</(?P<end>[a-zA-Z][^\s/>]*)[^>]*>
+      |<(?P<start>[a-zA-Z][^\s/>]*)(?P<attrs>(?:[^>"']|"[^"]*"|'[^']*')*)>""",
+    re.S | re.X,
+)
+TAG_LIKE_RE = re.compile(r"<[a-zA-Z/!?]")
+ATTR_RE = re.compile(r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+# A malformed tag-like token longer than this is passed through as text instead of buffering the rest of the file.
+MAX_PENDING = 1 << 16
+
+
+class SelectorError(ValueError):
+    pass
+
+
+class AttributeTest(NamedTuple):
+    name: str
+    op: Optional[str]
+    value: str
+
+    def matches(self, attrs: Dict[str, Optional[str]]) -> bool:
+        if self.name not in attrs:
+            return False
+        if self.op is None:
+            return True
+        actual = attrs[self.name] or ""
+        if self.op == "=":
+            return actual == self.value
+        if self.op == "~=":
+            return self.value in actual.split()
+        if self.op == "^=":
+            return bool(self.value) and actual.startswith(self.value)
+        if self.op == "$=":
+            return bool(self.value) and actual.endswith(self.value)
+        if self.op == "*=":
+            return bool(self.value) and self.value in actual
+        # |=
+        return actual == self.value or actual.startswith(self.value + "-")
+
+
+class Compound(NamedTuple):
+    tag: Optional[str]
+    tests: Tuple[AttributeTest, ...]
+    # Combinator to the compound on the left: " " (descendant), ">" (child) or "" (leftmost).
+    combinator: str
+
+    def matches(self, tag: str, attrs: Dict[str, Optional[str]]) -> bool:
+        return (self.tag is None or self.tag == tag) and all(test.matches(attrs) for test in self.tests)
+
+
+SIMPLE_RE = re.compile(
+    r"""(?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)
+      |\#(?P<id>[\w-]+)
+      |\.(?P<cls>[\w-]+)
+      |\[\s*(?P<attr>[^\s~^$*|=\]]+)\s*
+         (?:(?P<op>[~^$*|]?=)\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s\]]+))\s*)?\]""",
+    re.X,
+)
+COMBINATOR_RE = re.compile(r"\s*([>,])\s*|\s+")
+
+
+class Selector:
+    """Parsed selector list; matches against the stack of open elements."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.alternatives: List[Tuple[Compound, ...]] = []
+        parts: List[Compound] = []
+        combinator = ""
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            tag = None
+            tests: List[AttributeTest] = []
+            start = pos
+            while pos < len(text):
+                match = SIMPLE_RE.match(text, pos)
+                if not match:
+                    break
+                if match.group("tag"):
+                    if pos != start:
+                        raise SelectorError(f"Tag name must come first in {self.text!r}")
+                    tag = None if match.group("tag") == "*" else match.group("tag").lower()
+                elif match.group("id"):
+                    tests.append(AttributeTest("id", "=", match.group("id")))
+                elif match.group("cls"):
+                    tests.append(AttributeTest("class", "~=", match.group("cls")))
+                else:
+                    value = next((v for v in match.group("dq", "sq", "bare") if v is not None), "")
+                    tests.append(AttributeTest(match.group("attr").lower(), match.group("op"), value))
+                pos = match.end()
+            if pos == start:
+                raise SelectorError(f"Unexpected {text[pos:]!r} in selector {self.text!r}")
+            parts.append(Compound(tag, tuple(tests), combinator))
+            match = COMBINATOR_RE.match(text, pos)
+            if not match or pos == len(text):
+                continue
+            pos = match.end()
+            if match.group(1) == ",":
+                self.alternatives.append(tuple(parts))
+                parts, combinator = [], ""
+            else:
+                combinator = match.group(1) or " "
+            if pos == len(text):
+                raise SelectorError(f"Selector {self.text!r} ends with a combinator")
+        if not parts:
+            raise SelectorError(f"Empty selector in {self.text!r}")
+        self.alternatives.append(tuple(parts))
+        # Tags the selector can match, or None when its rightmost compound has no tag.
+        rightmost = [parts[-1].tag for parts in self.alternatives]
+        self.tags = None if None in rightmost else frozenset(rightmost)
+
+    def matches(self, stack: List["_Open"]) -> bool:
+        return any(_match(parts, len(parts) - 1, stack, len(stack) - 1) for parts in self.alternatives)
+
+    def __repr__(self) -> str:
+        return f"Selector({self.text!r})"
+
+
+def _match(parts: Tuple[Compound, ...], i: int, stack: List["_Open"], j: int) -> bool:
+    if not parts[i].matches(stack[j].tag, stack[j].attrs):
+        return False
+    if i == 0:
+        return True
+    if parts[i].combinator == ">":
+        return j > 0 and _match(parts, i - 1, stack, j - 1)
+    return any(_match(parts, i - 1, stack, k) for k in range(j - 1, -1, -1))
+
+
+@lru_cache(maxsize=None)
+def _raw_text_end(tag: str) -> "re.Pattern":
+    return re.compile(r"</" + re.escape(tag) + r"[\s/>]", re.I)
+
+
+@lru_cache(maxsize=256)
+def parse_selector(text: str) -> Selector:
+    return Selector(text)
+
+
+def parse_attributes(text: str) -> Dict[str, Optional[str]]:
+    attrs: Dict[str, Optional[str]] = {}
+    for match in ATTR_RE.finditer(text):
+        name = match.group(1).lower()
+        if name in attrs:
+            continue
+        raw = next((v for v in match.group(2, 3, 4) if v is not None), None)
+        attrs[name] = None if raw is None else unescape(raw)
+    return attrs
+
+
+class _Open:
+    """An element whose end tag has not been seen yet."""
+
+    __slots__ = ("tag", "attr_text", "_attrs", "append", "after", "skip", "drop_end")
+
+    def __init__(self, tag: str, attr_text: str):
+        self.tag = tag
+        self.attr_text = attr_text
+        self._attrs: Optional[Dict[str, Optional[str]]] = None
+        self.append: List[str] = []
+        self.after: List[str] = []
+        self.skip = False
+        self.drop_end = False
+
+    @property
+    def attrs(self) -> Dict[str, Optional[str]]:
+        # Parsed on first use; most tags are never tested against an attribute selector.
+        if self._attrs is None:
+            self._attrs = parse_attributes(self.attr_text) if self.attr_text else {}
+        return self._attrs
+
+    @attrs.setter
+    def attrs(self, value: Dict[str, Optional[str]]) -> None:
+        self._attrs = value
+
+
+class Element:
+    """Start tag handed to a handler. Inserted content is raw HTML."""
+
+    def __init__(self, tag_name: str, attributes: Dict[str, Optional[str]], self_closing: bool):
+        self.tag_name = tag_name
+        self.attributes = dict(attributes)
+        self.self_closing = self_closing
+        self.modified = False
+        self.removed = False
+        self._before: List[str] = []
+        self._after: List[str] = []
+        self._prepend: List[str] = []
+        self._append: List[str] = []
+        self._inner: Optional[str] = None
+        self._replacement: Optional[str] = None
+
+    @property
+    def is_void(self) -> bool:
+        return self.self_closing or self.tag_name in VOID_ELEMENTS
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        return self.attributes.get(name.lower())
+
+    def has_attribute(self, name: str) -> bool:
+        return name.lower() in self.attributes
+
+    def set_attribute(self, name: str, value: Optional[str]) -> None:
+        """Set an attribute; None writes it without a value."""
+        name = name.lower()
+        if name not in self.attributes or self.attributes[name] != value:
+            self.attributes[name] = value
+            self.modified = True
+
+    def remove_attribute(self, name: str) -> None:
+        if self.attributes.pop(name.lower(), False) is not False:
+            self.modified = True
+
+    def before(self, html: str) -> None:
+        self._before.append(html)
+
+    def after(self, html: str) -> None:
+        self._after.append(html)
+
+    def prepend(self, html: str) -> None:
+        self._prepend.insert(0, html)
+
+    def append(self, html: str) -> None:
+        self._append.append(html)
+
+    def set_inner_content(self, html: str) -> None:
+        self._inner = html
+        self._prepend.clear()
+        self._append.clear()
+
+    def replace(self, html: str) -> None:
+        self._replacement = html
+        self.removed = True
+
+    def remove(self) -> None:
+        self.replace("")
+
+    def start_tag(self, raw: str) -> str:
+        if not self.modified:
+            return raw
+        parts = [f"<{self.tag_name}"]
+        for name, value in self.attributes.items():
+            parts.append(f" {name}" if value is None else f' {name}="{escape(value, quote=True)}"')
+        parts.append(" />" if self.self_closing else ">")
+        return "".join(parts)
+
+
+Handler = Callable[[Element], None]
+
+
+class HTMLRewriter:
+    """Feed text with write(), finish with end(); rewritten output goes to sink."""
+
+    def __init__(self, sink: Callable[[str], None]):
+        self.sink = sink
+        self.handlers: List[Tuple[Selector, Handler]] = []
+        self._buf = ""
+        self._stack: List[_Open] = []
+        self._raw_text: Optional[str] = None
+        # Index in _stack of the element whose children are being dropped.
+        self._skip_at: Optional[int] = None
+        self._by_tag: Dict[str, List[Tuple[Selector, Handler]]] = {}
+
+    def on(self, selector: str, handler: Handler) -> "HTMLRewriter":
+        self.handlers.append((parse_selector(selector), handler))
+        self._by_tag.clear()
+        return self
+
+    def _candidates(self, tag: str) -> List[Tuple[Selector, Handler]]:
+        candidates = self._by_tag.get(tag)
+        if candidates is None:
+            candidates = [(sel, handler) for sel, handler in self.handlers if sel.tags is None or tag in sel.tags]
+            self._by_tag[tag] = candidates
+        return candidates
+
+    def write(self, chunk: str) -> None:
+        self._buf += chunk
+        self._pump(final=False)
+
+    def end(self) -> None:
+        self._pump(final=True)
+        # Elements left open at EOF still get their appended content.
+        while self._stack:
+            self._close(len(self._stack) - 1, end_tag=None)
+
+    def _emit(self, text: str) -> None:
+        if text and self._skip_at is None:
+            self.sink(text)
+
+    def _pump(self, final: bool) -> None:
+        buf, pos, size = self._buf, 0, len(self._buf)
+        while pos < size:
+            if self._raw_text:
+                close = _raw_text_end(self._raw_text).search(buf, pos)
+                if close is None:
+                    # Keep enough of the tail to recognise a split end tag.
+                    keep = size if final else max(pos, size - len(self._raw_text) - 3)
+                    self._emit(buf[pos:keep])
+                    pos = keep
+                    break
+                self._emit(buf[pos : close.start()])
+                pos = close.start()
+                self._raw_text = None
+            lt = buf.find("<", pos)
+            if lt == -1:
+                self._emit(buf[pos:])
+                pos = size
+                break
+            if lt > pos:
+                self._emit(buf[pos:lt])
+                pos = lt
+            # A comment cut by a chunk boundary may hold a ">" that would end it early as a <!...> token.
+            if not final and buf.startswith("<!--", pos) and buf.find("-->", pos + 2) == -1:
+                break
+            match = TOKEN_RE.match(buf, pos)
+            if match is None:
+                if TAG_LIKE_RE.match(buf, pos) or size - pos < 2:
+                    if not final and size - pos < MAX_PENDING:
+                        break
+                self._emit("<")
+                pos += 1
+                continue
+            pos = match.end()
+            if match.group("start"):
+                self._start_tag(match.group("start").lower(), match.group("attrs"), match.group(0))
+            elif match.group("end"):
+                self._end_tag(match.group("end").lower(), match.group(0))
+            else:
+                self._emit(match.group(0))
+        self._buf = buf[pos:]
+
+    def _start_tag(self, tag: str, attr_text: str, raw: str) -> None:
+        self_closing = attr_text.rstrip().endswith("/")
+        void = self_closing or tag in VOID_ELEMENTS
+        if tag in RAW_TEXT_ELEMENTS and not self_closing:
+            self._raw_text = tag
+        entry = _Open(tag, attr_text.rstrip("/ \t\r\n"))
+        self._stack.append(entry)
+        candidates = self._candidates(tag)
+
+        if self._skip_at is not None or not candidates:
+            if void:
+                self._stack.pop()
+            self._emit(raw)
+            return
+
+        element = None
+        for selector, handler in candidates:
+            if selector.matches(self._stack):
+                if element is None:
+                    element = Element(tag, entry.attrs, self_closing)
+                handler(element)
+                if element.removed:
+                    break
+
+        if element is None:
+            self._emit(raw)
+        else:
+            self._emit("".join(element._before))
+            if element.removed:
+                self._emit(element._replacement)
+                entry.skip = entry.drop_end = True
+            else:
+                self._emit(element.start_tag(raw))
+                self._emit("".join(element._prepend))
+                if element._inner is not None:
+                    self._emit(element._inner)
+                    entry.skip = True
+                entry.append = element._append
+            entry.attrs = element.attributes
+            entry.after = element._after
+
+        if void:
+            self._stack.pop()
+            if element is not None:
+                self._emit("".join(element._after))
+        elif entry.skip:
+            # Dropped children are still tokenized (raw-text mode included) so the end tag is found.
+            self._skip_at = len(self._stack) - 1
+
+    def _end_tag(self, tag: str, raw: str) -> None:
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index].tag == tag:
+                break
+        else:
+            # Stray end tag.
+            self._emit(raw)
+            return
+        while len(self._stack) - 1 > index:
+            self._close(len(self._stack) - 1, end_tag=None)
+        self._close(index, end_tag=raw)
+
+    def _close(self, index: int, end_tag: Optional[str]) -> None:
+        entry = self._stack.pop()
+        if self._skip_at is not None and index > self._skip_at:
+            return
+        if self._skip_at == index:
+            self._skip_at = None
+        self._emit("".join(entry.append))
+        if end_tag and not entry.drop_end:
+            self._emit(end_tag)
+        self._emit("".join(entry.after))
+
+
+def rewrite_html(html: str, handlers: Iterable[Tuple[str, Handler]]) -> str:
+    """Rewrite a whole document held in memory."""
+    out: List[str] = []
+    rewriter = HTMLRewriter(out.append)
+    for selector, handler in handlers:
+        rewriter.on(selector, handler)
+    rewriter.write(html)
+    rewriter.end()
+    return "".join(out)
+
+
+def rewrite_file(
+    path: Path,
+    handlers: Iterable[Tuple[str, Handler]],
+    chunk_size: int = 1 << 16,
+    dry_run: bool = False,
+) -> bool:
+    """Stream path through the rewriter in chunks; returns True when the output differs.
+
+    The rewritten page goes to a sibling temp file that replaces the original
+    only when its bytes changed, so unchanged pages keep their mtime.
+    """
+    path = Path(path)
+    tmp_file = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    source_hash, output_hash = hashlib.sha256(), hashlib.sha256()
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as src, open(
+            tmp_file, "w", encoding="utf-8", newline=""
+        ) as dst:
+
+            def sink(text: str) -> None:
+                output_hash.update(text.encode("utf-8"))
+                if not dry_run:
+                    dst.write(text)
+
+            rewriter = HTMLRewriter(sink)
+            for selector, handler in handlers:
+                rewriter.on(selector, handler)
+            for chunk in iter(lambda: src.read(chunk_size), ""):
+                source_hash.update(chunk.encode("utf-8"))
+                rewriter.write(chunk)
+            rewriter.end()
+        changed = source_hash.digest() != output_hash.digest()
+        if changed and not dry_run:
+            os.replace(tmp_file, path)
+        return changed
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
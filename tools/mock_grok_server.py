@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the x.ai chat-completions endpoint.
+Answers with schema-valid landing page JSON after a configurable latency, and can
+inject 5xx errors, a request-rate limit and periodic 429 bursts, so the generator
+can be benchmarked end to end without an API key or network access.
+
+    python tools/mock_grok_server.py --latency-ms 800 --latency-dist lognormal --rate-limit 20
+    XAI_API_KEY=mock python tools/generate_landing_pages.py --api-base http://127.0.0.1:8765/v1 ...
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+
+def extract_field(prompt: str, label: str, default: str) -> str:
+    match = re.search(rf"^[ \t]*{re.escape(label)}:[ \t]*(.+)$", prompt, re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+def fit_length(text: str, minimum: int, maximum: int, filler: str) -> str:
+    """Pad with filler words and trim on a word boundary to land inside [minimum, maximum]."""
+    while len(text) < minimum:
+        text = f"{text} {filler}"
+    if len(text) > maximum:
+        text = text[:maximum].rsplit(" ", 1)[0].rstrip(",.;") + "."
+    return text
+
+
+def landing_page_content(group_name: str, primary_keyword: str) -> Dict:
+    """Build a response that satisfies CONTENT_PROMPT_TEMPLATE's schema and length rules."""
+    service = group_name.split("|")[0].strip() or "Junk Removal"
+    city = group_name.split("|")[1].strip() if "|" in group_name else "Howard County"
+    title = f"{service} | {city} | Grime To Dime"
+    if len(title) > 60:
+        title = f"{service[:60 - len(' | Grime To Dime')].rstrip()} | Grime To Dime"
+    meta = fit_length(
+        f"Fast, friendly {primary_keyword or service.lower()} in {city}. Upfront pricing, same-day pickup and responsible disposal.",
+        140,
+        165,
+        "Call today.",
+    )
+    return {
+        "page_title": title,
+        "meta_description": meta,
+        "hero": {
+            "heading": f"{service} in {city}",
+            "subheading": "Local pros who load, haul and recycle so you don't have to.",
+            "bullets": ["Same-day and next-day pickup", "Upfront, volume-based pricing", "Licensed, insured local crew"],
+        },
+        "quote_form": {
+            "heading": "Get Your Free Quote",
+            "details_label": "What are we removing?",
+            "details_placeholder": "Item list, access notes, photos",
+            "submit_label": "Get My Quote Now",
+            "note": "We reply within the hour during business days.",
+            "form_subject": f"{service} Quote Request",
+        },
+        "what_we_take": [
+            {"title": "Furniture", "description": "Couches, dressers, mattresses and more."},
+            {"title": "Appliances", "description": "Fridges, washers, dryers and water heaters."},
+            {"title": "Debris", "description": "Renovation scraps, yard waste and boxes."},
+        ],
+        "how_it_works": [
+            {"title": "Book", "description": "Call or send photos for an upfront price."},
+            {"title": "We Load", "description": "Our crew does all the lifting and hauling."},
+            {"title": "Done", "description": "We sweep up and recycle or donate what we can."},
+        ],
+        "pricing": [
+            {"title": "Volume Based", "description": "Pay only for the trailer space you use."},
+            {"title": "No Surprises", "description": "The price we quote is the price you pay."},
+        ],
+        "faq": [
+            {"question": f"How fast can you handle {service.lower()}?", "answer": "Often the same day, otherwise next day."},
+            {"question": "How is pricing calculated?", "answer": "By how much space your items take in our trailer."},
+            {"question": "Do you recycle?", "answer": "Yes, we donate and recycle whenever possible."},
+            {"question": f"Do you serve {city}?", "answer": f"Yes, {city} and all of Howard County."},
+        ],
+        "closing_cta": {"button_label": "Call Now for Fast Pickup", "closing_copy": "Ready for a clutter-free space?"},
+        "service_type": service,
+    }
+
+
+SECTION_MARKER = "Return valid JSON containing only these keys:"
+FLAVOR_MARKER = '"local_flavor"'
+
+
+def prompt_content(prompt: str) -> Dict:
+    """Answer a single-group prompt with one page, a batch prompt with {"pages": {slug: page}},
+    a section repair prompt with just the requested keys, or a local flavor prompt with a paragraph."""
+    if FLAVOR_MARKER in prompt:
+        match = re.search(r"landing page in (.+?), Maryland", prompt)
+        city = match.group(1) if match else "Howard County"
+        return {"local_flavor": f"Neighbors all over {city} count on our crew for quick, careful pickups. We load, sweep up and haul everything away responsibly."}
+    if SECTION_MARKER in prompt:
+        try:
+            keys = json.loads(prompt.split(SECTION_MARKER, 1)[1])
+        except ValueError:
+            keys = {}
+        page = landing_page_content(
+            extract_field(prompt, "Group name", "Junk Removal"),
+            extract_field(prompt, "Primary keyword", "junk removal"),
+        )
+        return {key: page[key] for key in keys if key in page}
+
+    blocks = re.split(r'^\s*Page "([^"]+)":\s*$', prompt, flags=re.MULTILINE)
+    if len(blocks) == 1:
+        return landing_page_content(
+            extract_field(prompt, "Group name", "Junk Removal"),
+            extract_field(prompt, "Primary keyword", "junk removal"),
+        )
+
+    pages = {}
+    for slug, block in zip(blocks[1::2], blocks[2::2]):
+        pages[slug] = landing_page_content(
+            extract_field(block, "Group name", "Junk Removal"),
+            extract_field(block, "Primary keyword", "junk removal"),
+        )
+    return {"pages": pages}
+
+
+class MockBehaviour:
+    """Latency, error and rate-limit model shared by all handler threads."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.tokens = float(args.rate_limit or 0)
+        self.last_refill = self.started
+        self.counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0}
+        self.latencies: List[float] = []
+
+    def sample_latency(self) -> float:
+        args = self.args
+        base = args.latency_ms / 1000.0
+        with self.lock:
+            if args.slow_rate and self.rng.random() < args.slow_rate:
+                return args.slow_ms / 1000.0
+            if args.latency_dist == "uniform":
+                return max(0.0, self.rng.uniform(base * (1 - args.jitter), base * (1 + args.jitter)))
+            if args.latency_dist == "lognormal":
+                return self.rng.lognormvariate(math.log(max(base, 1e-6)), args.jitter)
+            return base
+
+    def admit(self) -> Tuple[Optional[float], Dict[str, str]]:
+        """Return (retry_after, headers); retry_after is None when the request may proceed."""
+        args = self.args
+        now = time.monotonic()
+        with self.lock:
+            self.counts["requests"] += 1
+            if args.burst_every and (now - self.started) % args.burst_every < args.burst_length:
+                elapsed = (now - self.started) % args.burst_every
+                self.counts["rate_limited"] += 1
+                return args.burst_length - elapsed, {}
+
+            if not args.rate_limit:
+                return None, {}
+            self.tokens = min(float(args.rate_limit), self.tokens + (now - self.last_refill) * args.rate_limit)
+            self.last_refill = now
+            reset = (1.0 - self.tokens) / args.rate_limit if self.tokens < 1 else 0.0
+            if self.tokens < 1:
+                self.counts["rate_limited"] += 1
+                return reset, {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": f"{reset:.3f}s"}
+            self.tokens -= 1
+            return None, {
+                "x-ratelimit-limit-requests": str(args.rate_limit),
+                "x-ratelimit-remaining-requests": str(int(self.tokens)),
+                "x-ratelimit-reset-requests": f"{1.0 / args.rate_limit:.3f}s",
+            }
+
+    def degrade(self, content: Dict) -> Dict:
+        """Drop random sections from full pages to exercise partial regeneration."""
+        if not self.args.drop_section_rate:
+            return content
+        pages = content["pages"].values() if "pages" in content else [content]
+        with self.lock:
+            for page in pages:
+                if "meta_description" not in page:
+                    continue
+                for key in list(page):
+                    if self.rng.random() < self.args.drop_section_rate:
+                        del page[key]
+        return content
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return bool(self.args.error_rate) and self.rng.random() < self.args.error_rate
+
+    def record(self, outcome: str, latency: float) -> None:
+        with self.lock:
+            self.counts[outcome] += 1
+            self.latencies.append(latency)
+
+    def stats(self) -> Dict:
+        with self.lock:
+            ordered = sorted(self.latencies)
+            counts = dict(self.counts)
+        percentiles = {}
+        for p in (50, 90, 95, 99):
+            if ordered:
+                percentiles[f"p{p}"] = round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 4)
+        return {"counts": counts, "latency": percentiles, "uptime": round(time.monotonic() - self.started, 2)}
+
+
+def make_handler(behaviour: MockBehaviour):
+    class MockGrokHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # noqa: A002 - signature fixed by BaseHTTPRequestHandler
+            if behaviour.args.verbose:
+                super().log_message(format, *args)
+
+        def send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                self.send_json(200, behaviour.stats())
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_json(404, {"error": "not found"})
+                return
+
+            started = time.monotonic()
+            retry_after, rate_headers = behaviour.admit()
+            if retry_after is not None:
+                headers = dict(rate_headers)
+                headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+                self.send_json(429, {"error": {"message": "Rate limit exceeded (mock)"}}, headers)
+                return
+
+            try:
+                payload = json.loads(raw or b"{}")
+                prompt = next(m["content"] for m in payload.get("messages", []) if m.get("role") == "user")
+            except (ValueError, StopIteration, KeyError, TypeError):
+                self.send_json(400, {"error": {"message": "Expected a chat-completions payload with a user message"}})
+                return
+
+            time.sleep(behaviour.sample_latency())
+            if behaviour.should_fail():
+                behaviour.record("errors", time.monotonic() - started)
+                self.send_json(500, {"error": {"message": "Injected server error (mock)"}})
+                return
+
+            content = behaviour.degrade(prompt_content(prompt)) if SECTION_MARKER not in prompt else prompt_content(prompt)
+            completion = json.dumps(content)
+            prompt_tokens = sum(len(m.get("content", "")) for m in payload.get("messages", [])) // 4
+            behaviour.record("ok", time.monotonic() - started)
+            self.send_json(
+                200,
+                {
+                    "id": f"mock-{behaviour.counts['requests']}",
+                    "object": "chat.completion",
+                    "model": payload.get("model", "mock"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": completion}, "finish_reason": "stop"}],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": len(completion) // 4,
+                        "total_tokens": prompt_tokens + len(completion) // 4,
+                    },
+                },
+                rate_headers,
+            )
+
+    return MockGrokHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local mock of the x.ai chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Median response latency")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Spread: +/- fraction for uniform, sigma for lognormal")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of requests that take --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=15000.0, help="Latency of the slow tail")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--drop-section-rate", type=float, default=0.0, help="Chance of dropping each section of a full page")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Seconds between 429 bursts (0 = no bursts)")
+    parser.add_argument("--burst-length", type=float, default=2.0, help="Length of each 429 burst in seconds")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for repeatable runs")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    behaviour = MockBehaviour(args)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(behaviour))
+    server.daemon_threads = True
+    print(f"🧪 Mock Grok API listening on http://{args.host}:{args.port}/v1/chat/completions")
+    print(f"📊 Live stats at http://{args.host}:{args.port}/stats")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 Final stats: {json.dumps(behaviour.stats())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern replacement for site-wide text updates.
+All rules are compiled into a single scanner so a file is searched once, no
+matter how many literals and regexes an update needs. Literal rules are folded
+into a trie (the Aho-Corasick goto structure) and emitted as one factored
+alternation, so the regex engine walks shared prefixes once instead of
+retrying every literal at every position; regex rules are added as further
+alternatives. At each position the first rule in order that matches wins, and
+among literals of one rule group the longest wins.
+
+    replacer = MultiReplacer([
+        literal("15 reviews", "16 reviews", ignore_case=True, word=True),
+        regex(r'("reviewCount"\\s*:\\s*"?)15\\b', r"\\g<1>16"),
+    ])
+    text, counts = replacer.sub(text)
+
+The driver (replace_in_files / the CLI) fans files out over a process pool and
+writes each file at most once, only when its bytes changed.
+"""
+
+import argparse
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from snapshot_store import Change, Run, SnapshotStore, default_store_path, snapshot_write
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse
+
+Replacement = Union[str, Callable[["re.Match"], str]]
+
+
+class Rule(NamedTuple):
+    name: str
+    pattern: str
+    replacement: Replacement
+    is_literal: bool
+    ignore_case: bool
+    # Literal rules only: require word boundaries around the match.
+    word: bool
+
+
+def literal(pattern: str, replacement: str, ignore_case: bool = False, word: bool = False, name: str = "") -> Rule:
+    return Rule(name or pattern, pattern, replacement, True, ignore_case, word)
+
+
+def regex(pattern: str, replacement: Replacement, ignore_case: bool = False, name: str = "") -> Rule:
+    """replacement is an re template (\\1, \\g<name>) or a callable taking the match.
+
+    Backreferences inside the pattern itself must be named ((?P=name)), since
+    numbered groups shift once the rule is combined with the others.
+    """
+    return Rule(name or pattern, pattern, replacement, False, ignore_case, False)
+
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of words, factored over a trie; longer words are preferred."""
+    root: Dict[str, Dict] = {}
+    for word in words:
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _node_pattern(root)
+
+
+def _node_pattern(node: Dict[str, Dict]) -> str:
+    ends_here = "" in node
+    branches = [re.escape(char) + _node_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # An optional tail keeps the longest literal: the engine tries the longer branch first.
+    if ends_here:
+        return "(?:" + body + ")?"
+    return body
+
+
+def first_chars(pattern: str, ignore_case: bool = False) -> Optional[FrozenSet[str]]:
+    """Characters every match of pattern must start with, or None when that cannot be bounded.
+
+    Used to put a character-class lookahead in front of the combined scanner, which
+    lets the regex engine skip positions that cannot start any rule.
+    """
+    try:
+        chars = _sequence_first(sre_parse.parse(pattern))
+    except Exception:
+        return None
+    if chars is None:
+        return None
+    if ignore_case:
+        chars = chars | {c.lower() for c in chars} | {c.upper() for c in chars}
+    return frozenset(chars)
+
+
+def _sequence_first(items) -> Optional[Set[str]]:
+    chars: Set[str] = set()
+    for op, arg in items:
+        name = str(op)
+        if name in ("AT", "ASSERT", "ASSERT_NOT"):
+            # Zero-width: the next item decides.
+            continue
+        if name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"):
+            low, _, item = arg
+            item_chars = _sequence_first(item)
+            if item_chars is None:
+                return None
+            chars |= item_chars
+            if low > 0:
+                return chars
+            continue
+        item_chars = _item_first(name, arg)
+        if item_chars is None:
+            return None
+        return chars | item_chars
+    # Everything was optional or zero-width.
+    return None
+
+
+def _item_first(name: str, arg) -> Optional[Set[str]]:
+    if name == "LITERAL":
+        return {chr(arg)}
+    if name == "SUBPATTERN":
+        return _sequence_first(arg[-1])
+    if name == "ATOMIC_GROUP":
+        return _sequence_first(arg)
+    if name == "BRANCH":
+        chars: Set[str] = set()
+        for branch in arg[1]:
+            branch_chars = _sequence_first(branch)
+            if branch_chars is None:
+                return None
+            chars |= branch_chars
+        return chars
+    if name == "IN":
+        chars = set()
+        for op, value in arg:
+            if str(op) == "LITERAL":
+                chars.add(chr(value))
+            elif str(op) == "RANGE" and value[1] - value[0] < 128:
+                chars.update(chr(code) for code in range(value[0], value[1] + 1))
+            elif str(op) == "CATEGORY" and str(value) == "CATEGORY_DIGIT":
+                chars.update("0123456789")
+            else:
+                return None
+        return chars
+    return None
+
+
+class _Group(NamedTuple):
+    name: str
+    rules: List[int]
+    # Literal groups: matched text (lower-cased when ignore_case) -> rule index.
+    lookup: Dict[str, int]
+    ignore_case: bool
+    compiled: Optional["re.Pattern"]
+
+
+class MultiReplacer:
+    """Apply an ordered rule list to text in a single scan."""
+
+    def __init__(self, rules: Sequence[Rule]):
+        if not rules:
+            raise ValueError("MultiReplacer needs at least one rule")
+        self.rules = list(rules)
+        self.groups: List[_Group] = []
+        alternatives: List[str] = []
+        for index, rule in enumerate(self.rules):
+            if rule.is_literal:
+                if not rule.pattern:
+                    raise ValueError(f"Empty literal in rule {rule.name!r}")
+                key = rule.pattern.lower() if rule.ignore_case else rule.pattern
+                last = self.groups[-1] if self.groups else None
+                # Consecutive literal rules with the same flags share one trie.
+                if (
+                    last
+                    and last.compiled is None
+                    and last.ignore_case == rule.ignore_case
+                    and self.rules[last.rules[0]].word == rule.word
+                ):
+                    last.rules.append(index)
+                    last.lookup.setdefault(key, index)
+                    continue
+                self.groups.append(_Group(f"_r{len(self.groups)}", [index], {key: index}, rule.ignore_case, None))
+            else:
+                compiled = re.compile(rule.pattern, re.IGNORECASE if rule.ignore_case else 0)
+                if compiled.match(""):
+                    raise ValueError(f"Rule {rule.name!r} can match the empty string")
+                self.groups.append(_Group(f"_r{len(self.groups)}", [index], {}, rule.ignore_case, compiled))
+
+        starts: Optional[Set[str]] = set()
+        for group in self.groups:
+            first = self.rules[group.rules[0]]
+            if group.compiled is None:
+                group_starts = first_chars(trie_pattern(group.lookup), group.ignore_case)
+            else:
+                group_starts = first_chars(first.pattern, group.ignore_case)
+            starts = None if starts is None or group_starts is None else starts | group_starts
+            flags = "(?i:" if group.ignore_case else "(?:"
+            if group.compiled is None:
+                body = trie_pattern(group.lookup)
+                if first.word:
+                    body = r"\b" + body + r"\b"
+            else:
+                # The rule's own groups are numbered differently in the combined pattern;
+                # sub() re-matches with the rule's pattern before expanding the template.
+                body = first.pattern
+            alternatives.append(f"(?P<{group.name}>{flags}{body}))")
+        scanner = "|".join(alternatives)
+        if starts:
+            scanner = "(?=[" + "".join(re.escape(c) for c in sorted(starts)) + "])(?:" + scanner + ")"
+        self.scanner = re.compile(scanner)
+        self._by_name = {group.name: group for group in self.groups}
+
+    def sub(self, text: str) -> Tuple[str, Counter]:
+        """Return (new_text, replacements per rule name)."""
+        counts: Counter = Counter()
+
+        def replace(match: "re.Match") -> str:
+            # The rule group encloses any groups of its own, so it is the last one closed.
+            group = self._by_name[match.lastgroup]
+            if group.compiled is None:
+                matched = match.group()
+                rule = self.rules[group.lookup[matched.lower() if group.ignore_case else matched]]
+                counts[rule.name] += 1
+                return rule.replacement
+            rule = self.rules[group.rules[0]]
+            # Re-match with the rule's own pattern so its group numbers and names apply.
+            local = group.compiled.match(text, match.start())
+            counts[rule.name] += 1
+            if callable(rule.replacement):
+                return rule.replacement(local)
+            return local.expand(rule.replacement)
+
+        return self.scanner.sub(replace, text), counts
+
+    def subn(self, text: str) -> Tuple[str, int]:
+        new_text, counts = self.sub(text)
+        return new_text, sum(counts.values())
+
+
+class FileResult(NamedTuple):
+    path: str
+    counts: Dict[str, int]
+    written: bool
+    error: Optional[str]
+    change: Optional[Change] = None
+
+
+_worker_replacer: Optional[MultiReplacer] = None
+
+
+def _init_worker(rules: Sequence[Rule]) -> None:
+    global _worker_replacer
+    _worker_replacer = MultiReplacer(rules)
+
+
+def replace_in_file(replacer: MultiReplacer, path: Path, dry_run: bool = False, snapshots: Optional[str] = None) -> FileResult:
+    try:
+        text = path.read_text(encoding="utf-8")
+        new_text, counts = replacer.sub(text)
+        change = None
+        if new_text != text and not dry_run:
+            change = snapshot_write(snapshots, path, new_text.encode("utf-8"))
+        return FileResult(str(path), dict(counts), bool(change and change.written), None, change)
+    except Exception as exc:
+        return FileResult(str(path), {}, False, f"{type(exc).__name__}: {exc}")
+
+
+def _replace_chunk(paths: List[str], dry_run: bool, snapshots: Optional[str]) -> List[FileResult]:
+    return [replace_in_file(_worker_replacer, Path(path), dry_run, snapshots) for path in paths]
+
+
+def replace_in_files(
+    paths: Sequence[Path],
+    rules: Sequence[Rule],
+    workers: Optional[int] = None,
+    chunk_size: int = 32,
+    dry_run: bool = False,
+    run: Optional[Run] = None,
+) -> List[FileResult]:
+    """Apply rules to every file in parallel; each worker compiles the scanner once.
+
+    Rules are pickled to the workers, so callable replacements must be module-level functions.
+    With a snapshot run, every file is snapshotted before it is written and recorded in the
+    run; the caller commits it.
+    """
+    MultiReplacer(rules)  # fail fast on bad rules before starting workers
+    names = [str(path) for path in paths]
+    chunks = [names[i : i + chunk_size] for i in range(0, len(names), chunk_size)]
+    snapshots = str(run.store.path) if run else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(list(rules),)) as pool:
+        results = [
+            result
+            for chunk in pool.map(_replace_chunk, chunks, [dry_run] * len(chunks), [snapshots] * len(chunks))
+            for result in chunk
+        ]
+    if run:
+        for result in results:
+            if result.change:
+                run.record(Path(result.path), result.change)
+    return results
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Replace many literals/regexes across the site in one scan per file")
+    parser.add_argument("--literal", nargs=2, action="append", default=[], metavar=("OLD", "NEW"), help="Literal replacement (repeatable)")
+    parser.add_argument("--regex", nargs=2, action="append", default=[], metavar=("PATTERN", "TEMPLATE"), help="Regex replacement (repeatable)")
+    parser.add_argument("-i", "--ignore-case", action="store_true", help="Match every rule case-insensitively")
+    parser.add_argument("-w", "--word", action="store_true", help="Literals must match whole words")
+    parser.add_argument("--root", type=Path, default=project_root, help="Site root")
+    parser.add_argument("--glob", action="append", default=None, help="File glob under --root (repeatable, default: **/*.html)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="Report matches without writing")
+    parser.add_argument("--no-snapshot", action="store_true", help="Do not snapshot files before writing them")
+    args = parser.parse_args()
+
+    rules = [literal(old, new, args.ignore_case, args.word) for old, new in args.literal]
+    rules += [regex(pattern, template, args.ignore_case) for pattern, template in args.regex]
+    if not rules:
+        parser.error("give at least one --literal or --regex")
+
+    paths = sorted({path for pattern in (args.glob or ["**/*.html"]) for path in args.root.glob(pattern) if path.is_file()})
+    run = None if args.dry_run or args.no_snapshot else SnapshotStore(default_store_path()).begin_run("multi_replace", args.root)
+    started = time.monotonic()
+    results = replace_in_files(paths, rules, workers=args.workers, dry_run=args.dry_run, run=run)
+    run_id = run.commit() if run else None
+    elapsed = time.monotonic() - started
+
+    totals: Counter = Counter()
+    for result in results:
+        if result.error:
+            print(f"❌ {result.path}: {result.error}")
+        elif result.counts:
+            totals.update(result.counts)
+            print(f"{'📝' if args.dry_run else '✅'} {Path(result.path).relative_to(args.root)} ({sum(result.counts.values())} changes)")
+
+    changed = sum(1 for result in results if result.counts and not result.error)
+    print(f"\n📄 Scanned {len(results)} files in {elapsed:.2f}s, {changed} {'would change' if args.dry_run else 'changed'}")
+    for rule in rules:
+        print(f"  • {rule.name}: {totals[rule.name]}")
+    if run_id:
+        print(f"↩️  Snapshot run {run_id} (undo: python tools/snapshot_store.py rollback {run_id})")
+
+
+if __name__ == "__main__":
+    main()
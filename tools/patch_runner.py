@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Single-pass HTML patch runner.
+Applies the page fixes from the fix_*/update_* scripts in one walk over the site:
+every page is read once, all transforms that cover it run in memory in registry
+order, and the page is written at most once (atomically, and only when its bytes
+changed). Pages are spread over a process pool, so re-applying the full set of
+fixes to thousands of pages costs one read per page instead of one per script.
+Every write is snapshotted first (see snapshot_store.py), so a run can be undone
+with `snapshot_store.py rollback <run id>`.
+
+The individual scripts still work on their own; each one now exposes the pure
+html -> html function used here. Facts repeated across pages (phone, rating,
+review count, form id) are not hard-coded in any transform: the site_facts
+transform renders them from the current site_facts.json.
+"""
+
+import argparse
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import beautify_location_pages
+import fix_hero_fullscreen_and_icons
+import fix_html_structure_and_icons
+import fix_icon_vertical_centering
+import fix_icons_and_mobile
+import fix_process_icons_mobile
+import update_footer_and_reviews
+import update_location_contact_forms
+import update_service_areas
+import update_visible_service_areas
+from site_facts import Fact, default_facts_path, load_facts, render_facts
+from snapshot_store import Change, SnapshotStore, default_store_path, snapshot_write
+
+
+class Transform(NamedTuple):
+    name: str
+    # Glob patterns relative to the project root ("*" does not cross "/").
+    scope: Tuple[str, ...]
+    # (html, path relative to the project root) -> html
+    apply: Callable[[str, str], str]
+
+
+def location_scope(slugs) -> Tuple[str, ...]:
+    return tuple(f"locations/{slug}/index.html" for slug in slugs)
+
+
+def location_slug(rel_path: str) -> str:
+    return rel_path.split("/")[1]
+
+
+SITE_SCOPE = (
+    "index.html",
+    "quote/index.html",
+    "thank-you.html",
+    "privacy-policy.html",
+    "terms.html",
+    "locations/*/index.html",
+    "landing/*/index.html",
+    "landing/generated/*/index.html",
+    "blog/*/index.html",
+)
+
+
+@lru_cache(maxsize=None)
+def current_facts() -> Tuple[Fact, ...]:
+    """site_facts.json as it is when the run starts, loaded once per worker process."""
+    return tuple(load_facts(default_facts_path(Path(__file__).resolve().parents[1])))
+
+TRANSFORMS: List[Transform] = [
+    Transform(
+        "beautify_location_pages",
+        location_scope(beautify_location_pages.LOCATIONS),
+        lambda html, rel_path: beautify_location_pages.beautify_html(html),
+    ),
+    Transform(
+        "fix_icons_and_mobile",
+        location_scope(fix_icons_and_mobile.LOCATIONS),
+        lambda html, rel_path: fix_icons_and_mobile.fix_icons_and_mobile_html(html),
+    ),
+    Transform(
+        "fix_icon_vertical_centering",
+        location_scope(fix_icon_vertical_centering.LOCATIONS),
+        lambda html, rel_path: fix_icon_vertical_centering.fix_vertical_centering_html(html),
+    ),
+    Transform(
+        "fix_hero_fullscreen_and_icons",
+        location_scope(fix_hero_fullscreen_and_icons.LOCATIONS),
+        lambda html, rel_path: fix_hero_fullscreen_and_icons.fix_hero_and_icons_html(html),
+    ),
+    Transform(
+        "fix_process_icons_mobile",
+        location_scope(fix_process_icons_mobile.LOCATIONS),
+        lambda html, rel_path: fix_process_icons_mobile.fix_process_icons_html(html),
+    ),
+    Transform(
+        "fix_html_structure_and_icons",
+        location_scope(fix_html_structure_and_icons.LOCATIONS),
+        lambda html, rel_path: fix_html_structure_and_icons.fix_html_structure_html(html),
+    ),
+    Transform(
+        "update_footer_and_reviews",
+        location_scope(update_footer_and_reviews.LOCATIONS),
+        lambda html, rel_path: update_footer_and_reviews.update_footer_and_reviews_html(
+            html, update_footer_and_reviews.LOCATIONS[location_slug(rel_path)]
+        ),
+    ),
+    Transform(
+        "update_location_contact_forms",
+        location_scope(update_location_contact_forms.LOCATIONS),
+        lambda html, rel_path: update_location_contact_forms.update_contact_form_html(
+            html, update_location_contact_forms.LOCATION_NAMES[location_slug(rel_path)]
+        ),
+    ),
+    Transform(
+        "update_service_areas",
+        ("landing/*/index.html",),
+        lambda html, rel_path: update_service_areas.update_service_areas_html(html),
+    ),
+    Transform(
+        "update_visible_service_areas",
+        ("landing/*/index.html",),
+        lambda html, rel_path: update_visible_service_areas.update_visible_service_areas_html(html),
+    ),
+    Transform(
+        "site_facts",
+        SITE_SCOPE,
+        lambda html, rel_path: render_facts(current_facts(), html),
+    ),
+]
+
+TRANSFORMS_BY_NAME: Dict[str, Transform] = {transform.name: transform for transform in TRANSFORMS}
+
+
+class PatchResult(NamedTuple):
+    path: str
+    changed_by: List[str]
+    written: bool
+    error: Optional[str]
+    change: Optional[Change] = None
+
+
+def in_scope(transform: Transform, rel_path: str) -> bool:
+    # fnmatch lets "*" match "/", so compare segment counts as well.
+    depth = rel_path.count("/")
+    return any(pattern.count("/") == depth and fnmatch(rel_path, pattern) for pattern in transform.scope)
+
+
+def collect_pages(root: Path, transforms: Sequence[Transform]) -> Dict[str, List[str]]:
+    """rel_path -> names of the transforms that cover it, in registry order."""
+    pages: Dict[str, List[str]] = {}
+    for transform in transforms:
+        for pattern in transform.scope:
+            for path in root.glob(pattern):
+                rel_path = path.relative_to(root).as_posix()
+                if path.is_file() and in_scope(transform, rel_path):
+                    names = pages.setdefault(rel_path, [])
+                    if transform.name not in names:
+                        names.append(transform.name)
+    return dict(sorted(pages.items()))
+
+
+def patch_page(root: Path, rel_path: str, names: Sequence[str], dry_run: bool, snapshots: Optional[str] = None) -> PatchResult:
+    path = root / rel_path
+    changed_by: List[str] = []
+    try:
+        original = path.read_text(encoding="utf-8")
+        html = original
+        for name in names:
+            patched = TRANSFORMS_BY_NAME[name].apply(html, rel_path)
+            if patched != html:
+                changed_by.append(name)
+                html = patched
+        change = None
+        if html != original and not dry_run:
+            change = snapshot_write(snapshots, path, html.encode("utf-8"))
+        return PatchResult(rel_path, changed_by, bool(change and change.written), None, change)
+    except Exception as exc:
+        return PatchResult(rel_path, changed_by, False, f"{type(exc).__name__}: {exc}")
+
+
+def patch_chunk(root: str, items: List[Tuple[str, List[str]]], dry_run: bool, snapshots: Optional[str]) -> List[PatchResult]:
+    return [patch_page(Path(root), rel_path, names, dry_run, snapshots) for rel_path, names in items]
+
+
+def select_transforms(only: Optional[List[str]], skip: Optional[List[str]]) -> List[Transform]:
+    unknown = sorted((set(only or []) | set(skip or [])) - set(TRANSFORMS_BY_NAME))
+    if unknown:
+        raise SystemExit(f"❌ Unknown transform(s): {', '.join(unknown)} (see --list)")
+    return [
+        transform
+        for transform in TRANSFORMS
+        if (not only or transform.name in only) and transform.name not in (skip or [])
+    ]
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Apply all HTML page fixes in a single pass")
+    parser.add_argument("--root", type=Path, default=project_root, help="Site root to patch")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Run only these transforms")
+    parser.add_argument("--skip", nargs="+", metavar="NAME", help="Skip these transforms")
+    parser.add_argument("--workers", type=int, default=None, help="Patch processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="Pages per worker task")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument("--list", action="store_true", help="List the transforms in the order they run")
+    parser.add_argument("--no-snapshot", action="store_true", help="Do not snapshot pages before writing them")
+    args = parser.parse_args()
+
+    if args.list:
+        for transform in TRANSFORMS:
+            print(f"{transform.name:32s} {', '.join(transform.scope[:3])}{' ...' if len(transform.scope) > 3 else ''}")
+        return
+
+    transforms = select_transforms(args.only, args.skip)
+    root = args.root.resolve()
+    print(f"🔧 Patching {root} with {len(transforms)} transforms{' (dry run)' if args.dry_run else ''}")
+
+    run = None if args.dry_run or args.no_snapshot else SnapshotStore(default_store_path()).begin_run("patch_runner", root)
+    snapshots = str(run.store.path) if run else None
+
+    started = time.monotonic()
+    items = list(collect_pages(root, transforms).items())
+    chunks = [items[i : i + args.chunk_size] for i in range(0, len(items), args.chunk_size)]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = [
+            result
+            for chunk in pool.map(
+                patch_chunk, [str(root)] * len(chunks), chunks, [args.dry_run] * len(chunks), [snapshots] * len(chunks)
+            )
+            for result in chunk
+        ]
+    run_id = None
+    if run:
+        for result in results:
+            if result.change:
+                run.record(root / result.path, result.change)
+        run_id = run.commit()
+    elapsed = time.monotonic() - started
+
+    per_transform = Counter(name for result in results for name in result.changed_by)
+    changed = [result for result in results if result.changed_by and not result.error]
+    errors = [result for result in results if result.error]
+
+    for result in changed:
+        print(f"{'📝' if args.dry_run else '✅'} {result.path} ({', '.join(result.changed_by)})")
+    for result in errors:
+        print(f"❌ {result.path}: {result.error}")
+
+    print(f"\n📄 Checked {len(results)} pages in {elapsed:.2f}s")
+    for transform in transforms:
+        print(f"  • {transform.name}: {per_transform[transform.name]} pages")
+    if args.dry_run:
+        print(f"📝 {len(changed)} pages would change")
+    else:
+        print(f"✅ {sum(1 for result in results if result.written)} pages written")
+    if run_id:
+        print(f"↩️  Snapshot run {run_id} (undo: python tools/snapshot_store.py rollback {run_id})")
+    if errors:
+        print(f"❌ {len(errors)} pages failed")
+
+
+if __name__ == "__main__":
+    main()
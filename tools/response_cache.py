@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for Grok chat-completion responses.
+Entries are keyed by a SHA-256 of the request (model, temperature, messages,
+response_format), so re-rendering pages from an unchanged prompt costs no API calls.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+def cache_key(payload: Dict) -> str:
+    """Hash the parts of a chat-completions payload that determine the response."""
+    material = {
+        "model": payload.get("model"),
+        "temperature": payload.get("temperature"),
+        "messages": payload.get("messages"),
+        "response_format": payload.get("response_format"),
+    }
+    canonical = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Directory of JSON responses named by request hash.
+
+    A file's mtime is its creation time and is never touched again; its atime is
+    set explicitly on every hit and records the last use. Entries created more
+    than max_age_days ago are dropped however often they are hit, and the least
+    recently used entries are evicted first once the entry or byte cap is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int = 5000,
+        max_bytes: int = 200 * 1024 * 1024,
+        max_age_days: float = 30.0,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> (created, last used, size in bytes)
+        self._index: Dict[str, tuple] = {}
+        self._total_bytes = 0
+        self._load_index()
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> None:
+        if not self.cache_dir.exists():
+            return
+        for entry in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            self._index[entry.stem] = (stat.st_mtime, max(stat.st_atime, stat.st_mtime), stat.st_size)
+            self._total_bytes += stat.st_size
+
+    def get(self, payload: Dict) -> Optional[Dict]:
+        key = cache_key(payload)
+        path = self._path_for(key)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None or time.time() - meta[0] > self.max_age:
+                self.misses += 1
+                return None
+        try:
+            with path.open(encoding="utf-8") as f:
+                content = json.load(f)["content"]
+        except (OSError, KeyError, json.JSONDecodeError):
+            with self._lock:
+                self.misses += 1
+                self._forget(key)
+            return None
+
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            meta = self._index.get(key)
+            if meta is not None:
+                self._index[key] = (meta[0], now, meta[2])
+        if meta is not None:
+            try:
+                os.utime(path, (now, meta[0]))
+            except OSError:
+                pass
+        return content
+
+    def put(self, payload: Dict, content: Dict) -> None:
+        key = cache_key(payload)
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"model": payload.get("model"), "created": time.time(), "content": content}
+        data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+        # Write to a temp file first so a crash never leaves a truncated entry behind.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(key)
+            created = path.stat().st_mtime
+            self._index[key] = (created, created, len(data))
+            self._total_bytes += len(data)
+            if len(self._index) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _forget(self, key: str) -> None:
+        meta = self._index.pop(key, None)
+        if meta is not None:
+            self._total_bytes -= meta[2]
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.max_age
+        expired = [key for key, (created, _, _) in self._index.items() if created < cutoff]
+        victims = set(expired)
+
+        if len(self._index) - len(victims) > self.max_entries or self._total_bytes > self.max_bytes:
+            # Evict down to 90% of the caps so the LRU sort is not repeated on every put.
+            target_entries = int(self.max_entries * 0.9)
+            target_bytes = int(self.max_bytes * 0.9)
+            remaining_entries = len(self._index) - len(victims)
+            remaining_bytes = self._total_bytes - sum(self._index[key][2] for key in victims)
+            for key, (_, _, size) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if remaining_entries <= target_entries and remaining_bytes <= target_bytes:
+                    break
+                if key in victims:
+                    continue
+                victims.add(key)
+                remaining_entries -= 1
+                remaining_bytes -= size
+
+        for key in victims:
+            self._forget(key)
+            try:
+                self._path_for(key).unlink()
+            except OSError:
+                pass
+        self.evictions += len(victims)
+
+    def prune(self) -> None:
+        """Apply the age, entry and size limits to the whole cache directory."""
+        with self._lock:
+            self._evict()
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evicted, "
+            f"{len(self._index)} entries ({self._total_bytes / 1024 / 1024:.1f} MB)"
+        )
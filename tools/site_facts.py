@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Site-wide facts registry.
+site_facts.json is the single source of truth for values repeated across the
+site: the phone number, the Google rating, the review count and the Formspree
+form. Each fact lists the contexts it appears in as regexes with a
+(?P<value>...) group. A context matches the fact's slot whatever value it
+currently holds, so stale copies are found as well as current ones. A context
+whose value group is {known} matches only this fact's own renderings (its value
+and the "previous" values `set` records), so the phone contexts can never pick
+up somebody else's number.
+
+An occurrence index (.cache/site_facts.sqlite) records where every fact occurs in
+every page. Changing a fact rewrites only the recorded spans that differ, in
+parallel, and re-scans each rewritten page. A verification pass then proves
+that no stale value remains. For "global" facts (phone, form) that includes
+searching the site index for any old rendering outside the known contexts.
+
+    python tools/site_facts.py report
+    python tools/site_facts.py set review_count 18
+    python tools/site_facts.py verify
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sqlite3
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from site_index import SiteIndex
+from snapshot_store import Change, Run, SnapshotStore, default_store_path, snapshot_write
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS occurrences (
+    path TEXT NOT NULL,
+    fact TEXT NOT NULL,
+    context INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS occurrences_path ON occurrences (path);
+CREATE INDEX IF NOT EXISTS occurrences_fact ON occurrences (fact, value);
+"""
+
+
+class FactError(ValueError):
+    pass
+
+
+class Context(NamedTuple):
+    pattern: "re.Pattern"
+    render: str
+
+
+class Fact(NamedTuple):
+    name: str
+    value: str
+    previous: Tuple[str, ...]
+    parts: Optional["re.Pattern"]
+    is_global: bool
+    contexts: List[Context]
+
+    def fields(self, value: Optional[str] = None) -> Dict[str, str]:
+        value = self.value if value is None else value
+        fields = {"value": value}
+        if self.parts:
+            match = self.parts.match(value)
+            if not match:
+                raise FactError(f"{self.name} value {value!r} does not match {self.parts.pattern!r}")
+            fields.update(match.groupdict())
+        return fields
+
+    def rendered(self, context: int, value: Optional[str] = None) -> str:
+        """The text this fact should show in the given context."""
+        return self.contexts[context].render.format(**self.fields(value))
+
+
+# (fact, context index, start, end, value); offsets are character offsets in the decoded page.
+Occurrence = Tuple[str, int, int, int, str]
+
+
+KNOWN = "{known}"
+
+
+def load_facts(path: Path) -> List[Fact]:
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    facts = []
+    for name, entry in spec.items():
+        value = str(entry["value"])
+        previous = tuple(str(old) for old in entry.get("previous", []) if str(old) != value)
+        parts = re.compile(entry["parts"]) if entry.get("parts") else None
+        renders = [context.get("render", "{value}") for context in entry["contexts"]]
+        # Renders only, to expand {known} before the patterns are compiled
+        shape = Fact(name, value, previous, parts, False, [Context(None, render) for render in renders])
+        contexts = []
+        for index, context in enumerate(entry["contexts"]):
+            source = context["pattern"]
+            if KNOWN in source:
+                known = sorted({shape.rendered(index, old) for old in (value, *previous)}, key=len, reverse=True)
+                source = source.replace(KNOWN, "|".join(re.escape(text) for text in known))
+            pattern = re.compile(source, re.IGNORECASE if context.get("ignore_case") else 0)
+            if "value" not in pattern.groupindex:
+                raise FactError(f"Context {context['pattern']!r} of {name} has no (?P<value>...) group")
+            contexts.append(Context(pattern, renders[index]))
+        fact = Fact(name, value, previous, parts, bool(entry.get("global")), contexts)
+        fact.fields()  # validates the value against parts
+        facts.append(fact)
+    return facts
+
+
+def spec_hash(path: Path) -> str:
+    """Hash of everything but the values: changing contexts invalidates the occurrence index."""
+    spec = json.loads(Path(path).read_text(encoding="utf-8"))
+    shape = {name: {key: value for key, value in entry.items() if key != "value"} for name, entry in spec.items()}
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def find_occurrences(facts: Sequence[Fact], text: str) -> List[Occurrence]:
+    found: List[Occurrence] = []
+    taken: List[Tuple[int, int]] = []
+    for fact in facts:
+        for index, context in enumerate(fact.contexts):
+            for match in context.pattern.finditer(text):
+                start, end = match.span("value")
+                # Two contexts may see the same span; the first fact/context listed owns it.
+                if any(start < other_end and other_start < end for other_start, other_end in taken):
+                    continue
+                taken.append((start, end))
+                found.append((fact.name, index, start, end, match.group("value")))
+    return sorted(found, key=lambda occurrence: occurrence[2])
+
+
+def render_facts(facts: Sequence[Fact], text: str) -> str:
+    """text with every occurrence showing its registry value; apply() without the index."""
+    by_name = {fact.name: fact for fact in facts}
+    for name, index, start, end, value in reversed(find_occurrences(facts, text)):
+        expected = by_name[name].rendered(index)
+        if value != expected:
+            text = text[:start] + expected + text[end:]
+    return text
+
+
+def default_facts_path(project_root: Path) -> Path:
+    return Path(project_root) / "site_facts.json"
+
+
+_worker_facts: List[Fact] = []
+
+
+def _init_worker(facts_path: str) -> None:
+    global _worker_facts
+    _worker_facts = load_facts(Path(facts_path))
+
+
+class PageScan(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    occurrences: List[Occurrence]
+    changed: bool
+    error: Optional[str]
+
+
+def _scan(root: Path, rel_path: str, changed: bool = False) -> PageScan:
+    path = root / rel_path
+    data = path.read_bytes()
+    stat = path.stat()
+    occurrences = find_occurrences(_worker_facts, data.decode("utf-8"))
+    return PageScan(rel_path, stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).hexdigest(), occurrences, changed, None)
+
+
+def _scan_chunk(root: str, paths: List[str]) -> List[PageScan]:
+    return [_scan(Path(root), rel_path) for rel_path in paths]
+
+
+def _rewrite_chunk(
+    root: str, jobs: List[Tuple[str, str, List[Tuple[int, int, str, str]]]], snapshots: Optional[str]
+) -> List[Tuple[PageScan, Optional[Change]]]:
+    """Rewrite recorded spans, then re-scan the page so the caller can verify and re-index it."""
+    results = []
+    for rel_path, expected_sha, spans in jobs:
+        path = Path(root) / rel_path
+        try:
+            data = path.read_bytes()
+            if hashlib.sha256(data).hexdigest() != expected_sha:
+                raise FactError("page changed since it was indexed; run scan and retry")
+            text = data.decode("utf-8")
+            for start, end, old, new in sorted(spans, reverse=True):
+                if text[start:end] != old:
+                    raise FactError(f"expected {old!r} at {start}, found {text[start:end]!r}")
+                text = text[:start] + new + text[end:]
+            change = snapshot_write(snapshots, path, text.encode("utf-8"))
+            results.append((_scan(Path(root), rel_path, changed=change.written), change))
+        except Exception as exc:
+            results.append((PageScan(rel_path, 0, 0, "", [], False, f"{type(exc).__name__}: {exc}"), None))
+    return results
+
+
+class FactIndex:
+    """Occurrence index of every fact in every page."""
+
+    def __init__(self, root: Path, facts_path: Path, path: Optional[Path] = None, workers: Optional[int] = None):
+        self.root = Path(root).resolve()
+        self.facts_path = Path(facts_path)
+        self.facts = load_facts(self.facts_path)
+        self.by_name = {fact.name: fact for fact in self.facts}
+        self.path = Path(path) if path else self.root / ".cache" / "site_facts.sqlite"
+        self.workers = workers
+        self.site_index = SiteIndex(self.root)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(str(self.facts_path),))
+
+    @staticmethod
+    def _chunks(items: List, size: int = 32) -> List[List]:
+        return [items[i : i + size] for i in range(0, len(items), size)]
+
+    def _store(self, db: sqlite3.Connection, scans: Sequence[PageScan]) -> None:
+        for scan in scans:
+            db.execute("DELETE FROM occurrences WHERE path = ?", (scan.path,))
+            db.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                (scan.path, scan.mtime_ns, scan.size, scan.sha256),
+            )
+            db.executemany(
+                "INSERT INTO occurrences (path, fact, context, start, end, value) VALUES (?, ?, ?, ?, ?, ?)",
+                ((scan.path, *occurrence) for occurrence in scan.occurrences),
+            )
+
+    def refresh(self) -> Dict[str, int]:
+        """Re-scan pages whose mtime/size changed (all pages when the contexts changed)."""
+        on_disk = self.site_index.site_files()
+        shape = spec_hash(self.facts_path)
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'spec'").fetchone()
+            if not row or row[0] != shape:
+                db.execute("DELETE FROM files")
+                db.execute("DELETE FROM occurrences")
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('spec', ?)", (shape,))
+            known = {path: (mtime_ns, size) for path, mtime_ns, size in db.execute("SELECT path, mtime_ns, size FROM files")}
+        stale = sorted(
+            rel for rel, stat in on_disk.items() if known.get(rel) != (stat.st_mtime_ns, stat.st_size)
+        )
+        removed = [rel for rel in known if rel not in on_disk]
+        chunks = self._chunks(stale)
+        scans: List[PageScan] = []
+        if chunks:
+            with self._pool() as pool:
+                scans = [scan for chunk in pool.map(_scan_chunk, [str(self.root)] * len(chunks), chunks) for scan in chunk]
+        with self._connect() as db:
+            for rel in removed:
+                db.execute("DELETE FROM occurrences WHERE path = ?", (rel,))
+                db.execute("DELETE FROM files WHERE path = ?", (rel,))
+            self._store(db, scans)
+        return {"scanned": len(scans), "removed": len(removed), "unchanged": len(on_disk) - len(stale)}
+
+    def occurrences(self) -> List[Tuple[str, str, int, int, int, str]]:
+        with self._connect() as db:
+            return db.execute("SELECT path, fact, context, start, end, value FROM occurrences ORDER BY path, start").fetchall()
+
+    def stale(self) -> List[Tuple[str, str, int, int, int, str, str]]:
+        """(path, fact, context, start, end, value, expected) for every occurrence not showing the registry value."""
+        expected = {
+            (fact.name, index): fact.rendered(index) for fact in self.facts for index in range(len(fact.contexts))
+        }
+        return [
+            (path, fact, context, start, end, value, expected[fact, context])
+            for path, fact, context, start, end, value in self.occurrences()
+            if value != expected[fact, context]
+        ]
+
+    def apply(self, dry_run: bool = False, run: Optional[Run] = None) -> Tuple[List[PageScan], List[str]]:
+        """Rewrite stale spans to the registry values. Returns (rewritten pages, errors).
+
+        Pages are snapshotted into run (if given) before they are rewritten; the caller commits it.
+        """
+        self.refresh()
+        by_page: Dict[str, List[Tuple[int, int, str, str]]] = defaultdict(list)
+        for path, _fact, _context, start, end, value, expected in self.stale():
+            by_page[path].append((start, end, value, expected))
+        if dry_run or not by_page:
+            return [], []
+        with self._connect() as db:
+            shas = dict(db.execute("SELECT path, sha256 FROM files"))
+        jobs = [(path, shas[path], spans) for path, spans in sorted(by_page.items())]
+        chunks = self._chunks(jobs, 16)
+        snapshots = str(run.store.path) if run else None
+        with self._pool() as pool:
+            rewritten = [
+                item
+                for chunk in pool.map(_rewrite_chunk, [str(self.root)] * len(chunks), chunks, [snapshots] * len(chunks))
+                for item in chunk
+            ]
+        results = [scan for scan, _change in rewritten]
+        if run:
+            for scan, change in rewritten:
+                if change:
+                    run.record(self.root / scan.path, change)
+        with self._connect() as db:
+            self._store(db, [scan for scan in results if not scan.error])
+        return [scan for scan in results if not scan.error], [f"{scan.path}: {scan.error}" for scan in results if scan.error]
+
+    def verify(self, old_values: Optional[Dict[str, Sequence[str]]] = None) -> List[str]:
+        """Problems left on the site; empty means every fact shows its registry value everywhere.
+
+        old_values defaults to old_values(): every value the registry or the index has seen.
+        """
+        if old_values is None:
+            old_values = self.old_values()
+        self.refresh()
+        problems = [
+            f"{path}:{start} {fact} shows {value!r}, expected {expected!r}"
+            for path, fact, _context, start, _end, value, expected in self.stale()
+        ]
+        # Global facts: no old rendering may survive anywhere, even outside the known contexts.
+        self.site_index.refresh()
+        for name, values in old_values.items():
+            fact = self.by_name[name]
+            if not fact.is_global:
+                continue
+            for value in values:
+                if value == fact.value:
+                    continue
+                for index in range(len(fact.contexts)):
+                    rendering = fact.rendered(index, value)
+                    for match in self.site_index.search(rendering):
+                        problems.append(f"{match.path}: {name} still has old value {rendering!r} at {match.offsets}")
+        return problems
+
+    def seen_values(self) -> Dict[str, List[str]]:
+        """Canonical values each fact currently has somewhere on the site."""
+        seen: Dict[str, set] = defaultdict(set)
+        for _path, name, context, _start, _end, value in self.occurrences():
+            fact = self.by_name[name]
+            canonical = self._canonical(fact, context, value)
+            if canonical is not None:
+                seen[name].add(canonical)
+        return {name: sorted(values) for name, values in seen.items()}
+
+    def old_values(self) -> Dict[str, List[str]]:
+        """Values each fact had before: the registry's "previous" list plus any value still on the site."""
+        old = {fact.name: set(fact.previous) for fact in self.facts}
+        for name, values in self.seen_values().items():
+            old[name].update(values)
+        return {name: sorted(values - {self.by_name[name].value}) for name, values in old.items() if values}
+
+    @staticmethod
+    def _canonical(fact: Fact, context: int, value: str) -> Optional[str]:
+        """Map a rendered value back to the fact's stored form (only needed for facts with parts)."""
+        if not fact.parts:
+            return value
+        for candidate in (value, "+1" + re.sub(r"\D", "", value)):
+            try:
+                if fact.rendered(context, candidate) == value:
+                    return candidate
+            except FactError:
+                continue
+        return None
+
+
+def set_fact(facts_path: Path, name: str, value: str) -> str:
+    """Change one value in the facts file; returns the previous value, which is kept in "previous"."""
+    spec = json.loads(facts_path.read_text(encoding="utf-8"))
+    if name not in spec:
+        raise FactError(f"Unknown fact {name!r}; known: {', '.join(spec)}")
+    previous = str(spec[name]["value"])
+    history = [old for old in spec[name].get("previous", []) if old not in (previous, value)]
+    spec[name]["value"] = value
+    if previous != value:
+        spec[name]["previous"] = [previous] + history
+    candidate = facts_path.with_name(f".{facts_path.name}.tmp")
+    candidate.write_text(json.dumps(spec, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    try:
+        load_facts(candidate)
+    except FactError:
+        candidate.unlink()
+        raise
+    candidate.replace(facts_path)
+    return previous
+
+
+def print_report(index: FactIndex) -> None:
+    occurrences = index.occurrences()
+    stale = {(path, start) for path, _fact, _context, start, _end, _value, _expected in index.stale()}
+    for fact in index.facts:
+        rows = [row for row in occurrences if row[1] == fact.name]
+        values = Counter(row[5] for row in rows)
+        stale_rows = [row for row in rows if (row[0], row[3]) in stale]
+        stale_pages = len({row[0] for row in stale_rows})
+        print(f"📌 {fact.name} = {fact.value!r}: {len(rows)} occurrences in {len({row[0] for row in rows})} pages")
+        for value, count in values.most_common():
+            print(f"    {count:6d}  {value}")
+        if stale_rows:
+            print(f"    ⚠️  {len(stale_rows)} stale in {stale_pages} pages")
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Single source of truth for facts repeated across the site")
+    parser.add_argument("--root", type=Path, default=project_root, help="Site root")
+    parser.add_argument("--facts", type=Path, default=default_facts_path(project_root), help="Facts file")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--no-snapshot", action="store_true", help="Do not snapshot pages before rewriting them")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("scan", help="Refresh the occurrence index")
+    sub.add_parser("report", help="Show where each fact occurs and which copies are stale")
+    apply = sub.add_parser("apply", help="Rewrite stale occurrences to the registry values, then verify")
+    apply.add_argument("--dry-run", action="store_true", help="Only list the spans that would change")
+    sub.add_parser("verify", help="Exit non-zero if any stale value remains")
+    set_parser = sub.add_parser("set", help="Change a fact in the facts file and apply it")
+    set_parser.add_argument("name")
+    set_parser.add_argument("value")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "set":
+            previous = set_fact(args.facts, args.name, args.value)
+            print(f"📝 {args.name}: {previous!r} -> {args.value!r}")
+            args.command = "apply"
+            args.dry_run = False
+        index = FactIndex(args.root, args.facts, workers=args.workers)
+    except FactError as exc:
+        print(f"❌ {exc}")
+        sys.exit(2)
+
+    started = time.monotonic()
+    if args.command == "scan":
+        stats = index.refresh()
+        print(f"📚 Scanned {stats['scanned']} pages ({stats['unchanged']} unchanged, {stats['removed']} removed) in {time.monotonic() - started:.2f}s")
+        return
+    if args.command == "report":
+        index.refresh()
+        print_report(index)
+        return
+    if args.command == "verify":
+        problems = index.verify()
+        for problem in problems[:50]:
+            print(f"❌ {problem}")
+        if problems:
+            print(f"❌ {len(problems)} stale occurrences")
+            sys.exit(1)
+        print("✅ Every fact shows its registry value everywhere")
+        return
+
+    # apply
+    index.refresh()
+    old_values = index.old_values()
+    if args.dry_run:
+        stale = index.stale()
+        for path, fact, _context, start, _end, value, expected in stale:
+            print(f"📝 {path}:{start} {fact} {value!r} -> {expected!r}")
+        print(f"📝 {len(stale)} spans in {len({row[0] for row in stale})} pages would change")
+        return
+    run = None if args.no_snapshot else SnapshotStore(default_store_path()).begin_run("site_facts", index.root)
+    rewritten, errors = index.apply(run=run)
+    run_id = run.commit() if run else None
+    for error in errors:
+        print(f"❌ {error}")
+    print(f"✅ Rewrote {sum(1 for scan in rewritten if scan.changed)} pages in {time.monotonic() - started:.2f}s")
+    if run_id:
+        print(f"↩️  Snapshot run {run_id} (undo: python tools/snapshot_store.py rollback {run_id})")
+    problems = index.verify(old_values)
+    for problem in problems[:50]:
+        print(f"❌ {problem}")
+    if problems or errors:
+        print(f"❌ Verification failed: {len(problems)} stale occurrences")
+        sys.exit(1)
+    print("✅ Verified: no stale values remain")
+
+
+if __name__ == "__main__":
+    main()
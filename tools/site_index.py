@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Persistent trigram index over the site's HTML.
+Maps every 3-byte sequence (ASCII lower-cased) to a bitmap of the pages
+containing it, in one SQLite file, so "which pages contain X" is an AND of a
+few bitmaps and only the candidate pages are opened to confirm the match and
+report byte offsets. The index is refreshed incrementally: pages whose mtime and size are
+unchanged are not read, and pages that were touched but hash the same are not
+re-indexed.
+
+    python tools/site_index.py search '"areaServed":["Fulton MD"]'
+    python tools/site_index.py search -i --regex 'reviewCount"\\s*:\\s*"?15\\b' --files-only
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover - older Pythons
+    import sre_parse
+
+DEFAULT_GLOBS = ("**/*.html",)
+SKIP_DIRS = {".git", ".cache", "node_modules", "__pycache__"}
+
+# files.grams keeps each page's own trigram set, so a re-indexed page only flips
+# the bits of trigrams it gained or lost. File ids are kept dense (freed ids are
+# reused) because they are bit positions.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    grams BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    tri INTEGER PRIMARY KEY,
+    files BLOB NOT NULL
+);
+"""
+
+
+class Match(NamedTuple):
+    path: str
+    offsets: List[int]
+
+
+def trigrams(data: bytes) -> Set[int]:
+    """Distinct trigrams of data, ASCII case-folded, packed into 24-bit ints."""
+    lowered = data.lower()
+    return {a << 16 | b << 8 | c for a, b, c in set(zip(lowered, lowered[1:], lowered[2:]))}
+
+
+def pack_grams(grams: Iterable[int]) -> bytes:
+    return array("I", sorted(grams)).tobytes()
+
+
+def unpack_grams(blob: bytes) -> Set[int]:
+    grams = array("I")
+    grams.frombytes(blob)
+    return set(grams)
+
+
+def bitmap_bytes(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def bitmap_int(blob: bytes) -> int:
+    return int.from_bytes(blob, "little")
+
+
+def literal_trigrams(text: str) -> Set[int]:
+    return trigrams(text.encode("utf-8"))
+
+
+def required_literals(pattern: str) -> List[str]:
+    """Literal runs (3+ chars) that every match of pattern must contain.
+
+    Conservative: only runs of plain literals at the top level of the pattern
+    (or inside non-repeated groups) count; anything it cannot reason about
+    just ends the current run.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    runs: List[str] = []
+    current: List[str] = []
+
+    def flush() -> None:
+        if len(current) >= 3:
+            runs.append("".join(current))
+        current.clear()
+
+    def walk(items) -> None:
+        for op, arg in items:
+            name = str(op)
+            if name == "LITERAL":
+                current.append(chr(arg))
+            elif name == "SUBPATTERN":
+                walk(arg[-1])
+            elif name in ("AT", "ASSERT", "ASSERT_NOT"):
+                # Zero-width; a lookaround's own content is not part of the match.
+                flush()
+            elif name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT") and arg[0] >= 1:
+                # The item occurs at least once, but what follows it is not adjacent.
+                flush()
+                walk(arg[2])
+                flush()
+            else:
+                flush()
+
+    walk(parsed)
+    flush()
+    return runs
+
+
+def _scan_file(args: Tuple[str, str]) -> Tuple[str, int, int, str, bytes]:
+    root, rel_path = args
+    path = Path(root) / rel_path
+    stat = path.stat()
+    data = path.read_bytes()
+    return rel_path, stat.st_mtime_ns, stat.st_size, hashlib.sha256(data).hexdigest(), pack_grams(trigrams(data))
+
+
+class SiteIndex:
+    """Trigram index of the files under root matching globs."""
+
+    def __init__(self, root: Path, path: Optional[Path] = None, globs: Sequence[str] = DEFAULT_GLOBS):
+        self.root = Path(root).resolve()
+        self.path = Path(path) if path else self.root / ".cache" / "site_index.sqlite"
+        self.globs = tuple(globs)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def site_files(self) -> Dict[str, os.stat_result]:
+        files: Dict[str, os.stat_result] = {}
+        for pattern in self.globs:
+            for path in self.root.glob(pattern):
+                rel = path.relative_to(self.root)
+                if SKIP_DIRS.intersection(rel.parts[:-1]) or not path.is_file():
+                    continue
+                files[rel.as_posix()] = path.stat()
+        return files
+
+    def refresh(self, workers: Optional[int] = None) -> Dict[str, int]:
+        """Bring the index up to date with the tree; returns counts of what changed."""
+        on_disk = self.site_files()
+        with self._connect() as db:
+            known = {
+                path: (file_id, mtime_ns, size, sha)
+                for file_id, path, mtime_ns, size, sha in db.execute("SELECT id, path, mtime_ns, size, sha256 FROM files")
+            }
+        stats = {"added": 0, "updated": 0, "touched": 0, "removed": 0, "unchanged": 0}
+        stale = [
+            rel
+            for rel, stat in on_disk.items()
+            if rel not in known or known[rel][1] != stat.st_mtime_ns or known[rel][2] != stat.st_size
+        ]
+        stats["unchanged"] = len(on_disk) - len(stale)
+        removed = [rel for rel in known if rel not in on_disk]
+        if not stale and not removed:
+            return stats
+
+        jobs = [(str(self.root), rel) for rel in stale]
+        if len(jobs) > 64 and (workers is None or workers > 1) and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                scanned = list(pool.map(_scan_file, jobs, chunksize=16))
+        else:
+            scanned = [_scan_file(job) for job in jobs]
+
+        # tri -> bits to set / clear, accumulated over every changed page.
+        set_bits: Dict[int, int] = {}
+        clear_bits: Dict[int, int] = {}
+
+        def flip(grams: Iterable[int], file_id: int, target: Dict[int, int]) -> None:
+            bit = 1 << file_id
+            for tri in grams:
+                target[tri] = target.get(tri, 0) | bit
+
+        with self._connect() as db:
+            for rel in removed:
+                file_id = known[rel][0]
+                (blob,) = db.execute("SELECT grams FROM files WHERE id = ?", (file_id,)).fetchone()
+                flip(unpack_grams(blob), file_id, clear_bits)
+                db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                stats["removed"] += 1
+
+            # Ids freed above are not reused in this pass: their clear bits are still pending.
+            used = {file_id for (file_id,) in db.execute("SELECT id FROM files")}
+            used.update(known[rel][0] for rel in removed)
+            free_ids = (file_id for file_id in range(len(used) + len(scanned) + 1) if file_id not in used)
+            for rel, mtime_ns, size, sha, blob in scanned:
+                if rel in known and known[rel][3] == sha:
+                    # Touched but identical: keep the postings, remember the new stat.
+                    db.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (mtime_ns, size, known[rel][0]))
+                    stats["touched"] += 1
+                    continue
+                grams = unpack_grams(blob)
+                if rel in known:
+                    file_id = known[rel][0]
+                    (old_blob,) = db.execute("SELECT grams FROM files WHERE id = ?", (file_id,)).fetchone()
+                    old = unpack_grams(old_blob)
+                    flip(grams - old, file_id, set_bits)
+                    flip(old - grams, file_id, clear_bits)
+                    db.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ?, sha256 = ?, grams = ? WHERE id = ?",
+                        (mtime_ns, size, sha, blob, file_id),
+                    )
+                    stats["updated"] += 1
+                else:
+                    file_id = next(free_ids)
+                    flip(grams, file_id, set_bits)
+                    db.execute(
+                        "INSERT INTO files (id, path, mtime_ns, size, sha256, grams) VALUES (?, ?, ?, ?, ?, ?)",
+                        (file_id, rel, mtime_ns, size, sha, blob),
+                    )
+                    stats["added"] += 1
+
+            touched = sorted(set(set_bits) | set(clear_bits))
+            current = self._bitmaps(db, touched)
+            rows = []
+            for tri in touched:
+                bits = (current.get(tri, 0) | set_bits.get(tri, 0)) & ~clear_bits.get(tri, 0)
+                rows.append((tri, bitmap_bytes(bits)))
+            db.executemany("INSERT OR REPLACE INTO postings (tri, files) VALUES (?, ?)", rows)
+            db.execute("DELETE FROM postings WHERE files = x''")
+        return stats
+
+    @staticmethod
+    def _bitmaps(db: sqlite3.Connection, grams: Sequence[int]) -> Dict[int, int]:
+        bitmaps: Dict[int, int] = {}
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(grams), 900):
+            batch = grams[start : start + 900]
+            placeholders = ",".join("?" * len(batch))
+            for tri, blob in db.execute(f"SELECT tri, files FROM postings WHERE tri IN ({placeholders})", batch):
+                bitmaps[tri] = bitmap_int(blob)
+        return bitmaps
+
+    def all_files(self) -> List[str]:
+        with self._connect() as db:
+            return [path for (path,) in db.execute("SELECT path FROM files ORDER BY path")]
+
+    def candidates(self, literal: str) -> List[str]:
+        """Indexed files that may contain literal (case-insensitively); short literals match every file."""
+        grams = sorted(literal_trigrams(literal))
+        if not grams:
+            return self.all_files()
+        with self._connect() as db:
+            bitmaps = self._bitmaps(db, grams)
+            if len(bitmaps) < len(grams):
+                return []
+            bits = -1
+            for value in bitmaps.values():
+                bits &= value
+            if not bits:
+                return []
+            paths = db.execute("SELECT id, path FROM files ORDER BY path").fetchall()
+        return [path for file_id, path in paths if bits >> file_id & 1]
+
+    def regex_candidates(self, pattern: str) -> List[str]:
+        """Indexed files that may match pattern, narrowed by the literals every match must contain."""
+        result: Optional[Set[str]] = None
+        for run in required_literals(pattern):
+            found = set(self.candidates(run))
+            result = found if result is None else result & found
+        return sorted(result) if result is not None else self.all_files()
+
+    def candidates_any(self, literals: Iterable[str] = (), patterns: Iterable[str] = ()) -> List[str]:
+        """Files that may contain any of the literals or match any of the regex patterns."""
+        found: Set[str] = set()
+        for literal in literals:
+            found.update(self.candidates(literal))
+        for pattern in patterns:
+            found.update(self.regex_candidates(pattern))
+        return sorted(found)
+
+    def search(self, literal: str, ignore_case: bool = False) -> List[Match]:
+        """Files containing literal, with the byte offset of every occurrence."""
+        needle = re.compile(re.escape(literal.encode("utf-8")), re.IGNORECASE if ignore_case else 0)
+        return self._confirm(self.candidates(literal), needle)
+
+    def search_regex(self, pattern: str, ignore_case: bool = False) -> List[Match]:
+        compiled = re.compile(pattern.encode("utf-8"), re.IGNORECASE if ignore_case else 0)
+        return self._confirm(self.regex_candidates(pattern), compiled)
+
+    def _confirm(self, paths: List[str], compiled: "re.Pattern") -> List[Match]:
+        matches = []
+        for rel in paths:
+            try:
+                data = (self.root / rel).read_bytes()
+            except OSError:
+                continue
+            offsets = [match.start() for match in compiled.finditer(data)]
+            if offsets:
+                matches.append(Match(rel, offsets))
+        return matches
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as db:
+            files = db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+            grams = db.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        return {"files": files, "trigrams": grams, "bytes": self.path.stat().st_size}
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Trigram index of the site's HTML")
+    parser.add_argument("--root", type=Path, default=project_root, help="Site root")
+    parser.add_argument("--index", type=Path, default=None, help="Index file (default: <root>/.cache/site_index.sqlite)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("refresh", help="Update the index from the tree")
+    sub.add_parser("stats", help="Show index size")
+    search = sub.add_parser("search", help="List files (and byte offsets) matching a literal or regex")
+    search.add_argument("query")
+    search.add_argument("--regex", action="store_true", help="Treat query as a Python regex")
+    search.add_argument("-i", "--ignore-case", action="store_true", help="Case-insensitive match")
+    search.add_argument("-l", "--files-only", action="store_true", help="Print file names only")
+    search.add_argument("--no-refresh", action="store_true", help="Trust the index without checking file mtimes")
+    args = parser.parse_args()
+
+    index = SiteIndex(args.root, args.index)
+    if args.command == "stats":
+        stats = index.stats()
+        print(f"📚 {stats['files']} files, {stats['trigrams']} distinct trigrams, {stats['bytes'] / 1e6:.1f} MB")
+        return
+
+    if args.command == "refresh" or not args.no_refresh:
+        started = time.monotonic()
+        stats = index.refresh()
+        if args.command == "refresh":
+            print(
+                f"📚 Index refreshed in {time.monotonic() - started:.2f}s: {stats['added']} added, "
+                f"{stats['updated']} updated, {stats['touched']} touched, {stats['removed']} removed, "
+                f"{stats['unchanged']} unchanged"
+            )
+            return
+
+    started = time.monotonic()
+    if args.regex:
+        matches = index.search_regex(args.query, args.ignore_case)
+    else:
+        matches = index.search(args.query, args.ignore_case)
+    elapsed = time.monotonic() - started
+    for match in matches:
+        if args.files_only:
+            print(match.path)
+        else:
+            for offset in match.offsets:
+                print(f"{match.path}:{offset}")
+    print(f"🔎 {sum(len(match.offsets) for match in matches)} matches in {len(matches)} files ({elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Persistent URL manifest for the sitemap builders.
+Maps every sitemap URL to its file's stat, a fingerprint of the page's meaningful
+content and the date that fingerprint last changed. Builders ask the manifest for
+a URL's lastmod: files whose size and mtime are unchanged are not even read, and
+a file that was rewritten without a real change (beautify runs, copytree resetting
+mtimes, a patch that reformats whitespace) keeps its old date. Only a content
+change moves lastmod, so a rebuild no longer tells crawlers every page changed.
+
+When a history callable is given (git_lastmod.resolve_lastmods), pages the
+manifest has never seen (fresh clone, CI, new cache) take the newer of the
+lastmod already published in sitemap.xml and the date of their last commit, so
+a commit that changed a published page moves its date even without a cache.
+Changed pages take their commit date too. Without history, or for pages with
+uncommitted edits, new pages keep the published date and changed ones get today.
+History is only read once a page needs a date, so a no-op run never touches git.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+from build_manifest import write_bytes_if_changed
+from sitemap_shards import read_sitemap
+
+COMMENT_RE = re.compile(rb"<!--.*?-->", re.S)
+WHITESPACE_RE = re.compile(rb"\s+")
+
+
+def content_fingerprint(data: bytes) -> str:
+    """SHA-256 of the page with comments dropped and whitespace runs collapsed."""
+    normalized = WHITESPACE_RE.sub(b" ", COMMENT_RE.sub(b"", data)).strip()
+    return hashlib.sha256(normalized).hexdigest()
+
+
+def read_published_lastmods(sitemap_path: Path) -> Dict[str, str]:
+    """url -> lastmod from an existing sitemap (or sitemap index and its shards next to it)."""
+    return {entry["url"]: entry["lastmod"] for entry in read_sitemap(sitemap_path) if entry["lastmod"]}
+
+
+class UrlManifest:
+    """JSON file mapping url -> {"path", "size", "mtime_ns", "hash", "lastmod"}."""
+
+    def __init__(
+        self,
+        path: Path,
+        root: Path,
+        seed: Optional[Dict[str, str]] = None,
+        today: Optional[str] = None,
+        trust_stat: bool = True,
+        history: Optional[Callable[[], Dict[str, str]]] = None,
+    ):
+        self.path = Path(path)
+        self.root = Path(root).resolve()
+        self.seed = seed or {}
+        # False re-hashes every file even when its size and mtime match the manifest
+        self.trust_stat = trust_stat
+        self.today = today or date.today().isoformat()
+        self.history = history
+        self._history_dates: Optional[Dict[str, str]] = None
+        self.entries: Dict[str, Dict] = self._load()
+        self.seen = set()
+        self.stats: Counter = Counter()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open(encoding="utf-8") as f:
+                return json.load(f).get("urls", {})
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"⚠️  Ignoring unreadable sitemap manifest {self.path}: {exc}")
+            return {}
+
+    def _committed(self, rel_path: str) -> Optional[str]:
+        if self.history is None:
+            return None
+        if self._history_dates is None:
+            self._history_dates = self.history()
+        return self._history_dates.get(rel_path)
+
+    def lastmod(self, url: str, rel_path: str) -> str:
+        """Date the content behind url last changed, re-hashing its file only if the stat moved.
+
+        rel_path is the page's file relative to the root; raises FileNotFoundError if it is missing.
+        """
+        file = os.path.join(self.root, rel_path)
+        stat = os.stat(file)
+        entry = self.entries.get(url)
+        self.seen.add(url)
+        if self.trust_stat and entry and entry["path"] == rel_path and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            self.stats["unchanged"] += 1
+            return entry["lastmod"]
+
+        with open(file, "rb") as f:
+            digest = content_fingerprint(f.read())
+        if entry and entry["hash"] == digest:
+            self.stats["touched"] += 1
+            lastmod = entry["lastmod"]
+        elif entry:
+            self.stats["changed"] += 1
+            lastmod = self._committed(rel_path) or self.today
+        else:
+            self.stats["new"] += 1
+            # ISO dates compare correctly as strings
+            lastmod = max(filter(None, (self.seed.get(url), self._committed(rel_path))), default=self.today)
+        self.entries[url] = {
+            "path": rel_path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": digest,
+            "lastmod": lastmod,
+        }
+        self.dirty = True
+        return lastmod
+
+    def prune(self, keep: Optional[Iterable[str]] = None) -> int:
+        """Forget URLs not looked up this run (or not in keep); returns how many were dropped."""
+        keep = set(keep) if keep is not None else self.seen
+        gone = [url for url in self.entries if url not in keep]
+        for url in gone:
+            del self.entries[url]
+        self.stats["removed"] += len(gone)
+        self.dirty = self.dirty or bool(gone)
+        return len(gone)
+
+    def save(self) -> bool:
+        """Write the manifest if any entry changed; compact JSON keeps this on the C encoder."""
+        if not self.dirty and self.path.exists():
+            return False
+        payload = json.dumps({"version": 1, "urls": dict(sorted(self.entries.items()))}, separators=(",", ":"))
+        written, _ = write_bytes_if_changed(self.path, (payload + "\n").encode("utf-8"))
+        self.dirty = False
+        return written
+
+    def summary(self) -> str:
+        return ", ".join(f"{self.stats[key]} {key}" for key in ("unchanged", "touched", "changed", "new", "removed") if self.stats[key]) or "empty"
+
+
+def default_manifest_path(project_root: Path) -> Path:
+    return Path(project_root) / ".cache" / "sitemap_manifest.json"
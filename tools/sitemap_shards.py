@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Sharded sitemap output.
+Writes one sitemap per category (core, blog, locations, landing, generated) at
+the site root, split at the protocol limits (50,000 URLs or 50 MB uncompressed
+per file) and optionally gzipped, plus a sitemap.xml index that lists every
+shard with the newest lastmod of its URLs, so crawlers can skip shards whose
+date has not moved. Shards are written only when their bytes change; shards
+left over from an earlier run (different split or compression) are deleted.
+
+Both directions stream in constant memory: write_sitemaps() takes any iterable of
+entries and writes each <url> straight to a temp file for its shard, and
+read_sitemap() walks shards with iterparse, clearing elements as it goes.
+bench_sitemap.py measures both at 100k and 1M URLs.
+
+robots.txt is kept in step: its Sitemap: lines are replaced by one line for
+the index, and URLs it disallows are left out of the shards.
+"""
+
+import filecmp
+import gzip
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from build_manifest import write_bytes_if_changed
+
+BASE_URL = "https://grimetodime.com/"
+MAX_URLS = 50_000
+MAX_BYTES = 50 * 1024 * 1024
+
+# Page category (as produced by sitemap_sync.discover_pages) -> shard name,
+# in the order shards are listed in the index.
+SHARD_FOR_CATEGORY = {
+    "core": "core",
+    "blog": "blog",
+    "locations": "locations",
+    "landing_static": "landing",
+    "landing_generated": "generated",
+}
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+URL_FIELDS = ("lastmod", "changefreq", "priority")
+URL_TAG = f"{{{SITEMAP_NS}}}url"
+SITEMAP_TAG = f"{{{SITEMAP_NS}}}sitemap"
+LOC_TAG = f"{{{SITEMAP_NS}}}loc"
+FIELD_TAGS = tuple((field, f"{{{SITEMAP_NS}}}{field}") for field in URL_FIELDS)
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = XML_DECLARATION + '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+SHARD_FILE_RE = re.compile(r"^sitemap-[a-z0-9-]+\.xml(\.gz)?$")
+
+
+class Shard(NamedTuple):
+    file_name: str
+    urls: int
+    lastmod: str
+
+
+def render_url(page: Dict) -> str:
+    return (
+        "  <url>\n"
+        f"    <loc>{escape(page['url'])}</loc>\n"
+        f"    <lastmod>{page['lastmod']}</lastmod>\n"
+        f"    <changefreq>{page['changefreq']}</changefreq>\n"
+        f"    <priority>{page['priority']}</priority>\n"
+        "  </url>\n"
+    )
+
+
+class ShardStream:
+    """Writes one category's entries to temp files, rolling to a new part at the limits.
+
+    Parts are named only in finish(), once it is known whether the category needs
+    numbering. Entries must arrive sorted by URL.
+    """
+
+    def __init__(self, root: Path, name: str, gzip_output: bool, max_urls: int = MAX_URLS, max_bytes: int = MAX_BYTES):
+        self.root = root
+        self.name = name
+        self.gzip_output = gzip_output
+        self.max_urls = max_urls
+        self.limit = max_bytes - len(URLSET_OPEN) - len(URLSET_CLOSE)
+        self.parts: List[Tuple[Path, int, str]] = []
+        self.last_url = ""
+        self._raw: Optional[BinaryIO] = None
+        self._out: Optional[BinaryIO] = None
+
+    def add(self, page: Dict) -> None:
+        if page["url"] < self.last_url:
+            raise ValueError(f"{self.name} entries must be sorted by URL: {page['url']} after {self.last_url}")
+        self.last_url = page["url"]
+        entry = render_url(page).encode("utf-8")
+        if self._out is None or self._urls >= self.max_urls or self._size + len(entry) > self.limit:
+            self._roll()
+        self._out.write(entry)
+        self._urls += 1
+        self._size += len(entry)
+        self._lastmod = max(self._lastmod, page["lastmod"])
+
+    def _roll(self) -> None:
+        self._close_part()
+        tmp_file = self.root / f".sitemap-{self.name}.{len(self.parts) + 1}.{os.getpid()}.tmp"
+        self._raw = tmp_file.open("wb")
+        # filename="" and mtime=0 keep gzip output byte-stable, so unchanged shards are not rewritten
+        self._out = gzip.GzipFile(filename="", mode="wb", fileobj=self._raw, compresslevel=9, mtime=0) if self.gzip_output else self._raw
+        self._out.write(URLSET_OPEN.encode("utf-8"))
+        self.parts.append((tmp_file, 0, ""))
+        self._urls = self._size = 0
+        self._lastmod = ""
+
+    def _close_part(self) -> None:
+        if self._out is None:
+            return
+        self._out.write(URLSET_CLOSE.encode("utf-8"))
+        self._out.close()
+        self._raw.close()
+        self.parts[-1] = (self.parts[-1][0], self._urls, self._lastmod)
+        self._raw = self._out = None
+
+    def finish(self) -> List[Tuple[Path, str, int, str]]:
+        """Close the last part; returns (temp file, final file name, urls, lastmod) per part."""
+        self._close_part()
+        suffix = ".xml.gz" if self.gzip_output else ".xml"
+        return [
+            (tmp_file, f"sitemap-{self.name}{suffix}" if len(self.parts) == 1 else f"sitemap-{self.name}-{number}{suffix}", urls, lastmod)
+            for number, (tmp_file, urls, lastmod) in enumerate(self.parts, 1)
+        ]
+
+    def abort(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._raw.close()
+        for tmp_file, _, _ in self.parts:
+            tmp_file.unlink(missing_ok=True)
+
+
+def replace_if_changed(tmp_file: Path, target: Path) -> bool:
+    """Move tmp_file over target unless target already holds the same bytes; returns True if moved."""
+    try:
+        if target.stat().st_size == tmp_file.stat().st_size and filecmp.cmp(tmp_file, target, shallow=False):
+            tmp_file.unlink()
+            return False
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_file, target)
+    return True
+
+
+def render_index(shards: Sequence[Shard], base_url: str = BASE_URL) -> str:
+    lines = [XML_DECLARATION + '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
+    for shard in shards:
+        lines.append(
+            "  <sitemap>\n"
+            f"    <loc>{escape(base_url + shard.file_name)}</loc>\n"
+            f"    <lastmod>{shard.lastmod}</lastmod>\n"
+            "  </sitemap>\n"
+        )
+    lines.append("</sitemapindex>\n")
+    return "".join(lines)
+
+
+def read_sitemap(sitemap_path: Path) -> Iterator[Dict[str, str]]:
+    """Yield {"url", "lastmod", "changefreq", "priority"} for every published URL.
+
+    An index is followed into its shards, which are looked up next to it on disk.
+    Elements are cleared as soon as they are read, so memory stays flat however
+    large the shards are. Missing files yield nothing; a corrupt file stops early
+    with a warning.
+    """
+    sitemap_path = Path(sitemap_path)
+    try:
+        f = gzip.open(sitemap_path) if sitemap_path.suffix == ".gz" else sitemap_path.open("rb")
+    except OSError:
+        return
+    shards: List[str] = []
+    with f:
+        try:
+            events = ET.iterparse(f, events=("start", "end"))
+            _, root = next(events)
+            for event, elem in events:
+                if event != "end":
+                    continue
+                if elem.tag == URL_TAG:
+                    loc = elem.findtext(LOC_TAG)
+                    if loc:
+                        entry = {"url": loc.strip()}
+                        for field, tag in FIELD_TAGS:
+                            entry[field] = (elem.findtext(tag) or "").strip()
+                        yield entry
+                    root.clear()
+                elif elem.tag == SITEMAP_TAG:
+                    loc = elem.findtext(LOC_TAG)
+                    if loc:
+                        shards.append(loc.strip().rsplit("/", 1)[-1])
+                    root.clear()
+        except StopIteration:
+            return
+        except (OSError, EOFError, ET.ParseError) as exc:
+            print(f"⚠️  Stopped reading {sitemap_path.name}: {exc}")
+            return
+    for shard in shards:
+        yield from read_sitemap(sitemap_path.parent / shard)
+
+
+def index_uses_gzip(sitemap_path: Path) -> bool:
+    """Whether the published sitemap index points at gzipped shards."""
+    try:
+        return ".xml.gz</loc>" in Path(sitemap_path).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return False
+
+
+def robots_rules(robots_path: Path) -> List[Tuple[bool, int, "re.Pattern"]]:
+    """(allow, rule length, path pattern) rules of the "User-agent: *" groups in robots.txt."""
+    try:
+        lines = robots_path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    rules = []
+    agents: List[str] = []
+    in_rules = False
+    for line in lines:
+        field, _, value = line.split("#", 1)[0].partition(":")
+        field, value = field.strip().lower(), value.strip()
+        if field == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value)
+        elif field in ("allow", "disallow"):
+            in_rules = True
+            if "*" in agents and value:
+                pattern = re.escape(value).replace(r"\*", ".*")
+                if pattern.endswith(r"\$"):
+                    pattern = pattern[:-2] + "$"
+                rules.append((field == "allow", len(value), re.compile(pattern)))
+    return rules
+
+
+def robots_allows(robots_path: Path) -> Callable[[str], bool]:
+    """Predicate telling whether robots.txt lets every crawler fetch a URL.
+
+    Uses the longest-match rule crawlers apply (Allow wins ties); urllib.robotparser
+    takes the first match instead, which lets "Allow: /" shadow every Disallow.
+    """
+    # Longest rule first, Allow before Disallow, so the first match decides
+    rules = sorted(robots_rules(robots_path), key=lambda rule: (rule[1], rule[0]), reverse=True)
+
+    if not rules:
+        return lambda url: True
+
+    def allowed(url: str) -> bool:
+        # Path and query of an absolute URL; urlsplit() costs more than the matching itself
+        scheme_end = url.find("://")
+        start = url.find("/", scheme_end + 3) if scheme_end >= 0 else 0
+        path = url[start:].split("#", 1)[0] if start >= 0 else "/"
+        for allow, _length, pattern in rules:
+            if pattern.match(path):
+                return allow
+        return True
+
+    return allowed
+
+
+def sync_robots(robots_path: Path, index_url: str) -> bool:
+    """Point robots.txt at the sitemap index only; returns True if the file changed."""
+    try:
+        lines = robots_path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        lines = ["User-agent: *", "Allow: /"]
+    kept = [
+        line
+        for line in lines
+        if not line.lower().startswith("sitemap:") and not (line.startswith("#") and "sitemap" in line.lower())
+    ]
+    while kept and not kept[-1].strip():
+        kept.pop()
+    kept += ["", "# Sitemap index (maintained by tools/rebuild_sitemap.py)", f"Sitemap: {index_url}"]
+    written, _ = write_bytes_if_changed(robots_path, ("\n".join(kept) + "\n").encode("utf-8"))
+    return written
+
+
+def write_sitemaps(
+    pages: Iterable[Dict],
+    root: Path,
+    gzip_output: bool = False,
+    base_url: str = BASE_URL,
+    max_urls: int = MAX_URLS,
+    max_bytes: int = MAX_BYTES,
+) -> Dict[str, List[str]]:
+    """Stream entries into shards, then write the sitemap.xml index and robots.txt under root.
+
+    pages may be a generator; within each category it must be sorted by URL.
+    Returns {"written": [...], "unchanged": [...], "removed": [...], "excluded": [urls]}.
+    """
+    root = Path(root)
+    allowed = robots_allows(root / "robots.txt")
+    report: Dict[str, List[str]] = {"written": [], "unchanged": [], "removed": [], "excluded": []}
+    streams = {name: ShardStream(root, name, gzip_output, max_urls, max_bytes) for name in dict.fromkeys(SHARD_FOR_CATEGORY.values())}
+    try:
+        for page in pages:
+            if not allowed(page["url"]):
+                report["excluded"].append(page["url"])
+                continue
+            streams[SHARD_FOR_CATEGORY.get(page.get("category"), "core")].add(page)
+        parts = [part for stream in streams.values() for part in stream.finish()]
+    except BaseException:
+        for stream in streams.values():
+            stream.abort()
+        raise
+
+    shards = []
+    for tmp_file, file_name, urls, lastmod in parts:
+        written = replace_if_changed(tmp_file, root / file_name)
+        report["written" if written else "unchanged"].append(file_name)
+        shards.append(Shard(file_name, urls, lastmod))
+
+    current = {shard.file_name for shard in shards}
+    for stale in sorted(root.glob("sitemap-*.xml*")):
+        if SHARD_FILE_RE.match(stale.name) and stale.name not in current:
+            stale.unlink()
+            report["removed"].append(stale.name)
+
+    written, _ = write_bytes_if_changed(root / "sitemap.xml", render_index(shards, base_url).encode("utf-8"))
+    report["written" if written else "unchanged"].append("sitemap.xml")
+    if sync_robots(root / "robots.txt", base_url + "sitemap.xml"):
+        report["written"].append("robots.txt")
+    return report
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+One reconcile operation for the sitemap.
+Discovers the pages on disk, reads the entries already published in the sitemap
+index, and diffs the two URL sets: new pages are added, deleted pages removed,
+and pages whose lastmod (from the content-hash manifest), changefreq or priority
+moved are updated. Everything is then written in one pass through
+sitemap_shards.write_sitemaps, and nothing is written when the diff is empty.
+
+update_sitemap.py (after page generation) and rebuild_sitemap.py (full refresh)
+are thin wrappers over reconcile(); the only difference is that a full rebuild
+re-hashes every page instead of trusting unchanged file stats. Pages that
+changed or are not published yet are dated from git history (git_lastmod.py)
+rather than the wall clock, so a fresh clone or CI build gets real dates.
+
+    python tools/sitemap_sync.py             # incremental
+    python tools/sitemap_sync.py --full      # re-hash every page
+    python tools/sitemap_sync.py --dry-run   # show the diff only
+"""
+
+import argparse
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from generate_location_variants import CITIES
+from git_lastmod import GitUnavailable, resolve_lastmods
+from sitemap_manifest import UrlManifest, default_manifest_path
+from sitemap_shards import (
+    BASE_URL,
+    MAX_URLS,
+    URL_FIELDS,
+    index_uses_gzip,
+    read_sitemap,
+    robots_allows,
+    sync_robots,
+    write_sitemaps,
+)
+
+# Core pages: path under the root -> (changefreq, priority)
+CORE_PAGES = {
+    "": ("weekly", "1.0"),
+    "quote/": ("monthly", "0.9"),
+    "blog/": ("weekly", "0.8"),
+    "partners/": ("monthly", "0.6"),
+    "thank-you.html": ("yearly", "0.3"),
+    "privacy-policy.html": ("yearly", "0.4"),
+    "terms.html": ("yearly", "0.4"),
+}
+
+# Page directories: each <dir>/<slug>/index.html is a page -> (category, changefreq, priority).
+# landing/generated/ is where generate_landing_pages.py writes when pointed there.
+SECTIONS = {
+    "blog": ("blog", "monthly", "0.7"),
+    "locations": ("locations", "monthly", "0.7"),
+    "landing": ("landing_static", "monthly", "0.7"),
+    "landing/generated": ("landing_generated", "monthly", "0.7"),
+}
+
+CITY_SUFFIXES = tuple(f"-{city}" for city in CITIES)
+
+
+class PageFile(NamedTuple):
+    url: str
+    rel_path: str
+    category: str
+    changefreq: str
+    priority: str
+
+
+class SyncReport(NamedTuple):
+    added: List[str]
+    updated: List[str]
+    removed: List[str]
+    unchanged: int
+    excluded: List[str]
+    files: Dict[str, List[str]]
+    manifest: str
+    categories: Dict[str, int]
+
+
+def discover_pages(root: Path, base_url: str = BASE_URL) -> Dict[str, PageFile]:
+    """Every page the sitemap could list, by URL.
+
+    Directory entries are listed but index.html files are not stat'ed here; the
+    manifest lookup does that once per page and reports missing files.
+    """
+    pages: Dict[str, PageFile] = {}
+    for path, (changefreq, priority) in CORE_PAGES.items():
+        rel_path = path + "index.html" if not path or path.endswith("/") else path
+        pages[base_url + path] = PageFile(base_url + path, rel_path, "core", changefreq, priority)
+    for directory, (section, changefreq, priority) in SECTIONS.items():
+        try:
+            items = list(os.scandir(os.path.join(root, directory)))
+        except FileNotFoundError:
+            continue
+        for item in items:
+            if not item.is_dir() or (section == "landing_static" and item.name == "generated"):
+                continue
+            category = section
+            # Service x city variants from generate_location_variants.py
+            if section == "landing_static" and item.name.endswith(CITY_SUFFIXES):
+                category = "landing_generated"
+            url = f"{base_url}{directory}/{item.name}/"
+            pages[url] = PageFile(url, f"{directory}/{item.name}/index.html", category, changefreq, priority)
+    return pages
+
+
+def git_history(root: Path) -> Callable[[], Dict[str, str]]:
+    """Deferred commit-date lookup for UrlManifest; outside a usable checkout it dates nothing."""
+
+    def resolve() -> Dict[str, str]:
+        try:
+            return resolve_lastmods(root)
+        except GitUnavailable as exc:
+            print(f"⚠️  No git dates ({exc}); changed pages get today's date")
+            return {}
+
+    return resolve
+
+
+def reconcile(
+    root: Path,
+    full: bool = False,
+    gzip_output: Optional[bool] = None,
+    max_urls: int = MAX_URLS,
+    dry_run: bool = False,
+    base_url: str = BASE_URL,
+    use_git: bool = True,
+) -> SyncReport:
+    """Bring the sitemap index and shards in line with the pages on disk in one write.
+
+    gzip_output=None keeps the format the published index already uses.
+    use_git=False dates changed and unpublished pages with today instead of their last commit.
+    """
+    root = Path(root).resolve()
+    sitemap_path = root / "sitemap.xml"
+    if gzip_output is None:
+        gzip_output = index_uses_gzip(sitemap_path)
+    elif gzip_output != index_uses_gzip(sitemap_path):
+        full = True
+
+    published = {entry["url"]: entry for entry in read_sitemap(sitemap_path)}
+    allowed = robots_allows(root / "robots.txt")
+    manifest = UrlManifest(
+        default_manifest_path(root),
+        root,
+        seed={url: entry["lastmod"] for url, entry in published.items() if entry["lastmod"]},
+        trust_stat=not full,
+        history=git_history(root) if use_git else None,
+    )
+    entries = []
+    excluded = []
+    for url, page in sorted(discover_pages(root, base_url).items()):
+        if not allowed(url):
+            excluded.append(url)
+            continue
+        try:
+            lastmod = manifest.lastmod(url, page.rel_path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        entries.append(
+            {"url": url, "lastmod": lastmod, "changefreq": page.changefreq, "priority": page.priority, "category": page.category}
+        )
+    manifest.prune()
+
+    on_disk = {entry["url"] for entry in entries}
+    added = sorted(on_disk - published.keys())
+    removed = sorted(published.keys() - on_disk)
+    updated = [
+        entry["url"]
+        for entry in entries
+        if entry["url"] in published and any(entry[field] != published[entry["url"]][field] for field in URL_FIELDS)
+    ]
+
+    files: Dict[str, List[str]] = {"written": [], "unchanged": [], "removed": [], "excluded": []}
+    if not dry_run:
+        manifest.save()
+        if full or added or removed or updated:
+            files = write_sitemaps(entries, root, gzip_output=gzip_output, base_url=base_url, max_urls=max_urls)
+        elif sync_robots(root / "robots.txt", base_url + "sitemap.xml"):
+            files["written"].append("robots.txt")
+
+    return SyncReport(
+        added,
+        updated,
+        removed,
+        len(entries) - len(added) - len(updated),
+        excluded,
+        files,
+        manifest.summary(),
+        dict(Counter(entry["category"] for entry in entries)),
+    )
+
+
+def print_report(report: SyncReport, dry_run: bool = False, verbose: bool = True) -> None:
+    limit = None if verbose else 10
+    for label, icon, urls in (("added", "➕", report.added), ("updated", "🔄", report.updated), ("removed", "➖", report.removed)):
+        for url in urls[:limit]:
+            print(f"  {icon} {url}")
+        if limit is not None and len(urls) > limit:
+            print(f"  {icon} ... {len(urls) - limit} more {label}")
+    for url in report.excluded:
+        print(f"  🚫 {url} (disallowed by robots.txt)")
+    print(
+        f"{'📝' if dry_run else '✅'} Sitemap: {len(report.added)} added, {len(report.updated)} updated, "
+        f"{len(report.removed)} removed, {report.unchanged} unchanged{' (dry run)' if dry_run else ''}"
+    )
+    if report.files["written"] or report.files["removed"]:
+        print(f"📝 Wrote {', '.join(report.files['written']) or 'nothing'}")
+        if report.files["removed"]:
+            print(f"🗑️  Deleted {', '.join(report.files['removed'])}")
+    print(f"🧮 Manifest: {report.manifest}")
+    print("📊 URL breakdown: " + ", ".join(f"{category} {count}" for category, count in sorted(report.categories.items())))
+
+
+def main(full: bool = False) -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Reconcile the sitemap with the pages on disk")
+    parser.add_argument("--root", type=Path, default=project_root, help="Site root")
+    parser.add_argument("--full", action="store_true", default=full, help="Re-hash every page instead of trusting file stats")
+    gzip_group = parser.add_mutually_exclusive_group()
+    gzip_group.add_argument("--gzip", dest="gzip_output", action="store_true", default=None, help="Write gzipped shards")
+    gzip_group.add_argument("--no-gzip", dest="gzip_output", action="store_false", help="Write plain XML shards")
+    parser.add_argument("--max-urls", type=int, default=MAX_URLS, help="URLs per shard before it is split")
+    parser.add_argument("--dry-run", action="store_true", help="Show the diff without writing")
+    parser.add_argument("--no-git", dest="use_git", action="store_false", help="Date changed pages with today, not their last commit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="List at most 10 URLs per kind of change")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = reconcile(args.root, full=args.full, gzip_output=args.gzip_output, max_urls=args.max_urls, dry_run=args.dry_run, use_git=args.use_git)
+    print_report(report, dry_run=args.dry_run, verbose=not args.quiet)
+    print(f"⏱️  {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
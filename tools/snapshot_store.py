@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Content-addressed snapshot store for site edits.
+Before a patch runner overwrites a page it stores the page's current bytes here,
+zlib-compressed and keyed by their SHA-256, so identical content is kept once no
+matter how many pages or runs share it. Each run writes a small manifest listing
+path -> (hash before, hash after), and a whole run can be rolled back by its ID.
+Pages edited again since the run are reported as conflicts and left alone
+unless --force is given. A rollback is itself recorded as a run, so it can be
+undone too.
+
+    python tools/snapshot_store.py list
+    python tools/snapshot_store.py rollback 20261018-101500-3fa2
+    python tools/snapshot_store.py import-backups   # fold *.backup copies into the store
+"""
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from build_manifest import hash_bytes, write_bytes_if_changed
+
+
+class SnapshotError(RuntimeError):
+    pass
+
+
+class Change(NamedTuple):
+    """One file written by a run; before is None when the run created the file."""
+
+    written: bool
+    before: Optional[str]
+    after: Optional[str]
+
+
+class SnapshotStore:
+    """objects/<2>/<sha256>.z blobs plus runs/<run id>.json manifests."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.objects = self.path / "objects"
+        self.runs_dir = self.path / "runs"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.z"
+
+    def put(self, data: bytes) -> str:
+        """Store data once; returns its SHA-256. Safe to call from several processes."""
+        digest = hash_bytes(data)
+        target = self._object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            tmp_file.write_bytes(zlib.compress(data, 9))
+            os.replace(tmp_file, target)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        try:
+            data = zlib.decompress(self._object_path(digest).read_bytes())
+        except FileNotFoundError:
+            raise SnapshotError(f"Snapshot object {digest} is missing") from None
+        if hash_bytes(data) != digest:
+            raise SnapshotError(f"Snapshot object {digest} is corrupt")
+        return data
+
+    def has(self, digest: str) -> bool:
+        return self._object_path(digest).exists()
+
+    def begin_run(self, tool: str, root: Path) -> "Run":
+        return Run(self, tool, Path(root))
+
+    def save_run(self, manifest: Dict) -> None:
+        target = self.runs_dir / f"{manifest['id']}.json"
+        tmp_file = target.with_name(f".{target.name}.tmp")
+        tmp_file.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_file, target)
+
+    def load_run(self, run_id: str) -> Dict:
+        try:
+            return json.loads((self.runs_dir / f"{run_id}.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise SnapshotError(f"No run {run_id!r} (see: snapshot_store.py list)") from None
+
+    def runs(self) -> List[Dict]:
+        manifests = [json.loads(path.read_text(encoding="utf-8")) for path in self.runs_dir.glob("*.json")]
+        return sorted(manifests, key=lambda manifest: manifest["started"])
+
+    def rollback(self, run_id: str, force: bool = False, dry_run: bool = False) -> Tuple[List[str], List[str], Optional[str]]:
+        """Restore every file of a run to its pre-run content.
+
+        Returns (restored paths, conflicting paths, id of the run recording the rollback).
+        """
+        manifest = self.load_run(run_id)
+        root = Path(manifest["root"])
+        undo = self.begin_run(f"rollback {run_id}", root)
+        restored: List[str] = []
+        conflicts: List[str] = []
+        for rel_path, entry in sorted(manifest["files"].items()):
+            path = root / rel_path
+            current = hash_bytes(path.read_bytes()) if path.exists() else None
+            if current == entry["before"]:
+                continue
+            if current != entry["after"] and not force:
+                conflicts.append(rel_path)
+                continue
+            restored.append(rel_path)
+            if dry_run:
+                continue
+            if current is not None:
+                self.put(path.read_bytes())
+            if entry["before"] is None:
+                path.unlink()
+                undo.record(path, Change(True, current, None))
+            else:
+                change = snapshot_write(None, path, self.get(entry["before"]))
+                undo.record(path, Change(True, current, change.after))
+        return restored, conflicts, None if dry_run else undo.commit()
+
+    def gc(self, keep: int) -> Tuple[int, int, int]:
+        """Drop all but the newest keep runs and every object no remaining run needs.
+
+        Returns (runs removed, objects removed, bytes freed).
+        """
+        runs = self.runs()
+        dropped = runs[: max(0, len(runs) - keep)]
+        for manifest in dropped:
+            (self.runs_dir / f"{manifest['id']}.json").unlink()
+        needed = {
+            digest
+            for manifest in runs[len(dropped):]
+            for entry in manifest["files"].values()
+            for digest in (entry["before"], entry["after"])
+            if digest
+        }
+        removed = freed = 0
+        for blob in self.objects.glob("*/*.z"):
+            if blob.name[:-2] not in needed:
+                freed += blob.stat().st_size
+                blob.unlink()
+                removed += 1
+        return len(dropped), removed, freed
+
+    def disk_usage(self) -> Tuple[int, int]:
+        blobs = list(self.objects.glob("*/*.z"))
+        return len(blobs), sum(blob.stat().st_size for blob in blobs)
+
+
+class Run:
+    """Collects the files one invocation of a tool changed; commit() writes the manifest."""
+
+    def __init__(self, store: SnapshotStore, tool: str, root: Path):
+        self.store = store
+        self.tool = tool
+        self.root = root.resolve()
+        self.started = time.time()
+        self.id = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started)) + "-" + secrets.token_hex(2)
+        self.files: Dict[str, Dict[str, Optional[str]]] = {}
+
+    def record(self, path: Path, change: Change) -> None:
+        if not change.written:
+            return
+        rel_path = Path(path).resolve().relative_to(self.root).as_posix()
+        entry = self.files.setdefault(rel_path, {"before": change.before, "after": change.after})
+        # A file written twice in one run keeps its original "before".
+        entry["after"] = change.after
+
+    def commit(self) -> Optional[str]:
+        """Save the manifest; returns the run ID, or None when nothing was written."""
+        if not self.files:
+            return None
+        self.store.save_run(
+            {
+                "id": self.id,
+                "tool": self.tool,
+                "root": str(self.root),
+                "argv": sys.argv,
+                "started": self.started,
+                "finished": time.time(),
+                "files": self.files,
+            }
+        )
+        return self.id
+
+
+def default_store_path() -> Path:
+    return Path(__file__).resolve().parents[1] / ".cache" / "snapshots"
+
+
+def snapshot_write(store_path: Optional[Path], path: Path, data: bytes) -> Change:
+    """Write data to path atomically, first snapshotting the bytes it replaces.
+
+    Meant to run inside worker processes: objects are written straight into the
+    store, and the returned Change is handed back to the parent's Run.
+    """
+    path = Path(path)
+    try:
+        old = path.read_bytes()
+    except FileNotFoundError:
+        old = None
+    before = hash_bytes(old) if old is not None else None
+    after = hash_bytes(data)
+    if before == after:
+        return Change(False, before, after)
+    if store_path is not None:
+        store = SnapshotStore(store_path)
+        if old is not None:
+            store.put(old)
+        store.put(data)
+    written, _ = write_bytes_if_changed(path, data)
+    return Change(written, before, after)
+
+
+def import_backups(store: SnapshotStore, root: Path, keep: bool) -> Optional[str]:
+    """Record every <file>.backup as the "before" of <file> in one run, then delete the copies."""
+    run = store.begin_run("import-backups", root)
+    backups = sorted(path for path in root.rglob("*.backup") if ".git" not in path.parts and ".cache" not in path.parts)
+    for backup in backups:
+        original = backup.with_suffix("")
+        before = store.put(backup.read_bytes())
+        after = store.put(original.read_bytes()) if original.exists() else None
+        if after is None:
+            print(f"⚠️  {backup.relative_to(root)} has no current file; keeping it")
+            continue
+        run.record(original, Change(True, before, after))
+        print(f"📦 {backup.relative_to(root)} -> run {run.id}")
+        if not keep:
+            backup.unlink()
+    return run.commit()
+
+
+def main() -> None:
+    project_root = Path(__file__).resolve().parents[1]
+    parser = argparse.ArgumentParser(description="Snapshots of pages changed by the patch tools, with rollback")
+    parser.add_argument("--store", type=Path, default=default_store_path(), help="Snapshot store directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List recorded runs")
+    show = sub.add_parser("show", help="List the files a run changed")
+    show.add_argument("run_id")
+    rollback = sub.add_parser("rollback", help="Restore the files of a run to their pre-run content")
+    rollback.add_argument("run_id")
+    rollback.add_argument("--force", action="store_true", help="Also restore files edited again since the run")
+    rollback.add_argument("--dry-run", action="store_true", help="Only report what would be restored")
+    gc = sub.add_parser("gc", help="Forget old runs and delete unreferenced objects")
+    gc.add_argument("--keep", type=int, default=20, help="Runs to keep")
+    backups = sub.add_parser("import-backups", help="Move *.backup copies under --root into the store")
+    backups.add_argument("--root", type=Path, default=project_root, help="Tree to search for *.backup files")
+    backups.add_argument("--keep", action="store_true", help="Leave the .backup files in place")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.store)
+    try:
+        if args.command == "list":
+            objects, size = store.disk_usage()
+            for manifest in store.runs():
+                started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(manifest["started"]))
+                print(f"{manifest['id']}  {started}  {len(manifest['files']):5d} files  {manifest['tool']}")
+            print(f"📦 {objects} objects, {size / 1e6:.1f} MB compressed")
+        elif args.command == "show":
+            manifest = store.load_run(args.run_id)
+            print(f"{manifest['id']} by {manifest['tool']} in {manifest['root']}")
+            for rel_path, entry in sorted(manifest["files"].items()):
+                before = (entry["before"] or "(new file)")[:12]
+                after = (entry["after"] or "(deleted)")[:12]
+                print(f"  {before} -> {after}  {rel_path}")
+        elif args.command == "rollback":
+            started = time.monotonic()
+            restored, conflicts, undo_id = store.rollback(args.run_id, force=args.force, dry_run=args.dry_run)
+            for rel_path in conflicts:
+                print(f"⚠️  {rel_path} changed since the run; skipped (use --force to overwrite)")
+            verb = "Would restore" if args.dry_run else "Restored"
+            print(f"↩️  {verb} {len(restored)} files from run {args.run_id} in {time.monotonic() - started:.2f}s")
+            if undo_id:
+                print(f"   Undo this rollback with: python tools/snapshot_store.py rollback {undo_id}")
+        elif args.command == "gc":
+            runs, objects, freed = store.gc(args.keep)
+            print(f"🧹 Removed {runs} runs and {objects} objects ({freed / 1e6:.1f} MB)")
+        elif args.command == "import-backups":
+            run_id = import_backups(store, args.root.resolve(), args.keep)
+            print(f"✅ Imported into run {run_id}" if run_id else "ℹ️  No .backup files found")
+    except SnapshotError as exc:
+        print(f"❌ {exc}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 Remove Instagram icon and update testimonials with real reviews from quote page
 """
 
+import re
 from pathlib import Path
 
 LOCATIONS = {
@@ -72,17 +73,8 @@ LOCATIONS = {
     }
 }
 
-def update_location(slug, data):
-    """Remove Instagram and update testimonials"""
-    
-    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
-    
-    if not file_path.exists():
-        print(f"⚠️  Skipping {slug} - file not found")
-        return
-    
-    with open(file_path, 'r') as f:
-        html = f.read()
+def update_footer_and_reviews_html(html, data):
+    """Drop the placeholder Instagram link and swap in the location's real testimonial"""
     
     # Fix 1: Remove Instagram icon link
     # Find and remove the entire Instagram link
@@ -125,10 +117,25 @@ def update_location(slug, data):
 '''
     
     # Replace the testimonial section using regex to find it
-    import re
     pattern = r'    <section id="testimonial" class="testimonial-section">.*?</section>\n\n'
     html = re.sub(pattern, new_testimonial, html, flags=re.DOTALL)
     
+    return html
+
+def update_location(slug, data):
+    """Remove Instagram and update testimonials"""
+    
+    file_path = Path(f"/home/nar/Documents/sawyers/locations/{slug}/index.html")
+    
+    if not file_path.exists():
+        print(f"⚠️  Skipping {slug} - file not found")
+        return
+    
+    with open(file_path, 'r') as f:
+        html = f.read()
+    
+    html = update_footer_and_reviews_html(html, data)
+    
     print(f"✅ Updated {slug}")
     
     with open(file_path, 'w') as f:
@@ -5,6 +5,8 @@ Update all location pages with the new clean contact form from index.html
 
 from pathlib import Path
 
+from html_rewriter import rewrite_html
+
 LOCATIONS = [
     "annapolis-junction-md", "catonsville-md", "clarksville-md", "columbia-md",
     "elkridge-md", "ellicott-city-md", "laurel-md", "savage-md"
@@ -380,6 +382,25 @@ LOCATION_NAMES = {
     "savage-md": "Savage"
 }
 
+def has_new_contact_form(html):
+    return 'Ready to Get Started?' in html and 'cta-primary' in html
+
+def update_contact_form_html(html, location_name):
+    """Add the contact CSS and insert the new contact section before the footer"""
+    
+    if has_new_contact_form(html) or '<footer' not in html:
+        return html
+    
+    handlers = [
+        # Insert contact section before footer
+        ('footer', lambda el: el.before(f'{get_new_contact_html(location_name)}\n\n    ')),
+    ]
+    # Insert CSS before </head>
+    if NEW_CONTACT_CSS not in html:
+        handlers.append(('head', lambda el: el.append(f'{NEW_CONTACT_CSS}\n')))
+    
+    return rewrite_html(html, handlers)
+
 def update_location(slug):
     """Update contact section on a location page"""
     
@@ -393,33 +414,17 @@ def update_location(slug):
         html = f.read()
     
     # Check if already has new contact section
-    if 'Ready to Get Started?' in html and 'cta-primary' in html:
+    if has_new_contact_form(html):
         print(f"⏭️  Skipping {slug} - already has new contact form")
         return
     
-    location_name = LOCATION_NAMES[slug]
-    
-    # Insert CSS before </head>
-    if NEW_CONTACT_CSS not in html:
-        html = html.replace('</head>', f'{NEW_CONTACT_CSS}\n</head>')
-    
-    # Find and replace contact section
-    # Look for the contact section
-    import re
-    
-    # Pattern to match the old contact section (if it exists)
-    # We'll insert before the footer
-    if '<footer' in html:
-        new_contact_html = get_new_contact_html(location_name)
-        
-        # Insert contact section before footer
-        html = html.replace('<footer', f'{new_contact_html}\n\n    <footer')
-        
-        print(f"✅ Updated {slug}")
-    else:
+    if '<footer' not in html:
         print(f"⚠️  Could not find footer in {slug}")
         return
     
+    html = update_contact_form_html(html, LOCATION_NAMES[slug])
+    print(f"✅ Updated {slug}")
+    
     with open(file_path, 'w') as f:
         f.write(html)
 
@@ -1,14 +1,22 @@
 #!/usr/bin/env python3
 """
-Update all review counts from "15 reviews" to "16 reviews" across the entire website.
+Bump the review count across the entire website (the name is from the 15 -> 16 bump).
 Includes main pages, location pages, landing pages, and all generated SEO pages.
+--to is required; --from defaults to the review_count in site_facts.json, i.e. the
+count the site shows now. Every file is scanned once for all patterns, and the new
+count is written back to site_facts.json so the registry stays the source of truth.
+
+    python tools/update_reviews_to_16.py --to 18
 """
 
-import os
-import re
+import argparse
 from pathlib import Path
 from typing import List, Tuple
 
+from multi_replace import MultiReplacer, Rule, literal, regex, replace_in_file, replace_in_files
+from site_facts import FactError, default_facts_path, load_facts, set_fact
+from snapshot_store import SnapshotStore, default_store_path
+
 
 def find_html_files(project_root: Path) -> List[Path]:
     """Find all HTML files in the project."""
@@ -67,84 +75,89 @@ def find_html_files(project_root: Path) -> List[Path]:
     return html_files
 
 
-def update_reviews_in_file(file_path: Path) -> Tuple[bool, int]:
-    """Update review counts in a single file. Returns (was_updated, num_changes)."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        original_content = content
-        
-        # Update all variations of "15 reviews"
-        patterns_and_replacements = [
-            # Meta descriptions and SEO content
-            (r'\b15 reviews\b', '16 reviews'),
-            (r'\b15-review\b', '16-review'),
-            (r'\bfifteen reviews\b', 'sixteen reviews'),
-            (r'\bFifteen reviews\b', 'Sixteen reviews'),
-            
-            # JSON-LD and structured data
-            (r'"reviewCount": ?15\b', '"reviewCount": 16'),
-            (r'"reviewCount":"15"', '"reviewCount":"16"'),
-            
-            # Rating displays and badges
-            (r'15 5-star reviews', '16 5-star reviews'),
-            (r'15 five-star reviews', '16 five-star reviews'),
-            (r'Based on 15 reviews', 'Based on 16 reviews'),
-            (r'from 15 reviews', 'from 16 reviews'),
-            (r'\(15 reviews\)', '(16 reviews)'),
-            
-            # Open Graph and Twitter meta
-            (r'content="[^"]*15 reviews[^"]*"', lambda m: m.group(0).replace('15 reviews', '16 reviews')),
-            
-            # Any remaining instances
-            (r'15(?=\s+reviews)', '16'),
+NUMBER_WORDS = (
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen",
+    "nineteen", "twenty",
+)
+
+
+def review_count_rules(old: int, new: int) -> List[Rule]:
+    """Every way a review count appears on the site, as one multi_replace rule set."""
+    rules = [
+        # JSON-LD and structured data
+        # "reviewCount":15, "reviewCount": 15, "reviewCount":"15", "reviewCount": "15"
+        regex(rf'("reviewCount"\s*:\s*"?){old}\b', rf'\g<1>{new}', name="reviewCount"),
+        # Meta descriptions, Open Graph/Twitter meta, rating badges:
+        # "15 reviews", "(15 reviews)", "Based on 15 reviews", "15 5-star reviews", "15 five-star reviews"
+        regex(rf'\b{old}(?=\s+(?:5-star\s+|five-star\s+)?reviews\b)', str(new), ignore_case=True, name=f"{old} reviews"),
+        regex(rf'\b{old}(?=-review\b)', str(new), ignore_case=True, name=f"{old}-review"),
+    ]
+    if max(old, new) < len(NUMBER_WORDS):
+        old_word, new_word = NUMBER_WORDS[old], NUMBER_WORDS[new]
+        rules += [
+            literal(f"{old_word.capitalize()} reviews", f"{new_word.capitalize()} reviews", word=True),
+            literal(f"{old_word} reviews", f"{new_word} reviews", ignore_case=True, word=True),
         ]
-        
-        changes_made = 0
-        
-        for pattern, replacement in patterns_and_replacements:
-            if callable(replacement):
-                # For complex replacements like Open Graph
-                new_content, count = re.subn(pattern, replacement, content)
-            else:
-                new_content, count = re.subn(pattern, replacement, content, flags=re.IGNORECASE)
-            
-            if count > 0:
-                content = new_content
-                changes_made += count
-        
-        # Write back if changes were made
-        if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True, changes_made
-        
-        return False, 0
-        
-    except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+    return rules
+
+
+def current_review_count(facts_path: Path) -> int:
+    """The review count site_facts.json says the site shows."""
+    return int(next(fact.value for fact in load_facts(facts_path) if fact.name == "review_count"))
+
+
+def update_reviews_html(content: str, old: int, new: int) -> Tuple[str, int]:
+    """Apply every review count rule to content in one scan. Returns (new_content, num_changes)."""
+    return MultiReplacer(review_count_rules(old, new)).subn(content)
+
+
+def update_reviews_in_file(file_path: Path, old: int, new: int) -> Tuple[bool, int]:
+    """Update review counts in a single file. Returns (was_updated, num_changes)."""
+    result = replace_in_file(MultiReplacer(review_count_rules(old, new)), file_path)
+    if result.error:
+        print(f"❌ Error processing {file_path}: {result.error}")
         return False, 0
+    changes_made = sum(result.counts.values())
+    return changes_made > 0, changes_made
 
 
 def main():
     """Main execution function."""
-    print("🔄 Updating review counts from 15 to 16 across entire website")
+    project_root = Path(__file__).parent.parent
+    facts_path = default_facts_path(project_root)
+    parser = argparse.ArgumentParser(description="Bump the review count across the entire website")
+    parser.add_argument("--from", dest="old", type=int, default=None, help="Current review count (default: review_count in site_facts.json)")
+    parser.add_argument("--to", dest="new", type=int, required=True, help="New review count")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+    if args.old is None:
+        args.old = current_review_count(facts_path)
+    if args.old == args.new:
+        print(f"ℹ️  The site already shows {args.new} reviews")
+        return
+    
+    print(f"🔄 Updating review counts from {args.old} to {args.new} across entire website")
     print("=" * 65)
     
-    project_root = Path(__file__).parent.parent
     html_files = find_html_files(project_root)
     
     print(f"📁 Found {len(html_files)} HTML files to check")
     
     updated_files = []
     total_changes = 0
+    errors = 0
+    run = SnapshotStore(default_store_path()).begin_run("update_reviews_to_16", project_root)
     
-    for file_path in html_files:
-        was_updated, changes_made = update_reviews_in_file(file_path)
-        
-        if was_updated:
-            relative_path = file_path.relative_to(project_root)
+    # One scan per file, spread over all cores; every rewritten page is snapshotted first
+    for result in replace_in_files(html_files, review_count_rules(args.old, args.new), workers=args.workers, run=run):
+        if result.error:
+            print(f"❌ Error processing {result.path}: {result.error}")
+            errors += 1
+            continue
+        changes_made = sum(result.counts.values())
+        if changes_made:
+            relative_path = Path(result.path).relative_to(project_root)
             updated_files.append((relative_path, changes_made))
             total_changes += changes_made
             print(f"✅ {relative_path} - {changes_made} changes")
@@ -154,13 +167,24 @@ def main():
     print(f"  • Files checked: {len(html_files)}")
     print(f"  • Files updated: {len(updated_files)}")
     print(f"  • Total changes: {total_changes}")
+    run_id = run.commit()
+    if run_id:
+        print(f"  • Undo with: python tools/snapshot_store.py rollback {run_id}")
+    if errors:
+        print(f"  • site_facts.json left at {current_review_count(facts_path)}: {errors} files failed")
+    else:
+        try:
+            previous = set_fact(facts_path, "review_count", str(args.new))
+            print(f"  • site_facts.json review_count: {previous} -> {args.new}")
+        except FactError as exc:
+            print(f"❌ Could not update site_facts.json: {exc}")
     
     if updated_files:
         print(f"\n📈 Updated Files:")
         for file_path, changes in updated_files:
             print(f"  • {file_path} ({changes} changes)")
         
-        print(f"\n🚀 All review counts updated from 15 to 16!")
+        print(f"\n🚀 All review counts updated from {args.old} to {args.new}!")
         print(f"💡 Social proof increased across {len(updated_files)} pages")
         
         # Check a few categories
@@ -176,7 +200,7 @@ def main():
         print(f"  • Generated SEO pages: {len(generated_pages)}")
         
     else:
-        print("ℹ️  No files needed updating (already at 16 reviews or no review mentions found)")
+        print(f"ℹ️  No files needed updating (already at {args.new} reviews or no review mentions found)")
 
 
 if __name__ == "__main__":
@@ -4,10 +4,12 @@ Update all landing pages to include all 23 Howard County service areas
 in their JSON-LD structured data.
 """
 
-import os
 import re
+from fnmatch import fnmatch
 from pathlib import Path
 
+from site_index import SiteIndex
+
 # All 23 Howard County locations (with MD)
 ALL_LOCATIONS_WITH_MD = [
     "Annapolis Junction MD",
@@ -47,13 +49,29 @@ OLD_PATTERNS = [
     '"areaServed":["Ellicott City", "Columbia", "Elkridge", "Clarksville", "Laurel", "Savage", "Catonsville"]',
     
     # Pattern 3: Single city variant (created by generate_location_variants.py)
-    # Will match anything like: "areaServed":["Fulton MD"]
+    # Will match anything like: "areaServed":["Fulton MD"] (see SINGLE_CITY_PATTERN)
 ]
 
+SINGLE_CITY_PATTERN = r'"areaServed":\["[^"]+"\]'
+
 # New area served strings
 NEW_AREA_SERVED_WITH_MD = '"areaServed":' + str(ALL_LOCATIONS_WITH_MD).replace("'", '"')
 NEW_AREA_SERVED_NO_MD = '"areaServed":' + str(ALL_LOCATIONS_NO_MD).replace("'", '"')
 
+def update_service_areas_html(content):
+    """Return content with its areaServed list widened to all 23 service areas."""
+    # Replace pattern 1 (base pages with MD)
+    if OLD_PATTERNS[0] in content:
+        return content.replace(OLD_PATTERNS[0], NEW_AREA_SERVED_WITH_MD)
+    
+    # Replace pattern 2 (location pages without MD)
+    if OLD_PATTERNS[1] in content:
+        return content.replace(OLD_PATTERNS[1], NEW_AREA_SERVED_NO_MD)
+    
+    # Replace pattern 3 (single city variants) - use regex
+    # Match single city like: "areaServed":["Fulton MD"]
+    return re.sub(SINGLE_CITY_PATTERN, NEW_AREA_SERVED_NO_MD, content)
+
 def update_landing_page(file_path):
     """Update a single landing page with new service areas."""
     try:
@@ -61,21 +79,7 @@ def update_landing_page(file_path):
             content = f.read()
         
         original_content = content
-        
-        # Replace pattern 1 (base pages with MD)
-        if OLD_PATTERNS[0] in content:
-            content = content.replace(OLD_PATTERNS[0], NEW_AREA_SERVED_WITH_MD)
-        
-        # Replace pattern 2 (location pages without MD)
-        elif OLD_PATTERNS[1] in content:
-            content = content.replace(OLD_PATTERNS[1], NEW_AREA_SERVED_NO_MD)
-        
-        # Replace pattern 3 (single city variants) - use regex
-        else:
-            # Match single city like: "areaServed":["Fulton MD"]
-            pattern = r'"areaServed":\["[^"]+"\]'
-            if re.search(pattern, content):
-                content = re.sub(pattern, NEW_AREA_SERVED_NO_MD, content)
+        content = update_service_areas_html(content)
         
         # Check if anything changed
         if content != original_content:
@@ -101,10 +105,20 @@ def main():
         return
     
     updated_count = 0
-    skipped_count = 0
     
-    # Find all index.html files in landing directory
-    for index_file in landing_dir.glob("*/index.html"):
+    # Ask the site index which landing pages can contain an old pattern, and open only those
+    project_root = landing_dir.parent
+    index = SiteIndex(project_root)
+    index.refresh()
+    candidates = [
+        project_root / rel_path
+        for rel_path in index.candidates_any(OLD_PATTERNS, [SINGLE_CITY_PATTERN])
+        if fnmatch(rel_path, "landing/*/index.html") and rel_path.count("/") == 2
+    ]
+    skipped_count = len(list(landing_dir.glob("*/index.html"))) - len(candidates)
+    print(f"🔎 {len(candidates)} candidate pages from the site index")
+    
+    for index_file in candidates:
         if update_landing_page(index_file):
             updated_count += 1
             print(f"✅ Updated: {index_file.parent.name}")
@@ -4,9 +4,10 @@ Update the visible Service Areas section on all landing pages
 to show all 23 Howard County locations instead of just the original 7.
 """
 
-import re
 from pathlib import Path
 
+from html_rewriter import rewrite_html
+
 # All 23 Howard County locations with their slugs
 LOCATIONS = [
     ("Annapolis Junction", "annapolis-junction-md"),
@@ -34,31 +35,37 @@ LOCATIONS = [
     ("West Friendship", "west-friendship-md")
 ]
 
-# Old service areas HTML (original 7 cities)
-OLD_SERVICE_AREAS = '<div style="display:flex;flex-wrap:wrap;gap:.6rem;justify-content:center"><a class="pill chip" href="/locations/ellicott-city-md/">Ellicott City</a><a class="pill chip" href="/locations/columbia-md/">Columbia</a><a class="pill chip" href="/locations/elkridge-md/">Elkridge</a><a class="pill chip" href="/locations/clarksville-md/">Clarksville</a><a class="pill chip" href="/locations/laurel-md/">Laurel</a><a class="pill chip" href="/locations/savage-md/">Savage</a><a class="pill chip" href="/locations/catonsville-md/">Catonsville</a></div>'
+# The chip row under the "Service Areas" heading. Matched by structure rather than
+# by its exact markup, so reformatted pages (one chip per line) are updated too.
+# Pinned to the section container and the chip row's own gap so other flex rows
+# (footer columns, CTA groups) can never be rewritten.
+SERVICE_AREAS_SELECTOR = 'section.section > div.container > div[style*="flex-wrap:wrap"][style*="gap:.6rem"]'
 
 # Generate new service areas HTML with all 23 locations
 def generate_new_service_areas():
-    """Generate HTML for all 23 service areas."""
+    """Generate the chip links for all 23 service areas."""
     links = []
     for name, slug in LOCATIONS:
         links.append(f'<a class="pill chip" href="/locations/{slug}/">{name}</a>')
     
-    return '<div style="display:flex;flex-wrap:wrap;gap:.6rem;justify-content:center">' + ''.join(links) + '</div>'
+    return ''.join(links)
 
 NEW_SERVICE_AREAS = generate_new_service_areas()
 
+def update_visible_service_areas_html(content):
+    """Return content with the Service Areas chip row replaced by all 23 locations."""
+    return rewrite_html(content, [
+        (SERVICE_AREAS_SELECTOR, lambda el: el.set_inner_content(NEW_SERVICE_AREAS))
+    ])
+
 def update_landing_page(file_path):
     """Update a single landing page with new visible service areas."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # Check if it has the old service areas HTML
-        if OLD_SERVICE_AREAS in content:
-            # Replace with new
-            updated_content = content.replace(OLD_SERVICE_AREAS, NEW_SERVICE_AREAS)
-            
+        updated_content = update_visible_service_areas_html(content)
+        if updated_content != content:
             # Write back
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(updated_content)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+SQLite work queue shared by several landing page generator workers.
+Each slug is one row. Workers claim rows under a time-limited lease, renew their
+leases with a heartbeat while generating, and mark rows done or failed. Leases of
+workers that crash or stall expire and are reclaimed by the next claim, so a
+multi-thousand-page run can be spread over several processes (or machines sharing
+the database file on a local-locking filesystem) without double-generating a slug.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    slug TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+"""
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """Lease-based job table; every method opens its own connection, so it is thread-safe."""
+
+    def __init__(self, path: Path, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def enqueue(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """Add (slug, payload) rows; slugs already in the queue keep their state. Returns rows added."""
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO jobs (slug, payload, updated) VALUES (?, ?, ?)",
+                ((slug, json.dumps(payload, ensure_ascii=False), now) for slug, payload in items),
+            )
+            return db.total_changes - before
+
+    def claim(self, worker: str, limit: int) -> List[Tuple[str, Dict]]:
+        """Lease up to limit queued rows, reclaiming rows whose lease has expired."""
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT slug, payload FROM jobs WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY rowid LIMIT ?",
+                (QUEUED, LEASED, now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated = ? "
+                "WHERE slug = ?",
+                ((LEASED, worker, now + self.lease_seconds, now, slug) for slug, _ in rows),
+            )
+        return [(slug, json.loads(payload)) for slug, payload in rows]
+
+    def heartbeat(self, worker: str) -> int:
+        """Extend every live lease held by worker; returns how many were renewed."""
+        now = time.time()
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? WHERE state = ? AND worker = ? AND lease_expires >= ?",
+                (now + self.lease_seconds, now, LEASED, worker, now),
+            ).rowcount
+
+    @contextmanager
+    def completing(self, slug: str, worker: str) -> Iterator[bool]:
+        """Hold the row as done while the caller writes its output; yields False when the lease was lost.
+
+        The ownership check is the UPDATE's own WHERE clause, and the transaction
+        stays open until the block exits, so no other worker can reclaim the row
+        between the check and the write. An exception in the block rolls the row
+        back to leased.
+        """
+        with self._transaction() as db:
+            yield db.execute(
+                "UPDATE jobs SET state = ?, lease_expires = NULL, error = NULL, updated = ? "
+                "WHERE slug = ? AND state = ? AND worker = ? AND lease_expires >= ?",
+                (DONE, time.time(), slug, LEASED, worker, time.time()),
+            ).rowcount == 1
+
+    def complete(self, slug: str, worker: str) -> bool:
+        """Mark a leased row done; False when the lease expired or was lost to another worker."""
+        with self.completing(slug, worker) as owned:
+            return owned
+
+    def fail(self, slug: str, worker: str, error: str) -> None:
+        """Release a lease after an error; the row is retried until max_attempts, then marked failed."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_expires = NULL, error = ?, updated = ? WHERE slug = ? AND state = ? AND worker = ?",
+                (self.max_attempts, FAILED, QUEUED, error, time.time(), slug, LEASED, worker),
+            )
+
+    def release(self, worker: str) -> int:
+        """Return this worker's unfinished leases to the queue (e.g. on Ctrl+C)."""
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET state = ?, lease_expires = NULL, attempts = MAX(attempts - 1, 0), updated = ? "
+                "WHERE state = ? AND worker = ?",
+                (QUEUED, time.time(), LEASED, worker),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as db:
+            rows = db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def has_live_leases(self) -> bool:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT 1 FROM jobs WHERE state = ? AND lease_expires >= ? LIMIT 1", (LEASED, time.time())
+            ).fetchone()
+        return row is not None
+
+    def start_heartbeat(self, worker: str, interval: float) -> threading.Event:
+        """Renew worker's leases every interval seconds until the returned event is set."""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(interval):
+                try:
+                    self.heartbeat(worker)
+                except sqlite3.Error as exc:
+                    print(f"⚠️  Queue heartbeat failed: {exc}")
+
+        threading.Thread(target=beat, name="queue-heartbeat", daemon=True).start()
+        return stop